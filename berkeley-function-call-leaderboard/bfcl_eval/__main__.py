@@ -6,7 +6,6 @@ from typing import List, Optional
 
 import typer
 from importlib.metadata import version as _version
-from bfcl_eval._llm_response_generation import main as generation_main
 from bfcl_eval.constants.category_mapping import TEST_COLLECTION_MAPPING
 from bfcl_eval.constants.eval_config import (
     DOTENV_PATH,
@@ -15,7 +14,6 @@ from bfcl_eval.constants.eval_config import (
     SCORE_PATH,
 )
 from bfcl_eval.constants.model_config import MODEL_CONFIG_MAPPING
-from bfcl_eval.eval_checker.eval_runner import main as evaluation_main
 from dotenv import load_dotenv
 from tabulate import tabulate
 
@@ -187,6 +185,9 @@ def generate(
         max_lora_rank=max_lora_rank,
         lora_modules=lora_modules,
     )
+    # Imported here so that listing/score commands do not pay for the inference stack
+    from bfcl_eval._llm_response_generation import main as generation_main
+
     load_dotenv(dotenv_path=DOTENV_PATH, verbose=True, override=True)  # Load the .env file
     generation_main(args)
 
@@ -279,6 +280,8 @@ def evaluate(
     Evaluate results from run of one or more models on a test-category (same as eval_runner.py).
     """
 
+    from bfcl_eval.eval_checker.eval_runner import main as evaluation_main
+
     load_dotenv(dotenv_path=DOTENV_PATH, verbose=True, override=True)  # Load the .env file
     evaluation_main(model, test_category, result_dir, score_dir, partial_eval)
 
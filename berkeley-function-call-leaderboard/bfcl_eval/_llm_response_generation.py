@@ -19,6 +19,7 @@ from bfcl_eval.constants.eval_config import (
 )
 from bfcl_eval.constants.model_config import MODEL_CONFIG_MAPPING
 from bfcl_eval.eval_checker.eval_runner_helper import load_file
+from bfcl_eval.model_handler import http_pool
 from bfcl_eval.model_handler.base_handler import BaseHandler
 from bfcl_eval.model_handler.local_inference.base_oss_handler import OSSHandler
 from bfcl_eval.utils import *
@@ -404,6 +405,10 @@ def main(args):
     else:
         args.result_dir = RESULT_PATH
 
+    # Size the shared HTTP connection pool for the number of worker threads before any
+    # handler builds its client (OSS models default to LOCAL_SERVER_MAX_CONCURRENT_REQUEST threads)
+    http_pool.configure(concurrency=args.num_threads or LOCAL_SERVER_MAX_CONCURRENT_REQUEST)
+
     for model_name in args.model:
         test_cases_total = collect_test_cases(
             args,
@@ -421,3 +426,10 @@ def main(args):
             # Sort the result files by id at the end
             for model_result_json in args.result_dir.rglob(RESULT_FILE_PATTERN):
                 sort_file_content_by_id(model_result_json)
+
+    stats = http_pool.pool_stats()
+    if stats["requests"]:
+        tqdm.write(
+            f"🔌 HTTP pool: {stats['requests']} requests over {stats['connections']} connections "
+            f"({stats['reuse_rate']:.0%} reused, {stats['tls_handshakes']} TLS handshakes)"
+        )
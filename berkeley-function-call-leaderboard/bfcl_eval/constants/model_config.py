@@ -1,72 +1,98 @@
+import importlib
 from dataclasses import dataclass
 from typing import Optional
 
-from bfcl_eval.model_handler.api_inference.claude import ClaudeHandler
-from bfcl_eval.model_handler.api_inference.cohere import CohereHandler
-from bfcl_eval.model_handler.api_inference.deepseek import DeepSeekAPIHandler
-from bfcl_eval.model_handler.api_inference.dm_cito import DMCitoHandler
-from bfcl_eval.model_handler.api_inference.fireworks import FireworksHandler
-from bfcl_eval.model_handler.api_inference.functionary import FunctionaryHandler
-from bfcl_eval.model_handler.api_inference.gemini import GeminiHandler
-from bfcl_eval.model_handler.api_inference.glm import GLMAPIHandler
-from bfcl_eval.model_handler.api_inference.gogoagent import GoGoAgentHandler
-from bfcl_eval.model_handler.api_inference.gorilla import GorillaHandler
-from bfcl_eval.model_handler.api_inference.grok import GrokHandler
-from bfcl_eval.model_handler.api_inference.kimi import KimiHandler
-from bfcl_eval.model_handler.api_inference.ling import LingAPIHandler
-from bfcl_eval.model_handler.api_inference.mining import MiningHandler
-from bfcl_eval.model_handler.api_inference.mistral import MistralHandler
-from bfcl_eval.model_handler.api_inference.nemotron import NemotronHandler
-from bfcl_eval.model_handler.api_inference.nova import NovaHandler
-from bfcl_eval.model_handler.api_inference.novita import NovitaHandler
-from bfcl_eval.model_handler.api_inference.nvidia import NvidiaHandler
-from bfcl_eval.model_handler.api_inference.openai_completion import (
-    OpenAICompletionsHandler,
-)
-from bfcl_eval.model_handler.api_inference.openai_response import OpenAIResponsesHandler
-from bfcl_eval.model_handler.api_inference.qwen import (
-    QwenAgentNoThinkHandler,
-    QwenAgentThinkHandler,
-    QwenAPIHandler,
-)
-from bfcl_eval.model_handler.api_inference.nanbeige import NanbeigeAPIHandler
-from bfcl_eval.model_handler.api_inference.writer import WriterHandler
-from bfcl_eval.model_handler.local_inference.arch import ArchHandler
-from bfcl_eval.model_handler.local_inference.bielik import BielikHandler
-from bfcl_eval.model_handler.local_inference.bitagent import BitAgentHandler
-from bfcl_eval.model_handler.local_inference.deepseek_reasoning import (
-    DeepseekReasoningHandler,
-)
-from bfcl_eval.model_handler.local_inference.falcon_fc import Falcon3FCHandler
-from bfcl_eval.model_handler.local_inference.gemma import GemmaHandler
-from bfcl_eval.model_handler.local_inference.functiongemma import FunctionGemmaHandler
-from bfcl_eval.model_handler.local_inference.glm import GLMHandler
-from bfcl_eval.model_handler.local_inference.granite import (
-    GraniteFunctionCallingHandler,
-)
-from bfcl_eval.model_handler.local_inference.granite_3 import Granite3FCHandler
-from bfcl_eval.model_handler.local_inference.granite_4 import Granite4FCHandler
-from bfcl_eval.model_handler.local_inference.hammer import HammerHandler
-from bfcl_eval.model_handler.local_inference.llama import LlamaHandler
-from bfcl_eval.model_handler.local_inference.llama_3_1 import LlamaHandler_3_1
-from bfcl_eval.model_handler.local_inference.minicpm import MiniCPMHandler
-from bfcl_eval.model_handler.local_inference.minicpm_fc import MiniCPMFCHandler
-from bfcl_eval.model_handler.local_inference.mistral_fc import MistralFCHandler
-from bfcl_eval.model_handler.local_inference.phi import PhiHandler
-from bfcl_eval.model_handler.local_inference.phi_fc import PhiFCHandler
-from bfcl_eval.model_handler.local_inference.quick_testing_oss import (
-    QuickTestingOSSHandler,
-)
-from bfcl_eval.model_handler.local_inference.qwen import QwenHandler
-from bfcl_eval.model_handler.local_inference.qwen_fc import QwenFCHandler
-from bfcl_eval.model_handler.local_inference.nanbeige_fc import NanbeigeFCHandler
-from bfcl_eval.model_handler.local_inference.salesforce_llama import (
-    SalesforceLlamaHandler,
-)
-from bfcl_eval.model_handler.local_inference.salesforce_qwen import (
-    SalesforceQwenHandler,
-)
-from bfcl_eval.model_handler.local_inference.think_agent import ThinkAgentHandler
+
+class HandlerRef:
+    """
+    Lazy reference to a model handler class (module path + class name).
+
+    The handler module, and with it the vendor SDK it depends on (anthropic, cohere,
+    google-genai, transformers, ...), is only imported the first time the handler is
+    instantiated or `resolve()` is called. Listing models, reading scores or looking up
+    a model's metadata therefore never imports inference SDKs.
+    """
+
+    def __init__(self, module_path: str, class_name: str):
+        self.module_path = module_path
+        self.class_name = class_name
+        self._handler_class = None
+
+    def resolve(self):
+        """Import the handler module (once) and return the handler class."""
+        if self._handler_class is None:
+            module = importlib.import_module(self.module_path)
+            self._handler_class = getattr(module, self.class_name)
+        return self._handler_class
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    @property
+    def __name__(self):
+        return self.class_name
+
+    def __repr__(self):
+        return f"HandlerRef({self.module_path}.{self.class_name})"
+
+
+# Handlers are referenced by module path + class name and imported on first use
+_API_INFERENCE = "bfcl_eval.model_handler.api_inference"
+_LOCAL_INFERENCE = "bfcl_eval.model_handler.local_inference"
+
+ClaudeHandler = HandlerRef(f"{_API_INFERENCE}.claude", "ClaudeHandler")
+CohereHandler = HandlerRef(f"{_API_INFERENCE}.cohere", "CohereHandler")
+DeepSeekAPIHandler = HandlerRef(f"{_API_INFERENCE}.deepseek", "DeepSeekAPIHandler")
+DMCitoHandler = HandlerRef(f"{_API_INFERENCE}.dm_cito", "DMCitoHandler")
+FireworksHandler = HandlerRef(f"{_API_INFERENCE}.fireworks", "FireworksHandler")
+FunctionaryHandler = HandlerRef(f"{_API_INFERENCE}.functionary", "FunctionaryHandler")
+GeminiHandler = HandlerRef(f"{_API_INFERENCE}.gemini", "GeminiHandler")
+GLMAPIHandler = HandlerRef(f"{_API_INFERENCE}.glm", "GLMAPIHandler")
+GoGoAgentHandler = HandlerRef(f"{_API_INFERENCE}.gogoagent", "GoGoAgentHandler")
+GorillaHandler = HandlerRef(f"{_API_INFERENCE}.gorilla", "GorillaHandler")
+GrokHandler = HandlerRef(f"{_API_INFERENCE}.grok", "GrokHandler")
+KimiHandler = HandlerRef(f"{_API_INFERENCE}.kimi", "KimiHandler")
+LingAPIHandler = HandlerRef(f"{_API_INFERENCE}.ling", "LingAPIHandler")
+MiningHandler = HandlerRef(f"{_API_INFERENCE}.mining", "MiningHandler")
+MistralHandler = HandlerRef(f"{_API_INFERENCE}.mistral", "MistralHandler")
+NemotronHandler = HandlerRef(f"{_API_INFERENCE}.nemotron", "NemotronHandler")
+NovaHandler = HandlerRef(f"{_API_INFERENCE}.nova", "NovaHandler")
+NovitaHandler = HandlerRef(f"{_API_INFERENCE}.novita", "NovitaHandler")
+NvidiaHandler = HandlerRef(f"{_API_INFERENCE}.nvidia", "NvidiaHandler")
+OpenAICompletionsHandler = HandlerRef(f"{_API_INFERENCE}.openai_completion", "OpenAICompletionsHandler")
+OpenAIResponsesHandler = HandlerRef(f"{_API_INFERENCE}.openai_response", "OpenAIResponsesHandler")
+QwenAgentNoThinkHandler = HandlerRef(f"{_API_INFERENCE}.qwen", "QwenAgentNoThinkHandler")
+QwenAgentThinkHandler = HandlerRef(f"{_API_INFERENCE}.qwen", "QwenAgentThinkHandler")
+QwenAPIHandler = HandlerRef(f"{_API_INFERENCE}.qwen", "QwenAPIHandler")
+NanbeigeAPIHandler = HandlerRef(f"{_API_INFERENCE}.nanbeige", "NanbeigeAPIHandler")
+WriterHandler = HandlerRef(f"{_API_INFERENCE}.writer", "WriterHandler")
+
+ArchHandler = HandlerRef(f"{_LOCAL_INFERENCE}.arch", "ArchHandler")
+BielikHandler = HandlerRef(f"{_LOCAL_INFERENCE}.bielik", "BielikHandler")
+BitAgentHandler = HandlerRef(f"{_LOCAL_INFERENCE}.bitagent", "BitAgentHandler")
+DeepseekReasoningHandler = HandlerRef(f"{_LOCAL_INFERENCE}.deepseek_reasoning", "DeepseekReasoningHandler")
+Falcon3FCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.falcon_fc", "Falcon3FCHandler")
+GemmaHandler = HandlerRef(f"{_LOCAL_INFERENCE}.gemma", "GemmaHandler")
+FunctionGemmaHandler = HandlerRef(f"{_LOCAL_INFERENCE}.functiongemma", "FunctionGemmaHandler")
+GLMHandler = HandlerRef(f"{_LOCAL_INFERENCE}.glm", "GLMHandler")
+GraniteFunctionCallingHandler = HandlerRef(f"{_LOCAL_INFERENCE}.granite", "GraniteFunctionCallingHandler")
+Granite3FCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.granite_3", "Granite3FCHandler")
+Granite4FCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.granite_4", "Granite4FCHandler")
+HammerHandler = HandlerRef(f"{_LOCAL_INFERENCE}.hammer", "HammerHandler")
+LlamaHandler = HandlerRef(f"{_LOCAL_INFERENCE}.llama", "LlamaHandler")
+LlamaHandler_3_1 = HandlerRef(f"{_LOCAL_INFERENCE}.llama_3_1", "LlamaHandler_3_1")
+MiniCPMHandler = HandlerRef(f"{_LOCAL_INFERENCE}.minicpm", "MiniCPMHandler")
+MiniCPMFCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.minicpm_fc", "MiniCPMFCHandler")
+MistralFCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.mistral_fc", "MistralFCHandler")
+PhiHandler = HandlerRef(f"{_LOCAL_INFERENCE}.phi", "PhiHandler")
+PhiFCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.phi_fc", "PhiFCHandler")
+QuickTestingOSSHandler = HandlerRef(f"{_LOCAL_INFERENCE}.quick_testing_oss", "QuickTestingOSSHandler")
+QwenHandler = HandlerRef(f"{_LOCAL_INFERENCE}.qwen", "QwenHandler")
+QwenFCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.qwen_fc", "QwenFCHandler")
+NanbeigeFCHandler = HandlerRef(f"{_LOCAL_INFERENCE}.nanbeige_fc", "NanbeigeFCHandler")
+SalesforceLlamaHandler = HandlerRef(f"{_LOCAL_INFERENCE}.salesforce_llama", "SalesforceLlamaHandler")
+SalesforceQwenHandler = HandlerRef(f"{_LOCAL_INFERENCE}.salesforce_qwen", "SalesforceQwenHandler")
+ThinkAgentHandler = HandlerRef(f"{_LOCAL_INFERENCE}.think_agent", "ThinkAgentHandler")
 
 # -----------------------------------------------------------------------------
 # A mapping of model identifiers to their respective model configurations.
@@ -87,7 +113,7 @@ class ModelConfig:
         url (str): Reference URL for the model or hosting service.
         org (str): Organization providing the model.
         license (str): License under which the model is released.
-        model_handler (str): Handler name for invoking the model.
+        model_handler (HandlerRef): Lazy reference to the handler class for invoking the model; call it like the class.
         input_price (Optional[float]): USD per million input tokens (None for open source models).
         output_price (Optional[float]): USD per million output tokens (None for open source models).
         is_fc_model (bool): True if this model is used in Function-Calling mode, otherwise False for Prompt-based mode.
@@ -101,7 +127,7 @@ class ModelConfig:
     org: str
     license: str
 
-    model_handler: str
+    model_handler: HandlerRef
 
     # Prices are in USD per million tokens; open source models have None
     input_price: Optional[float] = None
@@ -0,0 +1,159 @@
+import atexit
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from filelock import FileLock
+
+# Set to a directory to persist embeddings across processes (e.g. one `bfcl generate` run per model)
+EMBEDDING_CACHE_DIR_ENV = "BFCL_EMBEDDING_CACHE_DIR"
+DEFAULT_MAX_ENTRIES = 20000
+# Number of new vectors buffered in memory before they are appended to the on-disk store
+FLUSH_EVERY = 1000
+
+
+class EmbeddingCache:
+    """
+    Content-addressed cache of float32 embedding vectors (sha256 of the text -> vector).
+
+    Lookups go through an in-memory LRU (`max_entries` vectors), then through an optional
+    on-disk store in `cache_dir`: a memory-mapped `<namespace>.npy` matrix plus a
+    `<namespace>.keys` index holding the key of each row, in row order. The namespace
+    encodes the encoder model name and dimension, so vectors from different models never mix.
+
+    The on-disk store is append-only. New vectors are merged into it under a file lock
+    (on `flush()`, every `FLUSH_EVERY` new vectors and at interpreter exit), so several
+    processes can share one cache directory.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        dim: int,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: Optional[str] = None,
+    ):
+        self.dim = dim
+        self.namespace = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{model_name}-{dim}")
+        self.max_entries = max_entries
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._pending: dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+        self._disk_index: dict[str, int] = {}
+        self._disk_vectors = None
+        self._dir = Path(cache_dir) if cache_dir else None
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            self._vectors_path = self._dir / f"{self.namespace}.npy"
+            self._keys_path = self._dir / f"{self.namespace}.keys"
+            self._file_lock = FileLock(str(self._dir / f"{self.namespace}.lock"))
+            self._load_disk()
+            atexit.register(self.flush)
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Cached vector for each text (None where missing)."""
+        results = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                else:
+                    row = self._disk_index.get(key)
+                    if row is not None:
+                        vector = np.array(self._disk_vectors[row], dtype=np.float32)
+                        self._remember(key, vector)
+                        self.stats["disk_hits"] += 1
+                    else:
+                        self.stats["misses"] += 1
+                results.append(vector)
+        return results
+
+    def put_many(self, texts: List[str], vectors: np.ndarray) -> None:
+        """Store freshly computed vectors (one row per text)."""
+        flush = False
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                if self._dir is not None and key not in self._disk_index:
+                    self._pending[key] = vector
+            flush = len(self._pending) >= FLUSH_EVERY
+        if flush:
+            self.flush()
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load_disk(self) -> None:
+        """(Re)map the on-disk store. Keys are read before vectors, so rows past the matrix are ignored."""
+        if not self._keys_path.exists() or not self._vectors_path.exists():
+            return
+        keys = self._keys_path.read_text().split()
+        vectors = np.load(self._vectors_path, mmap_mode="r")
+        if vectors.ndim != 2 or vectors.shape[1] != self.dim:
+            return
+        self._disk_vectors = vectors
+        self._disk_index = {key: row for row, key in enumerate(keys[: len(vectors)])}
+
+    def flush(self) -> None:
+        """Append pending vectors to the on-disk store (no-op without a cache directory)."""
+        if self._dir is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+
+        with self._file_lock:
+            # Merge with whatever other processes appended since we last loaded the store
+            keys = self._keys_path.read_text().split() if self._keys_path.exists() else []
+            existing = np.load(self._vectors_path) if self._vectors_path.exists() else np.zeros((0, self.dim), np.float32)
+            keys = keys[: len(existing)]
+            known = set(keys)
+            new_keys = [key for key in pending if key not in known]
+            if new_keys:
+                merged = np.concatenate([existing, np.stack([pending[key] for key in new_keys])]).astype(np.float32)
+                # Replace the matrix before the index: readers load the index first, so they never see
+                # keys without rows (the store only grows, so existing rows keep their positions).
+                tmp = self._vectors_path.with_suffix(".tmp.npy")
+                np.save(tmp, merged)
+                os.replace(tmp, self._vectors_path)
+                tmp_keys = self._keys_path.with_suffix(".keys.tmp")
+                tmp_keys.write_text("\n".join(keys + new_keys) + "\n")
+                os.replace(tmp_keys, self._keys_path)
+            with self._lock:
+                self._load_disk()
+
+
+_caches: dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(model_name: str, dim: int) -> EmbeddingCache:
+    """Process-wide cache for one encoder (on-disk store enabled by `BFCL_EMBEDDING_CACHE_DIR`)."""
+    with _caches_lock:
+        cache = _caches.get(f"{model_name}-{dim}")
+        if cache is None:
+            cache = _caches[f"{model_name}-{dim}"] = EmbeddingCache(
+                model_name, dim, cache_dir=os.getenv(EMBEDDING_CACHE_DIR_ENV)
+            )
+        return cache
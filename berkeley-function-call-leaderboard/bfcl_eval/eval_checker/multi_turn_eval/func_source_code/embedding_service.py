@@ -0,0 +1,121 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+import numpy as np
+
+# Tunables (environment overrides) for the shared memory_vector embedding worker
+EMBEDDING_BATCH_SIZE_ENV = "BFCL_EMBEDDING_BATCH_SIZE"
+EMBEDDING_BATCH_WAIT_MS_ENV = "BFCL_EMBEDDING_BATCH_WAIT_MS"
+EMBEDDING_THREADS_ENV = "BFCL_EMBEDDING_THREADS"
+DEFAULT_BATCH_SIZE = 64
+DEFAULT_BATCH_WAIT_MS = 3.0
+
+
+def default_torch_threads() -> int:
+    """Intra-op threads for the encoder: a few cores, never more than the machine has."""
+    return int(os.getenv(EMBEDDING_THREADS_ENV, min(4, os.cpu_count() or 1)))
+
+
+class EmbeddingBatcher:
+    """
+    Background worker that micro-batches embedding requests from many threads.
+
+    `submit(texts)` enqueues a request and returns a Future for its vectors (one row per
+    text). The worker takes the first waiting request, keeps collecting requests for up to
+    `max_wait` seconds or until `max_batch` texts are gathered, then runs a single batched
+    `encode_fn` call and resolves every Future from it. Only the worker thread runs the
+    encoder, with torch limited to `torch_threads` intra-op threads, so a generation run
+    with many threads no longer has each thread encode one string while oversubscribing
+    the cores.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[List[str]], np.ndarray],
+        max_batch: int = DEFAULT_BATCH_SIZE,
+        max_wait: float = DEFAULT_BATCH_WAIT_MS / 1000,
+        torch_threads: int | None = None,
+    ):
+        self.encode_fn = encode_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.torch_threads = torch_threads
+        self.stats = {"requests": 0, "batches": 0, "texts": 0}
+
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._pid = None
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for embedding; the Future resolves to a float32 array of shape (len(texts), dim)."""
+        future = Future()
+        if not texts:
+            future.set_result(np.zeros((0, 0), dtype=np.float32))
+            return future
+        self._ensure_worker()
+        self._queue.put((list(texts), future))
+        return future
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Blocking convenience wrapper around `submit`."""
+        return self.submit(texts).result()
+
+    def _ensure_worker(self) -> None:
+        # Threads do not survive fork, so a forked child starts its own worker
+        if self._worker is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker is None or self._pid != os.getpid():
+                self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._worker = threading.Thread(
+                    target=self._run, name="bfcl-embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        if self.torch_threads:
+            try:
+                import torch
+
+                torch.set_num_threads(self.torch_threads)
+            except ImportError:
+                pass
+
+        work_queue = self._queue
+        while True:
+            batch = [work_queue.get()]
+            size = len(batch[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    request = work_queue.get(timeout=remaining) if remaining > 0 else work_queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(request)
+                size += len(request[0])
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch) -> None:
+        # Each distinct text is encoded once, even if several requests ask for it
+        unique = list(dict.fromkeys(text for texts, _ in batch for text in texts))
+        try:
+            vectors = np.asarray(self.encode_fn(unique), dtype=np.float32)
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        rows = {text: i for i, text in enumerate(unique)}
+        for texts, future in batch:
+            future.set_result(vectors[[rows[text] for text in texts]])
+        with self._lock:
+            self.stats["requests"] += len(batch)
+            self.stats["batches"] += 1
+            self.stats["texts"] += len(unique)
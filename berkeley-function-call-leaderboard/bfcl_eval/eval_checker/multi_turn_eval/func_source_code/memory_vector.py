@@ -1,20 +1,24 @@
 import json
+import os
+import threading
 from typing import List, Optional
 
 import numpy as np
+from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.embedding_cache import (
+    get_embedding_cache,
+)
+from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.embedding_service import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_BATCH_WAIT_MS,
+    EMBEDDING_BATCH_SIZE_ENV,
+    EMBEDDING_BATCH_WAIT_MS_ENV,
+    EmbeddingBatcher,
+    default_torch_threads,
+)
 from bfcl_eval.eval_checker.multi_turn_eval.func_source_code.memory_api_metaclass import (
     MemoryAPI,
 )
 
-# isort: off
-# Note: This import order is necessary to avoid segfault issue due to FAISS and PyTorch each load a different OpenMP runtime
-# See https://github.com/pytorch/pytorch/issues/149201#issuecomment-2725586827
-# TODO: Find a common OpenMP runtime to avoid this issue
-from sentence_transformers import SentenceTransformer
-import faiss
-
-# isort: on
-
 # https://lilianweng.github.io/posts/2023-06-23-agent/#component-two-memory
 MAX_CORE_MEMORY_SIZE = 7
 MAX_CORE_MEMORY_ENTRY_LENGTH = 300
@@ -22,9 +26,75 @@ MAX_ARCHIVAL_MEMORY_SIZE = 50
 MAX_ARCHIVAL_MEMORY_ENTRY_LENGTH = 2000
 
 
-# Use a global SentenceTransformer model for all vector stores.
-ENCODER = SentenceTransformer("all-MiniLM-L6-v2", device="cpu")
-ENCODER_DIM = ENCODER.get_sentence_embedding_dimension()
+ENCODER_MODEL_NAME = "all-MiniLM-L6-v2"
+
+# A single SentenceTransformer model shared by all vector stores in the process.
+# It is created on first use (not at import time), so code paths that only import this
+# module -- e.g. building CLASS_FILE_PATH_MAPPING, compiling function docs, or evaluating
+# non-memory categories -- never pay the model load time or its memory.
+_encoder = None
+_encoder_dim = None
+_encoder_lock = threading.Lock()
+_embedding_service = None
+
+
+def _import_faiss():
+    """Import faiss after sentence_transformers (see the note below)."""
+    # Note: This import order is necessary to avoid segfault issue due to FAISS and PyTorch each load a different OpenMP runtime
+    # See https://github.com/pytorch/pytorch/issues/149201#issuecomment-2725586827
+    # TODO: Find a common OpenMP runtime to avoid this issue
+    import sentence_transformers  # noqa: F401
+    import faiss
+
+    return faiss
+
+
+def get_encoder():
+    """
+    Return the process-wide SentenceTransformer encoder, loading it on first call.
+
+    Initialisation is guarded by a lock, so concurrent threads that hit their first
+    `_embed` at the same time load the model exactly once.
+    """
+    global _encoder, _encoder_dim
+    if _encoder is None:
+        with _encoder_lock:
+            if _encoder is None:
+                _import_faiss()
+                from sentence_transformers import SentenceTransformer
+
+                encoder = SentenceTransformer(ENCODER_MODEL_NAME, device="cpu")
+                _encoder_dim = encoder.get_sentence_embedding_dimension()
+                _encoder = encoder
+    return _encoder
+
+
+def get_encoder_dim() -> int:
+    """Embedding dimension of the shared encoder (loads the encoder if needed)."""
+    get_encoder()
+    return _encoder_dim
+
+
+def get_embedding_service() -> EmbeddingBatcher:
+    """
+    Return the process-wide embedding worker that batches `_embed` calls across threads.
+
+    Batch size, batching window and torch thread count can be tuned with
+    `BFCL_EMBEDDING_BATCH_SIZE`, `BFCL_EMBEDDING_BATCH_WAIT_MS` and `BFCL_EMBEDDING_THREADS`.
+    """
+    global _embedding_service
+    if _embedding_service is None:
+        with _encoder_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingBatcher(
+                    lambda texts: get_encoder().encode(
+                        texts, batch_size=len(texts), normalize_embeddings=True
+                    ),
+                    max_batch=int(os.getenv(EMBEDDING_BATCH_SIZE_ENV, DEFAULT_BATCH_SIZE)),
+                    max_wait=float(os.getenv(EMBEDDING_BATCH_WAIT_MS_ENV, DEFAULT_BATCH_WAIT_MS)) / 1000,
+                    torch_threads=default_torch_threads(),
+                )
+    return _embedding_service
 
 
 class MemoryAPI_vector(MemoryAPI):
@@ -240,20 +310,44 @@ class VectorStore:
         self.max_size = max_size
         self.max_entry_length = max_entry_length
 
-        # Cosine similarity via inner product on L2‑normalised vectors.
-        index_flat = faiss.IndexFlatIP(ENCODER_DIM)
-        self._index = faiss.IndexIDMap(index_flat)
+        # The FAISS index is built on first use, since its dimension comes from the encoder
+        self._faiss_index = None
 
         self._store: dict[int, str] = {}
         # _next_id will always be unique and sequential
         self._next_id: int = 0
 
+    @property
+    def _index(self):
+        if self._faiss_index is None:
+            faiss = _import_faiss()
+            # Cosine similarity via inner product on L2‑normalised vectors.
+            index_flat = faiss.IndexFlatIP(get_encoder_dim())
+            self._faiss_index = faiss.IndexIDMap(index_flat)
+        return self._faiss_index
+
     def _embed(self, text: str | List[str]) -> np.ndarray:
-        """Return an L2-normalised NumPy array suitable for FAISS."""
-        vecs = ENCODER.encode(
-            text if isinstance(text, list) else [text], normalize_embeddings=True
-        )
-        return np.asarray(vecs, dtype=np.float32)
+        """
+        Return an L2-normalised NumPy array suitable for FAISS.
+
+        Vectors are looked up in the shared embedding cache first; only texts that were
+        never embedded before (by any store, entry or model run) go through the encoder.
+        """
+        texts = text if isinstance(text, list) else [text]
+        cache = get_embedding_cache(ENCODER_MODEL_NAME, get_encoder_dim())
+        vectors = cache.get_many(texts)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            # Encode each distinct missing text once, batched with other threads' requests
+            new_texts = list(dict.fromkeys(texts[i] for i in missing))
+            encoded = get_embedding_service().encode(new_texts)
+            cache.put_many(new_texts, encoded)
+            by_text = dict(zip(new_texts, encoded))
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+
+        return np.stack(vectors).astype(np.float32, copy=False)
 
     def add(self, text: str) -> dict[str, str]:
         if len(text) > self.max_entry_length:
@@ -300,7 +394,8 @@ class VectorStore:
         return {"status": f"ID {vec_id} updated."}
 
     def clear(self) -> dict[str, str]:
-        self._index.reset()
+        if self._faiss_index is not None:
+            self._faiss_index.reset()
         self._store.clear()
         self._next_id = 0
 
@@ -359,10 +454,11 @@ class VectorStore:
         """
         self._next_id = snapshot_data["next_id"]
         self._store = {int(k): v for k, v in snapshot_data["store"].items()}
-        self._index.reset()
+        if self._faiss_index is not None:
+            self._faiss_index.reset()
 
         if self._store:
-            # Re-embed every stored text in one batch
+            # Embed every stored text in one batch (mostly embedding cache hits)
             # To keep IDs aligned with vectors, sort by ID
             ids = np.array(sorted(self._store.keys()), dtype=np.int64)
             texts = [self._store[i] for i in ids]
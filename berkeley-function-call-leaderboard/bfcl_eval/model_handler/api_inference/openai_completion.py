@@ -5,6 +5,7 @@ from typing import Any
 
 from bfcl_eval.constants.type_mappings import GORILLA_TO_OPENAPI
 from bfcl_eval.model_handler.base_handler import BaseHandler
+from bfcl_eval.model_handler.http_pool import shared_http_client
 from bfcl_eval.constants.enums import ModelStyle
 from bfcl_eval.model_handler.utils import (
     convert_to_function_call,
@@ -47,6 +48,9 @@ class OpenAICompletionsHandler(BaseHandler):
         if headers_env := os.getenv("OPENAI_DEFAULT_HEADERS"):
             kwargs["default_headers"] = json.loads(headers_env)
 
+        # Reuse the process-wide connection pool instead of a per-handler httpx client
+        kwargs["http_client"] = shared_http_client()
+
         return kwargs
 
     def decode_ast(self, result, language, has_tool_call_tag):
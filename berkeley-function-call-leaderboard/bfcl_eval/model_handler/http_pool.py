@@ -0,0 +1,181 @@
+"""
+Process-wide shared httpx connection pools for OpenAI-compatible clients.
+
+Every handler that talks to an OpenAI-compatible endpoint should pass
+`http_client=shared_http_client()` (or `shared_async_http_client()` for
+`AsyncOpenAI`) instead of letting the SDK build its own client. All handlers in
+the process then reuse the same keep-alive connections, which avoids
+connection churn, repeated TLS handshakes and pool exhaustion under many
+threads.
+
+Pool limits are sized from the configured concurrency (`configure()`, or the
+`BFCL_HTTP_CONCURRENCY` / `BFCL_HTTP2` environment variables). Connection
+reuse is measured through the httpcore trace extension and exposed by
+`pool_stats()`.
+
+The shared clients must not be closed by their users (do not call
+`OpenAI.close()` on a client built with them).
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+
+import httpx
+
+DEFAULT_CONCURRENCY = 16
+# Extra connections on top of the concurrency for retries and streaming responses
+# that are still being drained when the next request starts.
+CONNECTION_HEADROOM = 4
+KEEPALIVE_EXPIRY = 60.0
+
+_lock = threading.Lock()
+_settings = {
+    "concurrency": int(os.getenv("BFCL_HTTP_CONCURRENCY", DEFAULT_CONCURRENCY)),
+    "http2": os.getenv("BFCL_HTTP2", "").lower() in ("1", "true", "yes"),
+}
+_sync_client = None
+# httpx.AsyncClient connections are bound to the event loop that opened them,
+# so async clients are shared per loop.
+_async_clients = weakref.WeakKeyDictionary()
+_h2_warned = False
+_stats = {"requests": 0, "connections": 0, "tls_handshakes": 0, "http2_requests": 0}
+
+
+def configure(concurrency=None, http2=None):
+    """
+    Set pool sizing before clients are created.
+
+    The pool only grows: a smaller concurrency than the current one is ignored, so
+    several runs in one process (e.g. models benchmarked in parallel) can each call
+    this with their own concurrency. `http2=None` keeps the current setting
+    (`BFCL_HTTP2` by default).
+
+    Once a shared client has been handed out the settings are frozen: live
+    handlers keep using that client, so it is never replaced or closed. Later
+    calls that would change the settings only print a warning; size the pool for
+    the whole process before the first handler is created.
+    """
+    with _lock:
+        requested = dict(_settings)
+        if concurrency is not None and concurrency > requested["concurrency"]:
+            requested["concurrency"] = concurrency
+        if http2 is not None:
+            requested["http2"] = http2
+        if requested != _settings:
+            if _sync_client is None and not len(_async_clients):
+                _settings.update(requested)
+            else:
+                print(
+                    f"Warning: HTTP pool already in use with {_settings}; ignoring {requested} "
+                    "(configure the pool before creating any handler)"
+                )
+        return dict(_settings)
+
+
+def pool_limits():
+    """httpx.Limits sized from the configured concurrency."""
+    max_connections = max(_settings["concurrency"], 1) + CONNECTION_HEADROOM
+    # Keep every connection the pool may open alive; a smaller keep-alive limit closes
+    # connections on release under full load, only for the next waiting request to reopen them.
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def shared_http_client():
+    """The process-wide httpx.Client (created on first use)."""
+    global _sync_client
+    with _lock:
+        if _sync_client is None:
+            _sync_client = httpx.Client(
+                limits=pool_limits(),
+                http2=_http2_enabled(),
+                timeout=httpx.Timeout(600.0, connect=10.0),
+                follow_redirects=True,
+                event_hooks={"request": [_on_request], "response": [_on_response]},
+            )
+        return _sync_client
+
+
+def shared_async_http_client():
+    """The httpx.AsyncClient shared by everything running on the current event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = httpx.AsyncClient(
+                limits=pool_limits(),
+                http2=_http2_enabled(),
+                timeout=httpx.Timeout(600.0, connect=10.0),
+                follow_redirects=True,
+                event_hooks={"request": [_aon_request], "response": [_aon_response]},
+            )
+        return client
+
+
+def pool_stats():
+    """
+    Connection reuse metrics across all shared clients.
+
+    `connections` counts new TCP connections and `tls_handshakes` new TLS
+    sessions; every other request reused a pooled keep-alive connection.
+    """
+    with _lock:
+        stats = dict(_stats)
+        stats.update(_settings)
+    stats["reused"] = max(stats["requests"] - stats["connections"], 0)
+    stats["reuse_rate"] = stats["reused"] / stats["requests"] if stats["requests"] else 0.0
+    return stats
+
+
+def _http2_enabled():
+    global _h2_warned
+    if not _settings["http2"]:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        if not _h2_warned:
+            print("Warning: HTTP/2 requested but the 'h2' package is not installed; using HTTP/1.1 (pip install httpx[http2])")
+            _h2_warned = True
+        return False
+    return True
+
+
+def _count(key):
+    with _lock:
+        _stats[key] += 1
+
+
+def _trace(event_name, info):
+    if event_name == "connection.connect_tcp.complete":
+        _count("connections")
+    elif event_name == "connection.start_tls.complete":
+        _count("tls_handshakes")
+
+
+async def _atrace(event_name, info):
+    _trace(event_name, info)
+
+
+def _on_request(request):
+    _count("requests")
+    request.extensions["trace"] = _trace
+
+
+def _on_response(response):
+    if response.http_version == "HTTP/2":
+        _count("http2_requests")
+
+
+async def _aon_request(request):
+    _count("requests")
+    request.extensions["trace"] = _atrace
+
+
+async def _aon_response(response):
+    _on_response(response)
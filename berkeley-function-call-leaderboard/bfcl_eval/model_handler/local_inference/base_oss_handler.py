@@ -9,6 +9,7 @@ import requests
 from bfcl_eval.constants.enums import ModelStyle
 from bfcl_eval.constants.eval_config import LOCAL_SERVER_PORT
 from bfcl_eval.model_handler.base_handler import BaseHandler
+from bfcl_eval.model_handler.http_pool import shared_http_client
 from bfcl_eval.model_handler.utils import (
     default_decode_ast_prompting,
     default_decode_execute_prompting,
@@ -46,7 +47,7 @@ class OSSHandler(BaseHandler, EnforceOverrides):
         # Use REMOTE_OPENAI_* variables to avoid conflicts with main OPENAI_* variables
         self.base_url = os.getenv("REMOTE_OPENAI_BASE_URL", f"http://{self.local_server_endpoint}:{self.local_server_port}/v1")
         self.api_key = os.getenv("REMOTE_OPENAI_API_KEY", "EMPTY")
-        self.client = OpenAI(base_url=self.base_url, api_key=self.api_key)
+        self.client = OpenAI(base_url=self.base_url, api_key=self.api_key, http_client=shared_http_client())
 
     @override
     def inference(
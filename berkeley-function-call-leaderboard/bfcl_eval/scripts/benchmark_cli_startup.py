@@ -0,0 +1,118 @@
+"""
+Startup benchmark for the `bfcl` CLI.
+
+Runs the listing and scoring commands in fresh interpreters, reports the median wall-clock
+time of each, and checks that none of them imported an inference SDK. Handlers are resolved
+lazily (see `HandlerRef` in `bfcl_eval/constants/model_config.py`), so these commands should
+only load the model registry, never the vendor SDKs behind it.
+
+Exits with status 1 if a command imports an inference SDK, or if a median is slower than
+`--max-seconds`, so it can guard the startup time in CI.
+
+To run this script, use the following command:
+```
+cd berkeley-function-call-leaderboard
+python bfcl_eval/scripts/benchmark_cli_startup.py --runs 5 --max-seconds 1.5
+```
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Top-level packages that only the inference stack (generation or handler decoding) needs
+INFERENCE_MODULES = [
+    "anthropic",
+    "boto3",
+    "cohere",
+    "faiss",
+    "google.genai",
+    "mistralai",
+    "openai",
+    "qwen_agent",
+    "sentence_transformers",
+    "torch",
+    "transformers",
+    "tree_sitter",
+    "vllm",
+    "writerai",
+]
+
+COMMANDS = [
+    ["models"],
+    ["test-categories"],
+    ["results"],
+    ["scores"],
+]
+
+# Runs one CLI command in-process and reports which inference modules it imported
+_PROBE = """
+import json, sys
+command, modules = json.loads(sys.argv[1]), json.loads(sys.argv[2])
+sys.argv = ["bfcl"] + command
+from bfcl_eval.__main__ import cli
+try:
+    cli()
+except SystemExit:
+    pass
+loaded = sorted(m for m in modules if m in sys.modules)
+sys.stdout.write("\\n__BFCL_PROBE__" + json.dumps(loaded) + "\\n")
+"""
+
+
+def run_command(command):
+    """Run one CLI command in a new interpreter; return (seconds, imported inference modules)."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE, json.dumps(command), json.dumps(INFERENCE_MODULES)],
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    marker = completed.stdout.rfind("__BFCL_PROBE__")
+    if completed.returncode != 0 or marker < 0:
+        raise RuntimeError(
+            f"`bfcl {' '.join(command)}` failed (exit code {completed.returncode}):\n{completed.stderr}"
+        )
+    loaded = json.loads(completed.stdout[marker + len("__BFCL_PROBE__") :].strip())
+    return elapsed, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark `bfcl` CLI startup time.")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per command (median is reported).")
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Fail if a command's median startup time exceeds this many seconds.",
+    )
+    args = parser.parse_args()
+
+    failures = []
+    for command in COMMANDS:
+        name = f"bfcl {' '.join(command)}"
+        timings, loaded = [], []
+        for _ in range(args.runs):
+            elapsed, loaded = run_command(command)
+            timings.append(elapsed)
+        median = statistics.median(timings)
+        print(
+            f"{name:<22} median {median:.3f}s  min {min(timings):.3f}s  "
+            f"inference modules: {', '.join(loaded) or 'none'}"
+        )
+        if loaded:
+            failures.append(f"{name} imported {', '.join(loaded)}")
+        if args.max_seconds is not None and median > args.max_seconds:
+            failures.append(f"{name} took {median:.3f}s (limit {args.max_seconds:.3f}s)")
+
+    if failures:
+        print("\nStartup benchmark failed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import json
+import time
+
+# 배치 종료 상태 (OpenAI Batch API)
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+class BatchRunner:
+    """
+    OpenAI 호환 Batch API 실행기 (/v1/files + /v1/batches)
+
+    요청 라인을 JSONL 파일로 업로드하여 배치를 만들고, 완료될 때까지 폴링한 뒤
+    custom_id별 응답 본문(ChatCompletion 딕셔너리) 또는 에러 메시지를 돌려줍니다.
+    요청이 max_requests를 넘으면 여러 배치로 나눠 동시에 제출합니다 (provider 배치당 요청 수 제한).
+    """
+    def __init__(self, client, poll_interval=10.0, completion_window="24h", max_requests=50000):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+        self.max_requests = max_requests
+
+    @staticmethod
+    def request_line(custom_id, params):
+        """chat.completions 요청 파라미터 → 배치 입력 라인 (extra_body는 본문에 병합)"""
+        body = {key: value for key, value in params.items() if key != "extra_body"}
+        body.update(params.get("extra_body") or {})
+        return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+
+    def run(self, lines):
+        """
+        배치 제출 → 완료 대기 → 결과 수집
+
+        Returns:
+            {custom_id: (응답 본문 딕셔너리 또는 None, 에러 메시지 또는 None)}
+        """
+        batches = [self._submit(lines[i:i + self.max_requests]) for i in range(0, len(lines), self.max_requests)]
+        outcomes = {}
+        for batch in batches:
+            batch = self._wait(batch)
+            outcomes.update(self._collect(batch))
+        # 결과 파일에 없는 요청 (배치 실패/만료)
+        for line in lines:
+            outcomes.setdefault(line["custom_id"], (None, "배치 결과 없음"))
+        return outcomes
+
+    def _submit(self, lines):
+        payload = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines).encode("utf-8")
+        input_file = self.client.files.create(file=("bfcl_batch.jsonl", payload), purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window=self.completion_window
+        )
+        print(f"📦 배치 제출: {batch.id} (요청 {len(lines)}개, {len(payload) / 1024:.0f}KB)")
+        return batch
+
+    def _wait(self, batch):
+        """배치가 종료 상태가 될 때까지 폴링 (진행 상황이 바뀔 때만 출력)"""
+        last = None
+        while True:
+            counts = batch.request_counts
+            progress = (batch.status, counts.completed if counts else 0, counts.failed if counts else 0)
+            if progress != last:
+                total = counts.total if counts else 0
+                print(f"  ⏳ {batch.id}: {batch.status} (완료 {progress[1]}/{total}, 실패 {progress[2]})")
+                last = progress
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                return batch
+            time.sleep(self.poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+
+    def _collect(self, batch):
+        outcomes = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get("response") or {}
+                if response.get("status_code") == 200:
+                    outcomes[record["custom_id"]] = (response["body"], None)
+                else:
+                    error = record.get("error") or (response.get("body") or {}).get("error") or response
+                    outcomes[record["custom_id"]] = (None, str(error.get("message", error)) if isinstance(error, dict) else str(error))
+        return outcomes
@@ -0,0 +1,151 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+CACHE_MODES = ["off", "read", "write", "readwrite"]
+# 캐시 hit의 last_access 갱신을 모아 두었다가 한 번에 기록하는 단위 (put/close 시에도 기록)
+ACCESS_FLUSH_EVERY = 500
+
+class InferenceCache:
+    """
+    내용 주소 기반(content-addressed) 온디스크 inference 캐시 (SQLite)
+
+    키는 (model, messages, tools, temperature, tool_choice, max_tokens)와 엔드포인트(기본 엔드포인트가 아닌 경우)의 해시이며,
+    값은 API 응답(ChatCompletion) JSON입니다. 전체 크기가 max_bytes를 넘으면
+    가장 오래 사용되지 않은 항목부터 제거합니다 (LRU).
+
+    전체 크기는 시작 시 1회 읽은 뒤 put/제거 시 증감으로 추적하고, hit의 last_access 갱신은
+    메모리에 모아 put/close 시(또는 ACCESS_FLUSH_EVERY개마다) 한 번의 커밋으로 기록합니다.
+    """
+    KEY_FIELDS = ["model", "messages", "tools", "temperature", "tool_choice", "max_tokens"]
+
+    def __init__(self, path=".cache/inference_cache.sqlite", mode="readwrite", max_bytes=2 * 1024 ** 3):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"지원하지 않는 캐시 모드: {mode} (가능: {', '.join(CACHE_MODES)})")
+        self.path = Path(path)
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self._lock = threading.Lock()
+        self._conn = None
+        self._total_bytes = 0
+        self._pending_access = {}
+
+        if mode != "off":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                "created REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses(last_access)")
+            self._conn.commit()
+            self._total_bytes = self._stored_bytes()
+
+    @property
+    def readable(self):
+        return self.mode in ("read", "readwrite")
+
+    @property
+    def writable(self):
+        return self.mode in ("write", "readwrite")
+
+    @classmethod
+    def make_key(cls, params, endpoint=None):
+        """
+        요청 파라미터에서 캐시 키(sha256) 생성
+
+        endpoint(base_url)가 주어지면 키에 포함합니다 (로컬 stand-in 서버 등 다른 엔드포인트의 응답이
+        같은 모델명의 실제 응답으로 재사용되지 않도록). None이면 기존 키와 동일합니다.
+        """
+        payload = {field: params.get(field) for field in cls.KEY_FIELDS}
+        if endpoint is not None:
+            payload["endpoint"] = endpoint
+        canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """캐시된 응답 딕셔너리 반환 (없으면 None)"""
+        if not self.readable:
+            return None
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            self._pending_access[key] = time.time()
+            if len(self._pending_access) >= ACCESS_FLUSH_EVERY:
+                self._flush_access()
+                self._conn.commit()
+            self.stats["hits"] += 1
+        return json.loads(row[0])
+
+    def put(self, key, response_dict):
+        """응답 저장 후 크기 한도를 넘으면 LRU 제거"""
+        if not self.writable:
+            return
+        value = json.dumps(response_dict, ensure_ascii=False)
+        size = len(value.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._pending_access.pop(key, None)
+            self.stats["writes"] += 1
+            self._flush_access()
+            self._evict()
+            self._conn.commit()
+
+    def _stored_bytes(self):
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _flush_access(self):
+        """모아 둔 last_access 갱신 기록 (lock 보유 상태에서 호출, 커밋은 호출 측)"""
+        if self._pending_access:
+            self._conn.executemany("UPDATE responses SET last_access = ? WHERE key = ?",
+                                   [(at, key) for key, at in self._pending_access.items()])
+            self._pending_access.clear()
+
+    def _evict(self):
+        """전체 크기가 max_bytes 이하가 될 때까지 오래된 항목 제거 (lock 보유 상태에서 호출)"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        # 같은 파일을 쓰는 다른 프로세스의 추가/제거를 반영하여 실제 크기로 다시 맞춤 (한도 초과 시에만)
+        self._total_bytes = self._stored_bytes()
+        if self._total_bytes <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            stale.append((key,))
+            self._total_bytes -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self.stats["evictions"] += len(stale)
+
+    def summary(self):
+        """히트/미스 통계 문자열"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        hit_rate = (self.stats["hits"] / lookups * 100) if lookups else 0
+        return (f"hits={self.stats['hits']}, misses={self.stats['misses']} ({hit_rate:.1f}% hit), "
+                f"writes={self.stats['writes']}, evictions={self.stats['evictions']}")
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._flush_access()
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
+                self.mode = "off"
@@ -130,40 +130,20 @@ class BFCLChecker:
         if not all_model_calls:
             return False, "❌ No tool calls generated"
         
-        # 모델 호출을 문자열로 변환
-        model_call_strings = []
-        for call in all_model_calls:
-            if isinstance(call, dict):
-                # {"function_name": {"param": "value"}} -> "function_name(param='value')"
-                func_name = list(call.keys())[0]
-                params = call[func_name]
-                if isinstance(params, dict):
-                    param_strs = [f"{k}={repr(v)}" for k, v in params.items()]
-                    model_call_strings.append(f"{func_name}({','.join(param_strs)})")
-                else:
-                    model_call_strings.append(f"{func_name}({params})")
-            elif isinstance(call, str):
-                model_call_strings.append(call)
+        # 모델 호출의 함수명 집합 (GT 항목마다 모델 출력 전체를 다시 순회하지 않도록)
+        model_funcs = {BFCLChecker._string_call_key(call) for call in all_model_calls}
         
-        # 각 GT 호출이 모델 출력에 있는지 확인 (유연한 매칭)
+        # 각 GT 호출이 모델 출력에 있는지 확인 (유연한 매칭: 함수명이 일치하면 매칭, 파라미터는 유연하게)
         matched = 0
         results = []
         for i, gt_str in enumerate(flattened_gt_strings):
-            found = False
             # GT 문자열에서 함수명 추출
             gt_func = gt_str.split('(')[0] if '(' in gt_str else gt_str
             
-            for j, model_str in enumerate(model_call_strings):
-                model_func = model_str.split('(')[0] if '(' in model_str else model_str
-                
-                # 함수명이 일치하면 매칭으로 간주 (파라미터는 유연하게)
-                if gt_func.lower() == model_func.lower():
-                    matched += 1
-                    results.append(f"GT {i}: ✅ '{gt_func}' found")
-                    found = True
-                    break
-            
-            if not found:
+            if gt_func.lower() in model_funcs:
+                matched += 1
+                results.append(f"GT {i}: ✅ '{gt_func}' found")
+            else:
                 results.append(f"GT {i}: ❌ '{gt_func}' not found in model output")
         
         accuracy = (matched / len(flattened_gt_strings)) * 100 if flattened_gt_strings else 0
@@ -186,27 +166,41 @@ class BFCLChecker:
         if not all_model_calls:
             return False, "❌ No tool calls generated"
         
-        # 모델 출력의 복사본 (매칭되면 제거하여 중복 처리)
-        model_calls_copy = all_model_calls[:]
+        # 함수명별 모델 호출 인덱스 (원래 순서 유지)
+        # 함수명이 다르면 _single_call_checker가 항상 실패하므로, GT 항목마다 같은 이름의 후보만 검사
+        by_string_name = {}
+        by_dict_name = {}
+        for j, m_call in enumerate(all_model_calls):
+            key = BFCLChecker._string_call_key(m_call)
+            if key is not None:
+                by_string_name.setdefault(key, []).append(j)
+            key = BFCLChecker._dict_call_key(m_call)
+            if key is not None:
+                by_dict_name.setdefault(key, []).append(j)
+        
+        # 매칭된 모델 호출은 사용됨 표시 (중복 GT 처리, BFCL 공식과 동일)
+        used = [False] * len(all_model_calls)
         results = []
         all_pass = True
         
         for i, g_call in enumerate(flattened_gt):
-            found_match = False
-            matched_index = None
+            if isinstance(g_call, str):
+                candidates = by_string_name.get(g_call.split('(')[0].lower(), [])
+            else:
+                candidates = by_dict_name.get(BFCLChecker._dict_call_key(g_call), [])
             
-            # 남아있는 모델 호출에서 매칭 찾기
-            for j, m_call in enumerate(model_calls_copy):
-                match_result = BFCLChecker._single_call_checker(m_call, g_call, i)
-                if match_result["valid"]:
-                    found_match = True
+            # 남아있는 후보 중 원래 순서상 첫 번째 매칭 찾기
+            matched_index = None
+            for j in candidates:
+                if used[j]:
+                    continue
+                if isinstance(g_call, str) or BFCLChecker._single_call_checker(all_model_calls[j], g_call, i)["valid"]:
                     matched_index = j
-                    results.append(f"GT {i}: ✅ Matched")
                     break
             
-            if found_match:
-                # 매칭된 항목을 제거하여 중복 체크 (BFCL 공식과 동일)
-                model_calls_copy.pop(matched_index)
+            if matched_index is not None:
+                used[matched_index] = True
+                results.append(f"GT {i}: ✅ Matched")
             else:
                 all_pass = False
                 # g_call이 문자열인 경우 처리
@@ -218,7 +212,7 @@ class BFCLChecker:
         
         if all_pass:
             matched_count = len(flattened_gt)
-            extra_calls = len(model_calls_copy)
+            extra_calls = len(all_model_calls) - matched_count
             msg = f"✅ All {matched_count} required calls found"
             if extra_calls > 0:
                 msg += f" ({extra_calls} extra calls allowed)"
@@ -226,6 +220,32 @@ class BFCLChecker:
         else:
             return False, "\n".join(results)
     
+    @staticmethod
+    def _string_call_key(call):
+        """
+        문자열 GT와 비교할 모델 호출의 함수명 (소문자, _single_call_checker의 문자열 비교와 동일)
+        dict/str이 아닌 호출은 None
+        """
+        if isinstance(call, dict):
+            if not call:
+                return None
+            func = list(call.keys())[0]
+        elif isinstance(call, str):
+            func = call
+        else:
+            return None
+        return func.split('(')[0].lower()
+    
+    @staticmethod
+    def _dict_call_key(call):
+        """
+        dict GT와 비교할 함수명 키 (_single_call_checker의 이름 비교와 동일: '_'를 '.'로 바꾼 뒤 마지막 구간)
+        비어 있지 않은 dict가 아니면 None
+        """
+        if not isinstance(call, dict) or not call:
+            return None
+        return list(call.keys())[0].replace("_", ".").split('.')[-1]
+    
     @staticmethod
     def _parallel_checker_no_order(all_model_calls, flattened_gt):
         """
@@ -0,0 +1,88 @@
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+from core.cache import InferenceCache
+
+def request_fingerprint(params, stop_at_tool_call=False, endpoint=None):
+    """
+    요청 지문: 캐시 키와 같은 필드(model, messages, tools, temperature, tool_choice, max_tokens, 엔드포인트)의 해시
+
+    temperature가 0이 아닌 요청은 응답이 요청만으로 결정되지 않으므로 None을 반환합니다 (공유 대상 아님).
+    조기 종료한 스트림 응답은 잘려 있으므로 stop_at_tool_call 여부도 지문에 포함합니다.
+    """
+    if params.get("temperature") != 0:
+        return None
+    return InferenceCache.make_key(params, endpoint) + (":cut" if stop_at_tool_call else "")
+
+class RequestPlan:
+    """
+    케이스 간 중복 요청 공유 계획 (모델 1개 = 계획 1개)
+
+    실행 전에 각 케이스의 첫 스텝 요청 지문을 등록(add)하고, 2개 이상의 케이스가 같은 지문을 가지면
+    실행 중 처음 요청한 케이스(leader)만 API를 호출하고 나머지 케이스는 그 응답을 공유합니다.
+    leader가 실패하면 기다리던 케이스는 각자 직접 요청합니다.
+    스레드(직렬/여러 모델)와 asyncio(동시 실행 모드) 양쪽에서 사용할 수 있습니다.
+    """
+    def __init__(self):
+        self._planned = Counter()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.stats = {"planned": 0, "unique": 0, "shared": 0}
+
+    def add(self, fingerprint):
+        """첫 스텝 요청 지문 등록 (None은 무시)"""
+        if fingerprint is None:
+            return
+        with self._lock:
+            self._planned[fingerprint] += 1
+            self.stats["planned"] += 1
+            self.stats["unique"] = len(self._planned)
+
+    @property
+    def planned_savings(self):
+        """계획 기준 절약 가능한 API 호출 수 (중복 요청 수)"""
+        return self.stats["planned"] - self.stats["unique"]
+
+    def claim(self, fingerprint):
+        """
+        공유 대상 요청이면 (leader 응답 Future, leader 여부) 반환, 아니면 (None, False)
+
+        leader는 요청 후 resolve() 또는 fail()을 호출해야 하며, 나머지는 Future의 결과(응답)를 사용합니다.
+        """
+        with self._lock:
+            future = self._inflight.get(fingerprint)
+            if future is not None:
+                self._planned[fingerprint] -= 1
+                if self._planned[fingerprint] <= 0:
+                    # 계획된 마지막 케이스: 응답 참조 해제
+                    del self._inflight[fingerprint]
+                return future, False
+            if self._planned.get(fingerprint, 0) < 2:
+                return None, False
+            self._planned[fingerprint] -= 1
+            future = self._inflight[fingerprint] = Future()
+            return future, True
+
+    @staticmethod
+    def resolve(future, response):
+        """leader 응답을 기다리는 케이스들에 전달"""
+        if not future.done():
+            future.set_result(response)
+
+    def fail(self, fingerprint, future, error):
+        """leader 실패: 다음 요청이 새 leader가 되도록 해제하고, 기다리던 케이스에 실패를 알림"""
+        with self._lock:
+            if self._inflight.get(fingerprint) is future:
+                del self._inflight[fingerprint]
+        if not future.done():
+            future.set_exception(error)
+
+    def record_shared(self):
+        with self._lock:
+            self.stats["shared"] += 1
+
+    def summary(self):
+        stats = self.stats
+        return (f"첫 스텝 요청 {stats['planned']}개 중 고유 {stats['unique']}개 "
+                f"(중복 {self.planned_savings}개), 실제 공유 {stats['shared']}회 = API 호출 {stats['shared']}회 절약")
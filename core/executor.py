@@ -1,4 +1,15 @@
+import sys
 import json
+import pickle
+import hashlib
+import inspect
+import importlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+# 도구 실행기 모드 (mock: 고정 응답, real: func_source_code 백엔드 인스턴스 풀)
+EXECUTOR_MODES = ["mock", "real"]
 
 class BFCLMockExecutor:
     """
@@ -8,6 +19,9 @@ class BFCLMockExecutor:
     def __init__(self, initial_config=None):
         self.config = initial_config or {}
 
+    def close(self):
+        pass
+
     def execute(self, tool_call):
         func_name = tool_call.get("name") or list(tool_call.keys())[0]
         args = tool_call.get("arguments") or tool_call.get(func_name) or {}
@@ -35,3 +49,201 @@ class BFCLMockExecutor:
         query = args.get("keywords") or args.get("query") or ""
         # 특정 키워드에 대한 힌트 제공 (모델이 최종 정답에 가깝게 사고하도록)
         return f"Search result for '{query}': Found relevant information. Please proceed to the next step to extract the specific value."
+
+# ==========================================
+# [실제 백엔드 실행기 (func_source_code 클래스)]
+# ==========================================
+# bfcl_eval 패키지가 설치되어 있지 않으면 저장소에 포함된 소스에서 import
+_BFCL_ROOT = Path(__file__).resolve().parent.parent / "berkeley-function-call-leaderboard"
+
+# BFCL 공식 실행기(execute_multi_turn_func_call)와 같은 차단 함수 목록
+_BLOCKED_FUNCTIONS = ["kill", "exit", "quit", "remove", "unlink", "popen", "Popen", "run"]
+
+def _backend_config():
+    try:
+        from bfcl_eval.constants import executable_backend_config
+    except ImportError:
+        sys.path.append(str(_BFCL_ROOT))
+        from bfcl_eval.constants import executable_backend_config
+    return executable_backend_config
+
+class ScenarioPool:
+    """
+    func_source_code 클래스(GorillaFileSystem, TradingBot, TravelAPI 등) 인스턴스 풀
+
+    - 클래스별로 반납된 인스턴스를 재사용 (케이스마다 새로 생성하지 않음)
+    - initial_config(+ long_context)별로 _load_scenario()를 1회만 실행하고, 로드된 상태를 pickle 스냅샷으로 캐시
+    - 인스턴스 초기화는 스냅샷 복원(pickle.loads)으로 처리 (_load_scenario + deepcopy 반복 제거)
+    """
+    def __init__(self, max_idle=32, max_snapshots=1024):
+        self.max_idle = max_idle
+        self.max_snapshots = max_snapshots
+        self.stats = {"created": 0, "reused": 0, "scenario_loads": 0, "snapshot_hits": 0}
+        self._classes = {}
+        self._methods = {}
+        self._idle = {}
+        self._snapshots = OrderedDict()
+        # 같은 initial_config 객체(로더 캐시가 케이스 간 공유)는 JSON 해시 없이 바로 스냅샷 조회
+        self._by_identity = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, class_name, initial_config=None, long_context=False):
+        """initial_config 상태로 초기화된 인스턴스 반환 (사용 후 release() 필요)"""
+        cls = self._class(class_name)
+        snapshot = self._snapshot(class_name, cls, initial_config or {}, long_context)
+        with self._lock:
+            idle = self._idle.get(class_name)
+            instance = idle.pop() if idle else None
+            self.stats["reused" if instance is not None else "created"] += 1
+        if instance is None:
+            instance = cls.__new__(cls)
+        if snapshot is None:
+            # 상태 없는 클래스 (MathAPI 등)
+            instance.__init__()
+        else:
+            instance.__dict__.clear()
+            instance.__dict__.update(pickle.loads(snapshot))
+        return instance
+
+    def release(self, class_name, instance):
+        with self._lock:
+            idle = self._idle.setdefault(class_name, [])
+            if len(idle) < self.max_idle:
+                idle.append(instance)
+
+    def methods(self, class_name):
+        """클래스의 공개 메서드 이름 목록 (클래스별 1회 계산)"""
+        with self._lock:
+            names = self._methods.get(class_name)
+        if names is None:
+            names = [name for name, _ in inspect.getmembers(self._class(class_name), predicate=inspect.isfunction)
+                     if not name.startswith("_")]
+            with self._lock:
+                self._methods[class_name] = names
+        return names
+
+    def _class(self, class_name):
+        with self._lock:
+            cls = self._classes.get(class_name)
+        if cls is None:
+            config = _backend_config()
+            if class_name not in config.CLASS_FILE_PATH_MAPPING:
+                raise ValueError(f"알 수 없는 백엔드 클래스: {class_name}")
+            cls = getattr(importlib.import_module(config.CLASS_FILE_PATH_MAPPING[class_name]), class_name)
+            with self._lock:
+                self._classes[class_name] = cls
+        return cls
+
+    def _snapshot(self, class_name, cls, initial_config, long_context):
+        """initial_config를 로드한 상태의 pickle 스냅샷 (상태 없는 클래스는 None)"""
+        if class_name in _backend_config().STATELESS_CLASSES:
+            return None
+        class_config = initial_config.get(class_name, {})
+        identity = (class_name, long_context, id(class_config))
+        with self._lock:
+            entry = self._by_identity.get(identity)
+            if entry is not None and entry[0] is class_config and entry[1] in self._snapshots:
+                self._snapshots.move_to_end(entry[1])
+                self.stats["snapshot_hits"] += 1
+                return self._snapshots[entry[1]]
+
+        key = (class_name, long_context, hashlib.sha256(
+            json.dumps(class_config, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest())
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None:
+                self._snapshots.move_to_end(key)
+                self._remember(identity, class_config, key)
+                self.stats["snapshot_hits"] += 1
+                return snapshot
+
+        # _load_scenario는 설정을 그대로 보관/수정할 수 있으므로 캐시된 원본이 아닌 복사본 전달
+        instance = cls()
+        instance._load_scenario(json.loads(json.dumps(class_config)), long_context=long_context)
+        snapshot = pickle.dumps(instance.__dict__, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.stats["scenario_loads"] += 1
+            self._snapshots[key] = snapshot
+            self._remember(identity, class_config, key)
+            if len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return snapshot
+
+    def _remember(self, identity, class_config, key):
+        # 원본 객체를 함께 보관하여 id 재사용으로 인한 오조회 방지 (lock 보유 상태에서 호출)
+        self._by_identity[identity] = (class_config, key)
+        if len(self._by_identity) > self.max_snapshots * 4:
+            self._by_identity.clear()
+
+class BFCLPooledExecutor:
+    """
+    멀티턴 테스트용 실제 백엔드 실행기
+
+    involved_classes의 func_source_code 인스턴스를 공유 ScenarioPool에서 빌려와
+    도구 호출을 실제 상태에 대해 실행합니다 (결과 문자열 형식은 BFCL 공식 실행기와 동일).
+    케이스가 끝나면 close()로 인스턴스를 풀에 반납해야 합니다.
+    """
+    _shared_pool = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, initial_config=None, involved_classes=None, long_context=False, pool=None):
+        self.config = initial_config or {}
+        self.involved_classes = list(involved_classes or [])
+        self.long_context = long_context
+        self.pool = pool or BFCLPooledExecutor.shared_pool()
+        self.instances = None
+        self._method_owner = {}
+
+    @classmethod
+    def shared_pool(cls):
+        """프로세스 전역 ScenarioPool (동시 실행 케이스/모델 간 공유)"""
+        with cls._shared_lock:
+            if cls._shared_pool is None:
+                cls._shared_pool = ScenarioPool()
+            return cls._shared_pool
+
+    def _ensure_instances(self):
+        """첫 호출 시 인스턴스 확보 (도구를 호출하지 않는 케이스는 풀을 사용하지 않음)"""
+        if self.instances is not None:
+            return
+        self.instances = {}
+        for class_name in self.involved_classes:
+            self.instances[class_name] = self.pool.acquire(class_name, self.config, self.long_context)
+            for method_name in self.pool.methods(class_name):
+                self._method_owner[method_name] = class_name
+
+    def execute(self, tool_call):
+        func_name = tool_call.get("name") or list(tool_call.keys())[0]
+        args = tool_call.get("arguments") or tool_call.get(func_name) or {}
+        # GorillaFileSystem.ls 형태로 오는 경우 메서드 이름만 사용
+        method_name = func_name.split(".")[-1]
+
+        try:
+            if method_name in _BLOCKED_FUNCTIONS:
+                raise Exception(f"Function call {method_name} is not allowed.")
+            self._ensure_instances()
+            class_name = self._method_owner.get(method_name)
+            if class_name is None:
+                raise Exception(f"Function {func_name} is not available.")
+            if not isinstance(args, dict):
+                raise Exception(f"Invalid arguments for {func_name}: {args}")
+            result = getattr(self.instances[class_name], method_name)(**args)
+        except Exception as e:
+            return f"Error during execution: {str(e)}"
+
+        if isinstance(result, str):
+            return result
+        if isinstance(result, dict):
+            try:
+                return json.dumps(result)
+            except (TypeError, ValueError):
+                return str(result)
+        return str(result)
+
+    def close(self):
+        """빌린 인스턴스를 풀에 반납"""
+        for class_name, instance in (self.instances or {}).items():
+            self.pool.release(class_name, instance)
+        self.instances = None
+        self._method_owner = {}
@@ -1,83 +1,451 @@
+import sys
 import json
 import re
 import time
-from openai import OpenAI
+import random
+import asyncio
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from openai import OpenAI, AsyncOpenAI
+from openai.types.chat import ChatCompletion
+
+from core.ratelimit import get_rate_limiter, parse_retry_after
+from core.stream import StreamAssembler, STREAM_PARAMS, sse_chunk
+from core.dedup import request_fingerprint
+from core.batch import BatchRunner
+
+# 프로세스 전역 HTTP 연결 풀 (bfcl generate와 같은 구현 사용, bfcl_eval 미설치 시 저장소 소스에서 import)
+try:
+    from bfcl_eval.model_handler.http_pool import (
+        configure as configure_http_pool, pool_stats as http_pool_stats, shared_http_client, shared_async_http_client
+    )
+except ImportError:
+    sys.path.append(str(Path(__file__).resolve().parent.parent / "berkeley-function-call-leaderboard"))
+    from bfcl_eval.model_handler.http_pool import (
+        configure as configure_http_pool, pool_stats as http_pool_stats, shared_http_client, shared_async_http_client
+    )
+
+# 프롬프트 캐시 힌트를 지원하는 provider (OpenRouter 모델명 prefix 기준)
+# - cache_control 브레이크포인트: Anthropic, Gemini (명시적 캐시)
+# - prompt_cache_key: OpenAI (같은 prefix 요청을 같은 캐시로 라우팅)
+# 그 외 provider는 자동 prefix 캐시를 사용하므로 prefix만 고정합니다.
+CACHE_CONTROL_PREFIXES = ("anthropic/", "google/gemini")
+PROMPT_CACHE_KEY_PREFIXES = ("openai/",)
+
+DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
+
+# OpenRouter 전용 요청 필드 (reasoning 포함, provider fallback 라우팅) - 다른 엔드포인트에는 보내지 않음
+OPENROUTER_EXTRA_BODY = {"include_reasoning": True, "include_thought": True, "route": "fallback"}
+
+# 이 호출만 백오프 후 재시도하는 상태 코드 (provider 없음 + 일시적 서버 오류)
+RETRYABLE_STATUSES = (404, 500, 502, 503, 504)
 
 class ModelHandler:
     """
     BFCL 표준 Handler: 네이티브 OpenAI tool_calls만 사용
     Inference 엔드포인트 초기화 및 결과물 디코딩(AST, Executable)을 담당합니다.
     """
-    def __init__(self, api_key, model_name, base_url="https://openrouter.ai/api/v1"):
-        self.client = OpenAI(api_key=api_key, base_url=base_url)
+    def __init__(self, api_key, model_name, base_url=DEFAULT_BASE_URL,
+                 max_rps=None, max_retries=6, base_backoff=1.0, max_backoff=60.0, rate_limiter=None,
+                 cache=None, rate_limit_key=None, prompt_cache=False, stream=False, stream_cutoff=True):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.is_openrouter = "openrouter.ai" in (base_url or "")
+        # 캐시 키/요청 지문에 포함할 엔드포인트 (기본 엔드포인트는 None - 기존 캐시 키 유지)
+        self.cache_endpoint = None if base_url == DEFAULT_BASE_URL else base_url
+        # 재시도는 SDK가 아닌 공유 레이트 리미터가 담당 (SDK 내부 재시도 비활성화)
+        # 연결은 프로세스 전역 풀을 공유 (모델/스레드가 달라도 keep-alive 연결 재사용)
+        self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0, http_client=shared_http_client())
+        self._async_client = None
+        self._async_loop = None
         self.model_name = model_name
-        self.name_map = {}
+        
+        # 재시도 정책 및 프로세스 전역 레이트 리미터 (같은 base_url끼리 공유,
+        # rate_limit_key를 주면 해당 키별로 별도 버킷 사용 - 예: 모델별 예산)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.rate_limiter = rate_limiter or get_rate_limiter(rate_limit_key or base_url, rate=max_rps)
+        
+        # 선택적 온디스크 inference 캐시 (core.cache.InferenceCache)
+        self.cache = cache
+        
+        # provider 프롬프트(prefix) 캐시 모드 (opt-in)
+        self.prompt_cache = prompt_cache
+        
+        # 스트리밍 요청 모드 (TTFT 측정, 응답은 비스트리밍과 같은 형태로 조립)
+        self.stream = stream
+        # 스트리밍 모드에서 stop_at_tool_call 요청을 첫 tool call 완성 시 끊을지 여부
+        self.stream_cutoff = stream_cutoff
+        
+        # 케이스 간 중복 요청 공유 계획 (core.dedup.RequestPlan, 실행 전 계획 단계에서 설정)
+        self.request_plan = None
 
-    def inference(self, messages, tools=None, temperature=0, force_tool=False, max_tokens=4096):
+    def inference(self, messages, tools=None, temperature=0, force_tool=False, max_tokens=4096,
+                  stop_at_tool_call=False):
         """
         BFCL 표준 inference: OpenAI 호환 tool_calls API 사용
+
+        stop_at_tool_call: 스트리밍 모드에서 첫 tool call의 JSON이 완성되면 나머지 생성을 기다리지 않고
+            스트림을 끊음 (호출 1개만 필요한 카테고리용, 비스트리밍 모드에서는 무시)
         """
         start_time = time.time()
-        sanitized_tools = self._prepare_tools(tools)
+        sanitized_tools, name_map = self._prepare_tools(tools)
+        params = self._build_params(messages, sanitized_tools, temperature, force_tool, max_tokens)
 
-        max_retries = 3
-        retry_delay = 5
+        cache_key, cached = self._cache_lookup(params)
+        if cached is not None:
+            return self._build_result(cached, start_time, name_map, cached=True)
 
-        for attempt in range(max_retries):
+        share_key, shared, leader = self._share_claim(params, stop_at_tool_call)
+        if shared is not None and not leader:
             try:
-                params = {
-                    "model": self.model_name,
-                    "messages": messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                    "extra_body": {
-                        "include_reasoning": True,
-                        "include_thought": True,
-                        "route": "fallback"
-                    }
-                }
-                
-                # Tool calling 설정 (BFCL 표준)
-                if sanitized_tools:
-                    params["tools"] = sanitized_tools
-                    params["tool_choice"] = "required" if force_tool else "auto"
-                    
-                response = self.client.chat.completions.create(**params)
-                latency = (time.time() - start_time) * 1000
-                
-                msg = response.choices[0].message
-                full_msg_dict = msg.model_dump()
-                
-                # 사고 과정 추출
-                thinking = self._extract_thinking(msg, full_msg_dict)
-
-                return {
-                    "raw_response": response,
-                    "msg_obj": msg,
-                    "content": msg.content or "",
-                    "thinking": thinking,
-                    "latency": round(latency, 2),
-                    "tokens": response.usage.total_tokens if response.usage else 0
-                }
-            except Exception as e:
-                error_str = str(e)
-                # 429 (Rate limit) 또는 404 (Provider unavailable) 에러는 재시도
-                if (("429" in error_str or "404" in error_str) and attempt < max_retries - 1):
-                    error_type = "Rate limited" if "429" in error_str else "Provider unavailable (404)"
-                    print(f"⚠️ {error_type}. Retrying in {retry_delay}s... (Attempt {attempt + 1}/{max_retries})")
+                return self._shared_result(shared.result(), start_time, name_map)
+            except Exception:
+                pass  # leader 실패: 직접 요청
+
+        telemetry = self._new_telemetry()
+        try:
+            for attempt in range(self.max_retries):
+                self._record_wait(telemetry, attempt, self.rate_limiter.acquire())
+                try:
+                    response = self._create(params, telemetry, stop_at_tool_call)
+                    self._cache_store(cache_key, response, telemetry)
+                    if leader:
+                        self.request_plan.resolve(shared, response)
+                    return self._build_result(response, start_time, name_map, telemetry=telemetry)
+                except Exception as e:
+                    retry_delay = self._retry_delay(e, attempt)
+                    if retry_delay is None:
+                        self._raise_inference_error(e)
+                    self._record_retry(telemetry, retry_delay)
                     time.sleep(retry_delay)
-                    retry_delay *= 2
-                    continue
-                # 마지막 시도 실패
-                if "404" in error_str:
-                    raise Exception(f"Inference Failed: Model '{self.model_name}' not available. All providers returned 404. Full error: {error_str}")
-                raise Exception(f"Inference Failed: {error_str}")
+        except BaseException as e:
+            if leader:
+                self.request_plan.fail(share_key, shared, e)
+            raise
+
+    async def ainference(self, messages, tools=None, temperature=0, force_tool=False, max_tokens=4096,
+                         stop_at_tool_call=False):
+        """
+        inference()의 비동기 버전 (AsyncOpenAI 사용, 동시 실행 모드용)
+        """
+        start_time = time.time()
+        sanitized_tools, name_map = self._prepare_tools(tools)
+        params = self._build_params(messages, sanitized_tools, temperature, force_tool, max_tokens)
+
+        cache_key, cached = self._cache_lookup(params)
+        if cached is not None:
+            return self._build_result(cached, start_time, name_map, cached=True)
+
+        share_key, shared, leader = self._share_claim(params, stop_at_tool_call)
+        if shared is not None and not leader:
+            try:
+                return self._shared_result(await asyncio.wrap_future(shared), start_time, name_map)
+            except Exception:
+                pass  # leader 실패: 직접 요청
+
+        telemetry = self._new_telemetry()
+        try:
+            for attempt in range(self.max_retries):
+                self._record_wait(telemetry, attempt, await self.rate_limiter.aacquire())
+                try:
+                    response = await self._acreate(params, telemetry, stop_at_tool_call)
+                    self._cache_store(cache_key, response, telemetry)
+                    if leader:
+                        self.request_plan.resolve(shared, response)
+                    return self._build_result(response, start_time, name_map, telemetry=telemetry)
+                except Exception as e:
+                    retry_delay = self._retry_delay(e, attempt)
+                    if retry_delay is None:
+                        self._raise_inference_error(e)
+                    self._record_retry(telemetry, retry_delay)
+                    await asyncio.sleep(retry_delay)
+        except BaseException as e:
+            if leader:
+                self.request_plan.fail(share_key, shared, e)
+            raise
+
+    def _create(self, params, telemetry, stop_at_tool_call=False):
+        """요청 1회 실행 후 ChatCompletion 반환 (스트리밍 모드면 TTFT/time-to-tool-call을 telemetry에 기록)"""
+        request_start = time.time()
+        if self.stream:
+            raw = self.client.chat.completions.with_raw_response.create(**params, **STREAM_PARAMS)
+            # SDK 스트림은 [DONE]에서 읽기를 멈추고 응답을 닫아 연결이 풀로 돌아가지 않으므로
+            # SSE를 끝까지 직접 읽고, 모든 경로(조기 종료/예외 포함)에서 응답을 명시적으로 닫음
+            response = raw.http_response
+            try:
+                self.rate_limiter.update_from_headers(raw.headers)
+                assembler = StreamAssembler(request_start)
+                for line in response.iter_lines():
+                    chunk = sse_chunk(line, response)
+                    if chunk is None:
+                        continue
+                    assembler.add(chunk)
+                    if stop_at_tool_call and self.stream_cutoff and assembler.tool_call_done:
+                        # 연결을 닫아 남은 생성(추가 설명, 사고 과정 등)을 기다리지 않음 (이 연결은 재사용 불가)
+                        assembler.cut = True
+                        break
+            finally:
+                response.close()
+            return self._finish_stream(assembler, telemetry)
+
+        raw = self.client.chat.completions.with_raw_response.create(**params)
+        self.rate_limiter.update_from_headers(raw.headers)
+        return raw.parse()
+
+    async def _acreate(self, params, telemetry, stop_at_tool_call=False):
+        """_create()의 비동기 버전"""
+        request_start = time.time()
+        if self.stream:
+            raw = await self.async_client.chat.completions.with_raw_response.create(**params, **STREAM_PARAMS)
+            response = raw.http_response
+            try:
+                self.rate_limiter.update_from_headers(raw.headers)
+                assembler = StreamAssembler(request_start)
+                async for line in response.aiter_lines():
+                    chunk = sse_chunk(line, response)
+                    if chunk is None:
+                        continue
+                    assembler.add(chunk)
+                    if stop_at_tool_call and self.stream_cutoff and assembler.tool_call_done:
+                        assembler.cut = True
+                        break
+            finally:
+                await response.aclose()
+            return self._finish_stream(assembler, telemetry)
+
+        raw = await self.async_client.chat.completions.with_raw_response.create(**params)
+        self.rate_limiter.update_from_headers(raw.headers)
+        return raw.parse()
+
+    @staticmethod
+    def _finish_stream(assembler, telemetry):
+        telemetry["ttft"] = assembler.ttft
+        telemetry["ttc"] = assembler.ttc
+        telemetry["stream_cut"] = assembler.cut
+        return assembler.build()
+
+    @staticmethod
+    def _new_telemetry():
+        """
+        호출 1회(재시도 포함)의 계측값: TTFT, time-to-tool-call, 스트림 조기 종료 여부,
+        재시도 횟수, 백오프/페이싱 대기 시간(ms)
+        """
+        return {"ttft": None, "ttc": None, "stream_cut": False, "retries": 0, "backoff": 0.0, "rate_wait": 0.0}
+
+    @staticmethod
+    def _record_wait(telemetry, attempt, wait):
+        """리미터 대기 기록 (첫 시도는 페이싱 대기, 재시도 전 대기는 백오프로 집계)"""
+        telemetry["backoff" if attempt else "rate_wait"] += wait * 1000
+
+    @staticmethod
+    def _record_retry(telemetry, retry_delay):
+        telemetry["retries"] += 1
+        telemetry["backoff"] += retry_delay * 1000
+
+    @property
+    def async_client(self):
+        """AsyncOpenAI 클라이언트 (이벤트 루프별 공유 연결 풀 사용, 루프가 바뀌면 다시 생성)"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0,
+                                             http_client=shared_async_http_client())
+            self._async_loop = loop
+        return self._async_client
+
+    def _build_params(self, messages, sanitized_tools, temperature, force_tool, max_tokens):
+        """chat.completions.create 요청 파라미터 구성"""
+        params = {
+            "model": self.model_name,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        if self.is_openrouter:
+            params["extra_body"] = dict(OPENROUTER_EXTRA_BODY)
+        
+        # Tool calling 설정 (BFCL 표준)
+        if sanitized_tools:
+            params["tools"] = sanitized_tools
+            params["tool_choice"] = "required" if force_tool else "auto"
+        
+        if self.prompt_cache:
+            self._apply_prompt_cache(params)
+        return params
+
+    def _apply_prompt_cache(self, params):
+        """
+        프롬프트 캐시 모드: system + tools prefix를 바이트 단위로 고정하고 provider 캐시 힌트 추가
+
+        - tools를 함수 이름순으로 정렬 (같은 도구 집합이면 involved_classes 순서와 관계없이 같은 prefix)
+        - Anthropic/Gemini: system 메시지 끝에 cache_control 브레이크포인트 (tools + system이 캐시됨)
+        - OpenAI: prefix 해시를 prompt_cache_key로 전달
+        """
+        if params.get("tools"):
+            params["tools"] = sorted(params["tools"], key=lambda t: t["function"]["name"])
+
+        messages = params["messages"]
+        has_system = bool(messages) and messages[0].get("role") == "system" and isinstance(messages[0].get("content"), str)
+        if has_system and self.model_name.startswith(CACHE_CONTROL_PREFIXES):
+            system = {
+                "role": "system",
+                "content": [{"type": "text", "text": messages[0]["content"], "cache_control": {"type": "ephemeral"}}]
+            }
+            params["messages"] = [system] + messages[1:]
+
+        if self.model_name.startswith(PROMPT_CACHE_KEY_PREFIXES):
+            prefix = json.dumps([messages[:1] if has_system else [], params.get("tools")],
+                                sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+            params.setdefault("extra_body", {})["prompt_cache_key"] = hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:32]
+
+    def _cache_lookup(self, params):
+        """캐시 키 생성 및 조회, (key, ChatCompletion 또는 None) 반환"""
+        if self.cache is None or self.cache.mode == "off":
+            return None, None
+        key = self.cache.make_key(params, self.cache_endpoint)
+        cached = self.cache.get(key)
+        return key, (ChatCompletion.model_validate(cached) if cached is not None else None)
+
+    def _cache_store(self, key, response, telemetry=None):
+        """성공한 응답을 캐시에 저장 (조기 종료한 스트림 응답은 usage가 없고 잘려 있으므로 제외)"""
+        if telemetry and telemetry["stream_cut"]:
+            return
+        if key is not None and self.cache.writable:
+            self.cache.put(key, response.model_dump(mode="json"))
+
+    def request_fingerprint(self, messages, tools=None, temperature=0, force_tool=False, max_tokens=4096,
+                            stop_at_tool_call=False):
+        """inference()와 같은 인자로 요청 지문 계산 (중복 요청 계획용, 공유 대상이 아니면 None)"""
+        sanitized_tools, _ = self._prepare_tools(tools)
+        params = self._build_params(messages, sanitized_tools, temperature, force_tool, max_tokens)
+        return request_fingerprint(params, stop_at_tool_call, self.cache_endpoint)
+
+    def batch_request(self, custom_id, messages, tools=None, temperature=0, force_tool=False, max_tokens=4096,
+                      stop_at_tool_call=False):
+        """
+        inference()와 같은 인자를 Batch API 입력 라인으로 변환 (배치 모드, 스트리밍/재시도 없음)
+
+        Returns:
+            (배치 라인, batch_result()에 넘길 컨텍스트, None) 또는 캐시 hit이면 (None, None, inference 결과)
+        """
+        sanitized_tools, name_map = self._prepare_tools(tools)
+        params = self._build_params(messages, sanitized_tools, temperature, force_tool, max_tokens)
+        cache_key, cached = self._cache_lookup(params)
+        if cached is not None:
+            return None, None, self._build_result(cached, time.time(), name_map, cached=True)
+        # 배치 본문에는 OpenRouter 전용 필드를 넣지 않음 (Batch API provider가 거부하는 필드)
+        extra_body = {key: value for key, value in (params.pop("extra_body", None) or {}).items()
+                      if key not in OPENROUTER_EXTRA_BODY}
+        if extra_body:
+            params["extra_body"] = extra_body
+        return BatchRunner.request_line(custom_id, params), (cache_key, name_map), None
+
+    def batch_result(self, body, context):
+        """배치 응답 본문(ChatCompletion 딕셔너리) → inference 결과 (배치는 요청별 latency가 없으므로 0에 가까움)"""
+        cache_key, name_map = context
+        response = ChatCompletion.model_validate(body)
+        self._cache_store(cache_key, response)
+        return self._build_result(response, time.time(), name_map)
+
+    def _share_claim(self, params, stop_at_tool_call):
+        """중복 요청 계획에 포함된 요청이면 (지문, 응답 Future, leader 여부) 반환"""
+        if self.request_plan is None:
+            return None, None, False
+        key = request_fingerprint(params, stop_at_tool_call, self.cache_endpoint)
+        if key is None:
+            return None, None, False
+        shared, leader = self.request_plan.claim(key)
+        return key, shared, leader
+
+    def _shared_result(self, response, start_time, name_map):
+        """다른 케이스(leader)의 응답으로 결과 구성 (API 호출 없음)"""
+        self.request_plan.record_shared()
+        result = self._build_result(response, start_time, name_map)
+        result["shared"] = True
+        return result
+
+    def _build_result(self, response, start_time, name_map, cached=False, telemetry=None):
+        """API 응답을 inference 결과 딕셔너리로 변환"""
+        telemetry = telemetry or self._new_telemetry()
+        latency = (time.time() - start_time) * 1000
+        
+        msg = response.choices[0].message
+        full_msg_dict = msg.model_dump()
+        
+        # 사고 과정 추출
+        thinking = self._extract_thinking(msg, full_msg_dict)
+        prompt_tokens, cached_tokens, completion_tokens = _usage_tokens(response.usage)
+
+        return {
+            "raw_response": response,
+            "msg_obj": msg,
+            "content": msg.content or "",
+            "thinking": thinking,
+            "latency": round(latency, 2),
+            "tokens": response.usage.total_tokens if response.usage else 0,
+            "prompt_tokens": prompt_tokens,
+            "cached_tokens": cached_tokens,  # provider prefix 캐시에서 읽은 prompt 토큰
+            "completion_tokens": completion_tokens,
+            # 스텝 계측 (ttft/ttc는 스트리밍 모드에서만, 시간 단위 ms)
+            # stream_cut이면 첫 tool call 직후 스트림을 끊어 usage가 없음 (completion 토큰 0으로 집계)
+            "ttft": telemetry["ttft"],
+            "ttc": telemetry["ttc"],
+            "stream_cut": telemetry["stream_cut"],
+            "retries": telemetry["retries"],
+            "backoff": round(telemetry["backoff"], 2),
+            "rate_wait": round(telemetry["rate_wait"], 2),
+            "cached": cached,
+            "shared": False,  # 다른 케이스와 공유한 응답 여부 (core.dedup.RequestPlan)
+            # decode_ast()에서 원래 함수 이름 복원에 사용
+            "name_map": name_map
+        }
+
+    def _retry_delay(self, error, attempt):
+        """
+        재시도 대기 시간(초) 계산, 재시도하지 않을 에러면 None
+
+        - 429 (Rate limit): Retry-After/x-ratelimit-* 헤더를 공유 리미터에 반영하여
+          같은 provider를 쓰는 모든 호출을 함께 멈춤 (헤더가 없으면 지수 백오프)
+        - 404 (Provider unavailable), 5xx (일시적 서버 오류): 이 호출만 지수 백오프 후 재시도
+        """
+        if attempt >= self.max_retries - 1:
+            return None
+        status = getattr(error, "status_code", None)
+        error_str = str(error)
+        is_rate_limited = status == 429 or (status is None and "429" in error_str)
+        is_unavailable = status in RETRYABLE_STATUSES or (status is None and "404" in error_str)
+        if not (is_rate_limited or is_unavailable):
+            return None
+
+        backoff = min(self.max_backoff, self.base_backoff * (2 ** attempt)) * random.uniform(0.8, 1.2)
+        if is_rate_limited:
+            headers = getattr(getattr(error, "response", None), "headers", None)
+            retry_after = parse_retry_after(headers)
+            self.rate_limiter.update_from_headers(headers)
+            self.rate_limiter.penalize(retry_after if retry_after is not None else backoff)
+            print(f"⚠️ Rate limited. Pacing all requests{f' for {retry_after:.1f}s' if retry_after is not None else ''}... (Attempt {attempt + 1}/{self.max_retries})")
+            # 실제 대기는 다음 acquire()에서 공유 리미터가 처리
+            return 0
+        reason = status if status is not None else error_str[:100]
+        print(f"⚠️ Provider unavailable ({reason}). Retrying in {backoff:.1f}s... (Attempt {attempt + 1}/{self.max_retries})")
+        return backoff
+
+    def _raise_inference_error(self, error):
+        """마지막 시도 실패"""
+        error_str = str(error)
+        if "404" in error_str:
+            raise Exception(f"Inference Failed: Model '{self.model_name}' not available. All providers returned 404. Full error: {error_str}")
+        raise Exception(f"Inference Failed: {error_str}")
 
     def decode_ast(self, inference_result):
         """
         BFCL 표준: 네이티브 OpenAI tool_calls만 사용
         """
         msg = inference_result["msg_obj"]
+        name_map = inference_result.get("name_map", {})
         decoded_output = []
         
         # 네이티브 tool_calls만 처리
@@ -86,7 +454,7 @@ class ModelHandler:
         
         for tc in msg.tool_calls:
             san_name = tc.function.name
-            orig_name = self.name_map.get(san_name, san_name)
+            orig_name = name_map.get(san_name, san_name)
             raw_args = tc.function.arguments
             
             # Arguments 파싱
@@ -151,71 +519,16 @@ class ModelHandler:
         return executable_output
 
     def _prepare_tools(self, tools):
-        """Tools를 OpenAI 표준 형식으로 변환"""
+        """
+        Tools를 OpenAI 표준 형식으로 변환
+
+        Returns:
+            (sanitized_tools, name_map): name_map은 sanitize된 이름 → 원래 이름 매핑
+            (인스턴스 상태로 두지 않으므로 동시 호출에 안전)
+        """
         if not tools:
-            return None
-        
-        sanitized = []
-        self.name_map = {}
-        
-        def sanitize_schema(schema):
-            if isinstance(schema, dict):
-                new_schema = schema.copy()
-                
-                # Type 필드 처리
-                if "type" in new_schema:
-                    type_value = new_schema["type"]
-                    
-                    # "any" 타입 제거
-                    if type_value == "any":
-                        del new_schema["type"]
-                    # 대문자 타입 변환
-                    elif isinstance(type_value, str):
-                        type_lower = type_value.lower()
-                        
-                        type_mapping = {
-                            "dict": "object",
-                            "float": "number",
-                            "int": "integer",
-                            "list": "array",
-                            "bool": "boolean",
-                            "string": "string",
-                            "number": "number",
-                            "integer": "integer",
-                            "object": "object",
-                            "array": "array",
-                            "boolean": "boolean",
-                            "null": "null"
-                        }
-                        
-                        if type_lower in type_mapping:
-                            new_schema["type"] = type_mapping[type_lower]
-                        else:
-                            del new_schema["type"]
-                
-                # 재귀적으로 sanitize
-                if "properties" in new_schema:
-                    new_schema["properties"] = {k: sanitize_schema(v) for k, v in new_schema["properties"].items()}
-                if "items" in new_schema:
-                    new_schema["items"] = sanitize_schema(new_schema["items"])
-                return new_schema
-            return schema
-
-        for f in tools:
-            orig_name = f["name"]
-            # 점(.)을 언더바(_)로 치환 (OpenAI 호환)
-            san_name = orig_name.replace(".", "_")
-            self.name_map[san_name] = orig_name
-            
-            sanitized.append({
-                "type": "function",
-                "function": {
-                    "name": san_name,
-                    "description": f.get("description", ""),
-                    "parameters": sanitize_schema(f["parameters"])
-                }
-            })
-        return sanitized
+            return None, {}
+        return compile_tools(tools)
 
     def _extract_thinking(self, msg, full_msg_dict):
         """사고 과정 추출"""
@@ -230,3 +543,107 @@ class ModelHandler:
             if match:
                 thinking = match.group(1).strip()
         return thinking if thinking else "N/A"
+
+# ==========================================
+# [Tool 스키마 컴파일 캐시]
+# ==========================================
+# 같은 함수 문서는 매 스텝마다 다시 sanitize하지 않도록 원본 문서의 해시로 캐시 (프로세스 전역, thread-safe)
+_TOOL_CACHE_SIZE = 4096
+_TOOL_CACHE = OrderedDict()
+_TOOL_CACHE_LOCK = threading.Lock()
+
+_TYPE_MAPPING = {
+    "dict": "object",
+    "float": "number",
+    "int": "integer",
+    "list": "array",
+    "bool": "boolean",
+    "string": "string",
+    "number": "number",
+    "integer": "integer",
+    "object": "object",
+    "array": "array",
+    "boolean": "boolean",
+    "null": "null"
+}
+
+def _usage_tokens(usage):
+    """usage에서 (prompt, cached, completion) 토큰 수 추출 (provider별 필드 차이 흡수)"""
+    if usage is None:
+        return 0, 0, 0
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) if details is not None else None
+    if cached is None:
+        # Anthropic 호환 필드
+        cached = (getattr(usage, "model_extra", None) or {}).get("cache_read_input_tokens")
+    return usage.prompt_tokens or 0, cached or 0, usage.completion_tokens or 0
+
+def compile_tools(tools):
+    """
+    BFCL 함수 문서를 OpenAI tools 형식으로 변환 (캐시 사용)
+
+    반환되는 리스트/딕셔너리는 호출 간 공유되므로 수정하면 안 됩니다.
+
+    Returns:
+        (sanitized_tools, name_map)
+    """
+    key = hashlib.sha256(
+        json.dumps(tools, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+    with _TOOL_CACHE_LOCK:
+        compiled = _TOOL_CACHE.get(key)
+        if compiled is not None:
+            _TOOL_CACHE.move_to_end(key)
+            return compiled
+
+    sanitized = []
+    name_map = {}
+    for f in tools:
+        orig_name = f["name"]
+        # 점(.)을 언더바(_)로 치환 (OpenAI 호환)
+        san_name = orig_name.replace(".", "_")
+        name_map[san_name] = orig_name
+        
+        sanitized.append({
+            "type": "function",
+            "function": {
+                "name": san_name,
+                "description": f.get("description", ""),
+                "parameters": _sanitize_schema(f["parameters"])
+            }
+        })
+    compiled = (sanitized, name_map)
+
+    with _TOOL_CACHE_LOCK:
+        _TOOL_CACHE[key] = compiled
+        if len(_TOOL_CACHE) > _TOOL_CACHE_SIZE:
+            _TOOL_CACHE.popitem(last=False)
+    return compiled
+
+def _sanitize_schema(schema):
+    """JSON 스키마의 BFCL 타입 표기를 OpenAI 호환 타입으로 재귀 변환"""
+    if isinstance(schema, dict):
+        new_schema = schema.copy()
+        
+        # Type 필드 처리
+        if "type" in new_schema:
+            type_value = new_schema["type"]
+            
+            # "any" 타입 제거
+            if type_value == "any":
+                del new_schema["type"]
+            # 대문자 타입 변환
+            elif isinstance(type_value, str):
+                type_lower = type_value.lower()
+                if type_lower in _TYPE_MAPPING:
+                    new_schema["type"] = _TYPE_MAPPING[type_lower]
+                else:
+                    del new_schema["type"]
+        
+        # 재귀적으로 sanitize
+        if "properties" in new_schema:
+            new_schema["properties"] = {k: _sanitize_schema(v) for k, v in new_schema["properties"].items()}
+        if "items" in new_schema:
+            new_schema["items"] = _sanitize_schema(new_schema["items"])
+        return new_schema
+    return schema
@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import threading
+from pathlib import Path
+
+class ResultJournal:
+    """
+    케이스 단위 append-only JSONL 결과 저널 (크래시 안전)
+
+    완료된 케이스마다 한 줄({"model", "category", "id", "result"})을 추가하고,
+    flush_every건 또는 flush_interval초마다 fsync합니다.
+    중단 후 --resume으로 재시작하면 이미 완료된 (model, category, id)는 건너뜁니다.
+    """
+    def __init__(self, path, resume=False, flush_every=20, flush_interval=5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._records = {}
+
+        if resume:
+            self._truncate_torn_tail()
+            self._records = self._read_records()
+        else:
+            # 새 실행: 기존 저널을 비우고 시작
+            self.path.write_text("", encoding="utf-8")
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+        self._fd = os.open(str(self.path), flags, 0o644)
+
+    def _truncate_torn_tail(self):
+        """크래시로 잘린 마지막 줄 제거 (이어 쓰는 줄이 잘린 줄에 붙지 않도록)"""
+        if not self.path.exists():
+            return
+        data = self.path.read_bytes()
+        if data and not data.endswith(b"\n"):
+            with open(self.path, "r+b") as f:
+                f.truncate(data.rfind(b"\n") + 1)
+
+    def _read_records(self):
+        """저널 파일 로드 (크래시로 잘린 마지막 줄 등 손상된 줄은 무시)"""
+        return _read_journal(self.path)
+
+    @staticmethod
+    def load_results(path, model=None):
+        """저널 파일의 케이스 결과 목록 (읽기 전용, model이 주어지면 해당 모델만)"""
+        return [result for (m, _, _), result in _read_journal(Path(path)).items() if model is None or m == model]
+
+    def is_completed(self, model, category, test_id):
+        return (model, category, test_id) in self._records
+
+    def completed_count(self, model):
+        return sum(1 for (m, _, _) in self._records if m == model)
+
+    def append(self, model, result):
+        """완료된 케이스 결과 기록 (배치 단위 fsync)"""
+        record = {"model": model, "category": result["Category"], "id": result["ID"], "result": result}
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            # O_APPEND + 단일 write로 줄 단위 원자성 유지 (여러 프로세스가 같은 파일에 기록해도 안전)
+            os.write(self._fd, line)
+            self._records[(model, result["Category"], result["ID"])] = result
+            self._pending += 1
+            if self._pending >= self.flush_every or time.monotonic() - self._last_sync >= self.flush_interval:
+                self._sync()
+
+    def _sync(self):
+        os.fsync(self._fd)
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def get(self, model, category, test_id):
+        return self._records.get((model, category, test_id))
+
+    def close(self):
+        with self._lock:
+            if self._fd is not None:
+                self._sync()
+                os.close(self._fd)
+                self._fd = None
+
+def _read_journal(path):
+    """{(model, category, id): result} 딕셔너리로 저널 로드 (손상된 줄은 무시)"""
+    records = {}
+    if not path.exists():
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[(record["model"], record["category"], record["id"])] = record["result"]
+    return records
@@ -1,27 +1,90 @@
+import re
 import json
+import threading
 from pathlib import Path
 
+class _JsonlFile:
+    """
+    JSONL 파일의 프로세스 단위 파싱 캐시
+
+    앞에서부터 필요한 줄 수만큼만 파싱하며(limit 조기 종료), 이미 파싱한 줄은 다시 파싱하지 않습니다.
+    전체 파일이 로드되면 id 인덱스를 제공합니다.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.records = []
+        self.complete = False
+        self._by_id = None
+        self._lock = threading.Lock()
+
+    def head(self, limit=None):
+        """앞에서부터 limit개 레코드 반환 (limit이 None이면 전체)"""
+        limit = limit or None
+        with self._lock:
+            if not self.complete and (limit is None or len(self.records) < limit):
+                self._read_until(limit)
+            return self.records[:limit] if limit else list(self.records)
+
+    def get(self, record_id):
+        """id로 레코드 조회 (없으면 None)"""
+        with self._lock:
+            if not self.complete:
+                self._read_until(None)
+            if self._by_id is None:
+                self._by_id = {r.get("id"): r for r in self.records}
+            return self._by_id.get(record_id)
+
+    def _read_until(self, limit):
+        """이미 파싱한 줄은 건너뛰고, limit개가 될 때까지(또는 파일 끝까지) 파싱"""
+        parsed = len(self.records)
+        with open(self.path, 'r', encoding='utf-8') as f:
+            seen = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                seen += 1
+                if seen <= parsed:
+                    continue
+                self.records.append(json.loads(line))
+                if limit is not None and len(self.records) >= limit:
+                    return
+        self.complete = True
+
 class BFCLDataLoader:
+    # 데이터 파일/함수 문서 캐시는 인스턴스 간 공유 (프로세스당 파일별 1회 파싱)
+    _files = {}
+    _func_docs = {}
+    _cache_lock = threading.Lock()
+
     def __init__(self, data_root="berkeley-function-call-leaderboard/bfcl_eval/data"):
         self.data_root = Path(data_root)
         self.ans_root = self.data_root / "possible_answer"
 
+    def _file(self, path):
+        """경로별 공유 _JsonlFile 반환 (파일이 없으면 None)"""
+        key = str(path.resolve())
+        with BFCLDataLoader._cache_lock:
+            cached = BFCLDataLoader._files.get(key)
+            if cached is None:
+                if not path.exists():
+                    return None
+                cached = BFCLDataLoader._files[key] = _JsonlFile(path)
+            return cached
+
     def load_dataset(self, category, limit=None):
-        data_path = self.data_root / f"BFCL_v4_{category}.json"
-        ans_path = self.ans_root / f"BFCL_v4_{category}.json"
-        
+        data_file = self._file(self.data_root / f"BFCL_v4_{category}.json")
+
         # Question 파일이 없으면 None 반환
-        if not data_path.exists():
+        if data_file is None:
             return None, None
-            
-        # Question 파일 로드
-        with open(data_path, 'r', encoding='utf-8') as f:
-            questions = [json.loads(line) for line in f.readlines()]
-            if limit: questions = questions[:limit]
-        
+
+        # Question 파일 로드 (limit이 있으면 필요한 줄까지만 파싱)
+        questions = data_file.head(limit)
+
         # Possible answer 파일이 없는 경우: ground_truth를 question에서 추출
         # (irrelevance, live_irrelevance, live_relevance, format_sensitivity)
-        if not ans_path.exists():
+        ans_file = self._file(self.ans_root / f"BFCL_v4_{category}.json")
+        if ans_file is None:
             # ground_truth가 question 내부에 있는 경우
             answers = []
             for q in questions:
@@ -31,40 +94,66 @@ class BFCLDataLoader:
                     # ground_truth가 없으면 빈 리스트로 가정 (relevance 카테고리)
                     answers.append({'ground_truth': []})
             return questions, answers
-            
+
         # Possible answer 파일이 있는 경우: 정답 로드
-        with open(ans_path, 'r', encoding='utf-8') as f:
-            answers = [json.loads(line) for line in f.readlines()]
-            if limit: answers = answers[:limit]
-            
+        answers = ans_file.head(limit)
         return questions, answers
 
+    def get_case(self, category, record_id):
+        """카테고리의 (question, answer) 한 건을 id로 조회 (없으면 (None, None), 정답 규칙은 load_dataset과 동일)"""
+        data_file = self._file(self.data_root / f"BFCL_v4_{category}.json")
+        question = data_file.get(record_id) if data_file else None
+        if question is None:
+            return None, None
+        ans_file = self._file(self.ans_root / f"BFCL_v4_{category}.json")
+        if ans_file is None:
+            return question, {'ground_truth': question.get('ground_truth', [])}
+        return question, ans_file.get(record_id)
+
+    def get_record(self, relative_path, record_id):
+        """data_root 기준 JSONL 파일에서 id로 레코드 조회 (인덱스 사용)"""
+        data_file = self._file(self.data_root / relative_path)
+        return data_file.get(record_id) if data_file else None
+
+    def get_records(self, relative_path):
+        """data_root 기준 JSONL 파일의 전체 레코드 (파일이 없으면 빈 리스트)"""
+        data_file = self._file(self.data_root / relative_path)
+        return data_file.head() if data_file else []
+
     def is_multi_turn(self, category):
         return "multi_turn" in category or "web_search" in category
 
     def get_functions(self, category, question_data):
         if 'function' in question_data:
             return question_data['function']
-        
+
         # Multi-turn/Agentic 카테고리: involved_classes 기반으로 함수 로드
         if 'involved_classes' in question_data:
             all_functions = []
             for class_name in question_data['involved_classes']:
-                # 클래스명을 snake_case 파일명으로 변환
-                # GorillaFileSystem -> gorilla_file_system
-                file_name = self._class_to_filename(class_name)
-                func_doc_path = self.data_root / "multi_turn_func_doc" / f"{file_name}.json"
-                
-                if func_doc_path.exists():
-                    with open(func_doc_path, 'r', encoding='utf-8') as f:
-                        # JSONL 형식: 각 줄이 하나의 함수
-                        for line in f:
-                            if line.strip():
-                                all_functions.append(json.loads(line))
+                all_functions.extend(self._class_functions(class_name))
             return all_functions
-        
+
         return []
-    
+
+    def _class_functions(self, class_name):
+        """클래스별 함수 문서 (프로세스당 1회 로드)"""
+        key = (str(self.data_root.resolve()), class_name)
+        with BFCLDataLoader._cache_lock:
+            cached = BFCLDataLoader._func_docs.get(key)
+        if cached is not None:
+            return cached
+
+        # 클래스명을 snake_case 파일명으로 변환
+        # GorillaFileSystem -> gorilla_file_system
+        file_name = self._class_to_filename(class_name)
+        func_doc = self._file(self.data_root / "multi_turn_func_doc" / f"{file_name}.json")
+        # JSONL 형식: 각 줄이 하나의 함수
+        functions = func_doc.head() if func_doc else []
+        with BFCLDataLoader._cache_lock:
+            BFCLDataLoader._func_docs[key] = functions
+        return functions
+
     def _class_to_filename(self, class_name):
         """클래스명을 파일명으로 변환 (예: GorillaFileSystem -> gorilla_file_system)"""
         # 특수 케이스 매핑 (실제 파일명과 클래스명이 다른 경우)
@@ -72,12 +161,11 @@ class BFCLDataLoader:
             'TwitterAPI': 'posting_api',
             'MessageAPI': 'message_api',
         }
-        
+
         if class_name in special_mapping:
             return special_mapping[class_name]
-        
+
         # 일반 케이스: CamelCase -> snake_case
-        import re
         # 대문자 앞에 언더스코어 추가 (첫 글자 제외)
         s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', class_name)
         # 연속된 대문자와 소문자 사이에 언더스코어 추가
@@ -0,0 +1,185 @@
+import re
+import time
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+
+class RateLimiter:
+    """
+    프로세스 전역 토큰 버킷 레이트 리미터
+
+    모든 ModelHandler 호출이 공유하며, 응답 헤더(Retry-After, x-ratelimit-remaining-*,
+    x-ratelimit-reset-*)를 읽어 provider 한도 바로 아래로 요청 속도를 조절합니다.
+    동기(acquire)/비동기(aacquire) 호출 모두 같은 버킷을 사용합니다.
+    """
+    def __init__(self, rate=None, safety_margin=1, headroom=0.9):
+        """
+        Args:
+            rate: 최대 초당 요청 수 (None이면 헤더로 한도를 알기 전까지 무제한)
+            safety_margin: 남은 요청 수가 이 값 이하이면 reset 시점까지 대기
+            headroom: 헤더 기반 속도에 곱하는 여유 비율 (한도 바로 아래 유지)
+        """
+        self._lock = threading.Lock()
+        self.max_rate = rate
+        self.rate = rate
+        self.safety_margin = safety_margin
+        self.headroom = headroom
+        self._capacity = max(1.0, rate) if rate else 1.0
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.stats = {"requests": 0, "throttled": 0, "wait_time": 0.0}
+
+    def configure(self, rate):
+        """최대 초당 요청 수 설정 (None이면 상한 없음)"""
+        with self._lock:
+            self.max_rate = rate
+            self.rate = rate if rate else None
+            self._capacity = max(1.0, rate) if rate else 1.0
+            self._tokens = min(self._tokens, self._capacity)
+            self._updated = time.monotonic()
+
+    def acquire(self):
+        """요청 1건 슬롯 확보 (필요하면 블로킹 대기), 대기한 시간(초) 반환"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self):
+        """acquire()의 비동기 버전"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def _reserve(self):
+        """토큰 1개를 예약하고 필요한 대기 시간 계산 (토큰은 음수까지 허용 = 대기열)"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+            if self.rate:
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+            self.stats["requests"] += 1
+            self.stats["wait_time"] += wait
+            return wait
+
+    def penalize(self, delay):
+        """429 등으로 모든 호출을 delay초 동안 멈춤"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+            self.stats["throttled"] += 1
+
+    def update_from_headers(self, headers):
+        """응답 헤더로 버킷 상태 갱신"""
+        if not headers:
+            return
+        headers = {k.lower(): v for k, v in headers.items()}
+        retry_after = parse_retry_after(headers)
+
+        with self._lock:
+            now = time.monotonic()
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+            for suffix in ["", "-requests", "-tokens"]:
+                remaining = _to_float(headers.get(f"x-ratelimit-remaining{suffix}"))
+                reset = _parse_reset(headers.get(f"x-ratelimit-reset{suffix}"))
+                if remaining is None or reset is None:
+                    continue
+
+                # 토큰 한도는 요청 단위가 아니므로 소진된 경우에만 reset까지 대기
+                if suffix == "-tokens":
+                    if remaining <= 0:
+                        self._blocked_until = max(self._blocked_until, now + reset)
+                    continue
+
+                if remaining <= self.safety_margin:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+                elif reset > 0:
+                    # 남은 요청을 reset 시점까지 균등하게 분배
+                    new_rate = (remaining - self.safety_margin) * self.headroom / reset
+                    if self.max_rate:
+                        new_rate = min(new_rate, self.max_rate)
+                    if self.rate is None:
+                        self._tokens = 1.0
+                        self._updated = now
+                    self.rate = new_rate
+                    self._capacity = max(1.0, min(remaining - self.safety_margin, new_rate))
+                    self._tokens = min(self._tokens, self._capacity)
+
+def parse_retry_after(headers):
+    """Retry-After / retry-after-ms 헤더를 초 단위로 변환 (없으면 None)"""
+    if not headers:
+        return None
+    headers = {k.lower(): v for k, v in headers.items()}
+    retry_after_ms = _to_float(headers.get("retry-after-ms"))
+    if retry_after_ms is not None:
+        return max(0.0, retry_after_ms / 1000)
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    seconds = _to_float(value)
+    if seconds is not None:
+        return max(0.0, seconds)
+    # HTTP-date 형식
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _parse_reset(value):
+    """
+    x-ratelimit-reset 값을 "지금부터 남은 초"로 변환
+
+    지원 형식:
+    - 기간 문자열 (OpenAI 스타일): "1s", "6m0s", "20ms"
+    - epoch 타임스탬프 (OpenRouter 스타일): 밀리초 또는 초
+    - 남은 초 (숫자)
+    """
+    if value is None:
+        return None
+    number = _to_float(value)
+    if number is None:
+        parts = re.findall(r"(\d+(?:\.\d+)?)(ms|h|m|s)", str(value).strip())
+        if not parts:
+            return None
+        units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        return sum(float(n) * units[u] for n, u in parts)
+    if number > 1e12:
+        return max(0.0, number / 1000 - time.time())
+    if number > 1e9:
+        return max(0.0, number - time.time())
+    return max(0.0, number)
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+# ==========================================
+# [프로세스 전역 레지스트리]
+# ==========================================
+_LIMITERS = {}
+_LIMITERS_LOCK = threading.Lock()
+
+def get_rate_limiter(key, rate=None):
+    """
+    key(예: base_url)별 공유 RateLimiter 반환
+
+    같은 provider로 가는 모든 ModelHandler가 하나의 버킷을 공유합니다.
+    rate가 주어지면 기존 리미터의 상한도 갱신합니다.
+    """
+    with _LIMITERS_LOCK:
+        limiter = _LIMITERS.get(key)
+        if limiter is None:
+            limiter = _LIMITERS[key] = RateLimiter(rate=rate)
+        elif rate is not None:
+            limiter.configure(rate)
+        return limiter
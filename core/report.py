@@ -0,0 +1,100 @@
+import csv
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# 텍스트 컬럼 (그 외 컬럼은 CSV에서 읽을 때 숫자로 복원)
+TEXT_COLUMNS = {"Category", "ID", "Result", "Question", "Verification", "Thinking", "Model_Calls", "Ground_Truth", "Steps"}
+
+def result_columns(results):
+    """결과 딕셔너리들의 컬럼 목록 (첫 등장 순서 유지)"""
+    columns = {}
+    for result in results:
+        for key in result:
+            columns.setdefault(key, None)
+    return list(columns)
+
+def write_results_table(results, path, fmt="auto"):
+    """
+    케이스 결과를 컬럼 기반 파일로 저장 (리포트 생성의 입력)
+
+    Args:
+        results: 결과 딕셔너리 리스트
+        path: 확장자를 제외한 저장 경로 (.parquet 또는 .csv가 붙음)
+        fmt: "parquet", "csv", "auto" (auto = pyarrow가 설치되어 있으면 parquet, 없으면 csv)
+
+    Returns:
+        실제 저장된 파일 경로
+    """
+    if fmt == "auto":
+        try:
+            import pyarrow  # noqa: F401
+            fmt = "parquet"
+        except ImportError:
+            fmt = "csv"
+    path = Path(path).with_suffix(f".{fmt}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    columns = result_columns(results)
+
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({col: [result.get(col) for result in results] for col in columns})
+        pq.write_table(table, str(path))
+    elif fmt == "csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        raise ValueError(f"지원하지 않는 결과 파일 형식: {fmt} (가능: auto, parquet, csv)")
+    return str(path)
+
+def read_results_table(path):
+    """write_results_table()로 저장한 파일을 결과 딕셔너리 리스트로 로드"""
+    path = Path(path)
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        return pq.read_table(str(path)).to_pylist()
+
+    results = []
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            for key, value in row.items():
+                if key not in TEXT_COLUMNS:
+                    row[key] = _to_number(value)
+            results.append(row)
+    return results
+
+def _to_number(value):
+    if value == "":
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    return int(number) if number.is_integer() and "." not in value else number
+
+# ==========================================
+# [백그라운드 리포트 생성]
+# ==========================================
+# 리포트(Excel) 생성은 단일 백그라운드 워커에서 순서대로 실행 (벤치마크 실행 경로와 분리)
+# 프로세스 종료 시 concurrent.futures가 대기 중인 작업이 끝날 때까지 기다림
+_REPORT_POOL = None
+_REPORT_POOL_LOCK = threading.Lock()
+
+def submit_report(fn, *args, **kwargs):
+    """리포트 생성 함수를 백그라운드 워커에 제출하고 Future 반환"""
+    global _REPORT_POOL
+    with _REPORT_POOL_LOCK:
+        if _REPORT_POOL is None:
+            _REPORT_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report")
+        future = _REPORT_POOL.submit(fn, *args, **kwargs)
+    future.add_done_callback(_report_done)
+    return future
+
+def _report_done(future):
+    """백그라운드 리포트 생성 실패는 실행을 중단하지 않고 경고만 출력"""
+    error = future.exception()
+    if error is not None:
+        print(f"⚠️ 리포트 생성 실패: {error}")
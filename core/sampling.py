@@ -0,0 +1,66 @@
+import math
+import random
+
+def wilson_interval(passed, total, z=1.96):
+    """
+    정확도(pass 비율)의 Wilson score 신뢰구간 (기본 95%)
+
+    표본이 적거나 비율이 0/1에 가까울 때도 [0, 1]을 벗어나지 않고 폭이 0이 되지 않습니다.
+
+    Returns:
+        (low, high) - 0~1 비율, total이 0이면 (0.0, 1.0)
+    """
+    if total <= 0:
+        return 0.0, 1.0
+    p = passed / total
+    denom = 1 + z * z / total
+    center = (p + z * z / (2 * total)) / denom
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denom
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+def required_samples(p, width, z=1.96):
+    """정확도 p에서 신뢰구간 폭을 width(0~1 비율) 이하로 만드는 데 필요한 대략의 표본 수 (정규 근사)"""
+    p = min(max(p, 0.05), 0.95)
+    return math.ceil(z * z * p * (1 - p) / (width / 2) ** 2)
+
+def case_stratum(question):
+    """
+    케이스의 하위 그룹 (층화 샘플링 단위)
+
+    - live / memory: id의 가운데 인덱스 (live는 FuncDoc 번호, memory는 시나리오)
+    - 멀티턴/에이전트: involved_classes 조합
+    - 그 외: 첫 함수 이름의 네임스페이스 (예: "math.factorial" -> "math")
+
+    memory 질문은 모두 involved_classes가 ["MemoryAPI"]이므로 id 기준을 먼저 확인합니다.
+    """
+    parts = str(question.get("id", "")).split("-")
+    if len(parts) == 3:
+        return parts[1]
+    if question.get("involved_classes"):
+        return "+".join(sorted(question["involved_classes"]))
+    functions = question.get("function") or []
+    if functions and isinstance(functions[0], dict) and "." in functions[0].get("name", ""):
+        return functions[0]["name"].split(".")[0]
+    return ""
+
+def stratified_order(cases, seed=0, stratum=case_stratum):
+    """
+    (q, a) 케이스를 하위 그룹별로 고르게 섞은 무작위 순서로 정렬
+
+    각 하위 그룹을 섞은 뒤 그룹 안의 k번째 케이스를 (k + u) / 그룹 크기 위치에 배치하므로
+    (u는 그룹별 무작위 오프셋) 앞에서부터 몇 개를 잘라도 그룹 비율이 전체 비율에 가깝게 유지됩니다.
+    seed가 같으면 항상 같은 순서입니다 (--resume으로 이어서 실행 가능).
+    """
+    rng = random.Random(seed)
+    groups = {}
+    for case in cases:
+        groups.setdefault(stratum(case[0]), []).append(case)
+
+    keyed = []
+    for name in sorted(groups):
+        members = groups[name]
+        rng.shuffle(members)
+        offset = rng.random()
+        keyed.extend(((k + offset) / len(members), rng.random(), case) for k, case in enumerate(members))
+    keyed.sort(key=lambda item: item[:2])
+    return [case for _, _, case in keyed]
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+
+class ModelAborted(Exception):
+    """연속 실패로 모델 실행을 조기 중단할 때 발생"""
+    pass
+
+class CaseGate:
+    """
+    케이스 실행 게이트 (모델 1개당 1개)
+
+    - slots: 여러 모델이 공유하는 전역 동시 실행 상한 (threading.BoundedSemaphore)
+    - max_consecutive_errors: 케이스가 연속으로 이만큼 에러(예: 모든 provider 404)를 내면
+      남은 케이스를 실행하지 않고 모델을 조기 중단 (None이면 비활성화)
+    """
+    def __init__(self, slots=None, max_consecutive_errors=None):
+        self.slots = slots
+        self.max_consecutive_errors = max_consecutive_errors
+        self.consecutive_errors = 0
+        self.abort_reason = None
+        self._lock = threading.Lock()
+
+    @property
+    def aborted(self):
+        return self.abort_reason is not None
+
+    def acquire(self):
+        """전역 슬롯 1개 확보 (블로킹)"""
+        if self.slots is not None:
+            self.slots.acquire()
+
+    async def aacquire(self, poll_interval=0.05):
+        """acquire()의 비동기 버전 (이벤트 루프를 막지 않도록 폴링)"""
+        if self.slots is None:
+            return
+        while not self.slots.acquire(blocking=False):
+            await asyncio.sleep(poll_interval)
+
+    def release(self):
+        if self.slots is not None:
+            self.slots.release()
+
+    def record(self, error=None):
+        """케이스 종료 기록 (error가 있으면 연속 실패 카운트 증가, 성공하면 초기화)"""
+        with self._lock:
+            if error is None:
+                self.consecutive_errors = 0
+                return
+            self.consecutive_errors += 1
+            if (self.max_consecutive_errors and not self.aborted
+                    and self.consecutive_errors >= self.max_consecutive_errors):
+                self.abort_reason = f"연속 {self.consecutive_errors}건 실패 (마지막 에러: {str(error)[:100]})"
+
+    def check(self):
+        """조기 중단 상태이면 ModelAborted 발생"""
+        if self.aborted:
+            raise ModelAborted(self.abort_reason)
+
+def make_global_slots(limit):
+    """여러 모델이 공유할 전역 동시 실행 세마포어 (limit이 없으면 None = 상한 없음)"""
+    return threading.BoundedSemaphore(limit) if limit else None
+
+def parse_budget(spec):
+    """
+    모델별 예산 문자열 파싱: "MODEL=CONCURRENCY[:MAX_RPS]"
+
+    예: "qwen/qwen3-32b=8:5" -> ("qwen/qwen3-32b", {"concurrency": 8, "max_rps": 5.0})
+    """
+    model, sep, budget = spec.rpartition("=")
+    if not sep or not model:
+        raise ValueError(f"잘못된 예산 형식: {spec} (예: qwen/qwen3-32b=8:5)")
+    concurrency, _, max_rps = budget.partition(":")
+    parsed = {"concurrency": int(concurrency)}
+    if max_rps:
+        parsed["max_rps"] = float(max_rps)
+    return model, parsed
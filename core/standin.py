@@ -0,0 +1,553 @@
+import io
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from collections import Counter, deque
+from email.parser import BytesParser
+from email.policy import default as email_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from core.cache import InferenceCache
+
+# JSON Schema 타입별 기본 인자 값 (합성 tool call용)
+_PLACEHOLDERS = {"string": "", "integer": 0, "number": 0.0, "boolean": False, "array": [], "object": {}}
+
+# 도구 없이 응답할 때의 합성 텍스트
+_TEXT_REPLY = "I cannot help with that using the available tools."
+
+def _placeholder(schema):
+    """JSON Schema에 맞는 결정적인 인자 값 (enum 첫 값 > default > 타입별 기본값, object는 필수 필드 재귀)"""
+    if not isinstance(schema, dict):
+        return ""
+    if schema.get("enum"):
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    if schema.get("type") == "object" and schema.get("properties"):
+        return {name: _placeholder(schema["properties"].get(name)) for name in schema.get("required") or []}
+    return _PLACEHOLDERS.get(schema.get("type"), "")
+
+def _estimate_tokens(value):
+    """토큰 수 근사 (JSON 직렬화 길이 4바이트 = 1토큰)"""
+    return len(value if isinstance(value, str) else json.dumps(value)) // 4
+
+def synthesize_completion(body):
+    """
+    chat.completions 요청 본문으로 결정적인 ChatCompletion 응답(딕셔너리) 합성
+
+    도구가 있으면 첫 번째 도구(tool_choice로 함수를 지정하면 그 도구)를 필수 인자(스키마 기반 기본값)로
+    호출하고, 없으면 텍스트로 응답합니다. 토큰 수는 요청/응답 JSON 길이로 근사합니다 (4바이트 = 1토큰).
+    """
+    tools = body.get("tools") or []
+    tool_choice = body.get("tool_choice")
+    if isinstance(tool_choice, dict):
+        chosen = (tool_choice.get("function") or {}).get("name")
+        tools = [tool for tool in tools if tool["function"]["name"] == chosen] or tools
+    message = {"role": "assistant", "content": None}
+    if tools and tool_choice != "none":
+        function = tools[0]["function"]
+        arguments = _placeholder({"type": "object", **(function.get("parameters") or {})})
+        message["tool_calls"] = [{
+            "id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+            "function": {"name": function["name"], "arguments": json.dumps(arguments)}
+        }]
+        finish_reason = "tool_calls"
+    else:
+        message["content"] = _TEXT_REPLY
+        finish_reason = "stop"
+
+    prompt_tokens = _estimate_tokens(body.get("messages", [])) + _estimate_tokens(body.get("tools") or [])
+    completion_tokens = len(json.dumps(message)) // 4
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:24]}", "object": "chat.completion", "created": int(time.time()),
+        "model": body.get("model", "stand-in"),
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens}
+    }
+
+def synthesize_text_completion(body):
+    """
+    completions(프롬프트 기반) 요청 본문으로 Completion 응답(딕셔너리) 합성
+
+    프롬프트 형식이 모델마다 달라 함수 문서를 해석할 수 없으므로 고정 텍스트로 응답합니다.
+    """
+    prompt = body.get("prompt") or ""
+    prompt_tokens = _estimate_tokens(prompt if isinstance(prompt, str) else json.dumps(prompt))
+    completion_tokens = _estimate_tokens(_TEXT_REPLY)
+    return {
+        "id": f"cmpl-{uuid.uuid4().hex[:24]}", "object": "text_completion", "created": int(time.time()),
+        "model": body.get("model", "stand-in"),
+        "choices": [{"index": 0, "text": _TEXT_REPLY, "finish_reason": "stop", "logprobs": None}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens}
+    }
+
+def stream_chunks(response, include_usage=False, piece=16):
+    """
+    응답 딕셔너리 → 스트리밍 청크 딕셔너리 목록 [(청크, 토큰 수)]
+
+    content와 tool call arguments는 piece 글자씩 나눠 보내며 (토큰 수는 지연 계산용 근사값),
+    include_usage면 마지막에 usage만 담은 청크를 추가합니다 (stream_options.include_usage).
+    """
+    chat = response.get("object") == "chat.completion"
+    base = {"id": response["id"], "object": "chat.completion.chunk" if chat else "text_completion",
+            "created": response["created"], "model": response["model"]}
+    choice = response["choices"][0]
+
+    def chunk(delta=None, finish_reason=None, text=None):
+        entry = {"index": 0, "finish_reason": finish_reason}
+        if chat:
+            entry["delta"] = delta or {}
+        else:
+            entry.update(text=text or "", logprobs=None)
+        return {**base, "choices": [entry]}
+
+    def pieces(text):
+        return [text[i:i + piece] for i in range(0, len(text), piece)]
+
+    chunks = []
+    if chat:
+        message = choice["message"]
+        chunks.append((chunk({"role": "assistant", "content": ""}), 0))
+        chunks.extend((chunk({"content": part}), max(_estimate_tokens(part), 1)) for part in pieces(message.get("content") or ""))
+        for index, call in enumerate(message.get("tool_calls") or []):
+            function = call["function"]
+            chunks.append((chunk({"tool_calls": [{"index": index, "id": call["id"], "type": "function",
+                                                  "function": {"name": function["name"], "arguments": ""}}]}), 1))
+            chunks.extend((chunk({"tool_calls": [{"index": index, "function": {"arguments": part}}]}),
+                           max(_estimate_tokens(part), 1)) for part in pieces(function.get("arguments") or ""))
+        chunks.append((chunk(finish_reason=choice.get("finish_reason") or "stop"), 0))
+    else:
+        chunks.extend((chunk(text=part), max(_estimate_tokens(part), 1)) for part in pieces(choice.get("text") or ""))
+        chunks.append((chunk(finish_reason=choice.get("finish_reason") or "stop"), 0))
+    if include_usage:
+        chunks.append(({**base, "choices": [], "usage": response.get("usage")}, 0))
+    return chunks
+
+class ReplayResponder:
+    """
+    기록된 응답 재생: inference 캐시(SQLite, --cache write로 실제 실행 시 기록)에서 요청 키로 응답 조회
+
+    캐시 키는 핸들러와 같은 필드(model, messages, tools, temperature, tool_choice, max_tokens)로 만들므로
+    같은 설정으로 기록한 요청은 그대로 재생되고, 없는 요청은 fallback(기본값: 합성 응답)으로 처리합니다.
+    """
+    def __init__(self, path, fallback=synthesize_completion):
+        self.cache = InferenceCache(path=path, mode="read")
+        self.fallback = fallback
+
+    def __call__(self, body):
+        response = self.cache.get(InferenceCache.make_key(body))
+        if response is None:
+            return self.fallback(body)
+        # 재생 응답마다 고유 id (클라이언트 측 중복 제거와 무관하도록)
+        return {**response, "id": f"chatcmpl-{uuid.uuid4().hex[:24]}", "created": int(time.time())}
+
+    @property
+    def stats(self):
+        return {"replayed": self.cache.stats["hits"], "synthesized": self.cache.stats["misses"]}
+
+def parse_latency(spec):
+    """
+    지연 분포 문자열 → (rng → 초) 함수 (값은 모두 ms)
+
+    - "0" / "fixed:200": 고정
+    - "uniform:100:300": 균등 분포
+    - "normal:200:50": 정규 분포 (평균, 표준편차, 0 미만은 0)
+    - "lognormal:200:0.5": 로그정규 분포 (중앙값, sigma) - 긴 꼬리가 있는 실제 API 지연에 가까움
+    """
+    kind, _, rest = str(spec or "0").partition(":")
+    try:
+        if not rest:
+            ms = float(kind)
+            return lambda rng: ms / 1000
+        values = [float(value) for value in rest.split(":")]
+        if kind == "fixed" and len(values) == 1:
+            return lambda rng: values[0] / 1000
+        if kind == "uniform" and len(values) == 2:
+            return lambda rng: rng.uniform(*values) / 1000
+        if kind == "normal" and len(values) == 2:
+            return lambda rng: max(0.0, rng.gauss(*values)) / 1000
+        if kind == "lognormal" and len(values) == 2:
+            return lambda rng: values[0] * rng.lognormvariate(0, values[1]) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"지연 분포 형식 오류: {spec} (예: 200, uniform:100:300, normal:200:50, lognormal:200:0.5)")
+
+class _WindowLimit:
+    """1분 슬라이딩 윈도우 한도 (요청 수 또는 토큰 수), 서버 lock 보유 상태에서 사용"""
+    WINDOW = 60.0
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.events = deque()
+
+    def _expire(self, now):
+        while self.events and self.events[0][0] <= now - self.WINDOW:
+            self.used -= self.events.popleft()[1]
+
+    def wait_time(self, amount, now):
+        """amount를 추가할 수 있을 때까지 기다려야 하는 초 (0이면 바로 가능)"""
+        self._expire(now)
+        excess = self.used + amount - self.limit
+        if excess <= 0:
+            return 0.0
+        if amount > self.limit:
+            return self.WINDOW
+        for when, size in self.events:
+            excess -= size
+            if excess <= 0:
+                return when + self.WINDOW - now
+        return self.WINDOW
+
+    def add(self, amount, now):
+        self.events.append((now, amount))
+        self.used += amount
+
+    def headers(self, suffix, now):
+        """OpenAI 스타일 x-ratelimit-* 헤더"""
+        self._expire(now)
+        reset = (self.events[0][0] + self.WINDOW - now) if self.events else 0.0
+        return {f"x-ratelimit-limit-{suffix}": str(self.limit),
+                f"x-ratelimit-remaining-{suffix}": str(max(self.limit - self.used, 0)),
+                f"x-ratelimit-reset-{suffix}": f"{max(reset, 0.0):.3f}s"}
+
+class StandInServer:
+    """
+    네트워크 없이 전체 흐름과 처리량을 검증하기 위한 로컬 OpenAI 호환 서버 (127.0.0.1, 백그라운드 스레드)
+
+    - /v1/chat/completions (tools/tool_calls, stream 포함): responder(body) → ChatCompletion 딕셔너리
+      (기본값: synthesize_completion, 기록된 응답 재생은 ReplayResponder)
+    - /v1/completions: completion_responder(body) → Completion 딕셔너리
+    - /v1/models, Batch API(/v1/files, /v1/batches): 배치는 batch_delay초 후 완료
+    - latency: 첫 토큰까지 지연 분포 (parse_latency 형식), token_latency_ms: 출력 토큰당 생성 시간
+    - rate_limit_rate / error_rate: 요청 중 429 / 5xx로 응답할 비율 (seed로 재현 가능)
+    - rpm / tpm: 1분당 요청 수 / 토큰 수 한도 (초과 시 Retry-After와 함께 429, 응답마다 x-ratelimit-* 헤더)
+
+    사용 예:
+        with StandInServer(latency="lognormal:300:0.5", tpm=200000) as server:
+            client = OpenAI(api_key="local", base_url=server.base_url)
+    """
+    def __init__(self, host="127.0.0.1", port=0, responder=None, batch_delay=0.5,
+                 completion_responder=None, latency="0", token_latency_ms=0.0,
+                 rate_limit_rate=0.0, error_rate=0.0, retry_after=1.0, rpm=None, tpm=None, seed=None):
+        self.responder = responder or synthesize_completion
+        self.completion_responder = completion_responder or synthesize_text_completion
+        self.batch_delay = batch_delay
+        self.latency = parse_latency(latency)
+        self.token_latency = token_latency_ms / 1000
+        self.rate_limit_rate = rate_limit_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.limits = {suffix: _WindowLimit(limit) for suffix, limit in (("requests", rpm), ("tokens", tpm)) if limit}
+        self.stats = Counter()
+        self.files = {}
+        self.batches = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+            self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """현재 스레드에서 실행 (python -m core.standin)"""
+        self._httpd.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- Inference ----------
+    def respond(self, endpoint, body):
+        """
+        추론 요청 1건 처리 (지연은 호출자가 적용)
+
+        Returns:
+            (상태 코드, 응답 딕셔너리, 추가 헤더, 첫 토큰까지 지연 초)
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+            first_token = self.latency(self._rng)
+        if roll < self.rate_limit_rate:
+            return self._rejected(429, "Rate limit reached (injected)", "rate_limit_exceeded", self.retry_after)
+        if roll < self.rate_limit_rate + self.error_rate:
+            status = (500, 502, 503)[int(roll * 1000) % 3]
+            return self._rejected(status, "The server had an error processing your request (injected)", "server_error")
+
+        try:
+            response = (self.responder if endpoint == "chat" else self.completion_responder)(body)
+        except Exception as e:
+            return self._rejected(500, f"responder error: {e}", "server_error")
+        # 한도는 요청 토큰 + 최대 출력 토큰으로 미리 차감 (provider와 같은 방식)
+        usage = response.get("usage") or {}
+        tokens = (usage.get("prompt_tokens") or 0) + (body.get("max_tokens") or usage.get("completion_tokens") or 0)
+        with self._lock:
+            now = time.monotonic()
+            amounts = {"requests": 1, "tokens": tokens}
+            wait = max([limit.wait_time(amounts[suffix], now) for suffix, limit in self.limits.items()], default=0.0)
+            if wait > 0:
+                self.stats["limited"] += 1
+            else:
+                headers = {}
+                for suffix, limit in self.limits.items():
+                    limit.add(amounts[suffix], now)
+                    headers.update(limit.headers(suffix, now))
+                self.stats["ok"] += 1
+                self.stats["prompt_tokens"] += usage.get("prompt_tokens") or 0
+                self.stats["completion_tokens"] += usage.get("completion_tokens") or 0
+        if wait > 0:
+            return self._rejected(429, f"Rate limit reached: {'/'.join(self.limits)} per minute", "rate_limit_exceeded", wait)
+        return 200, response, headers, first_token
+
+    def _rejected(self, status, message, code, retry_after=None):
+        with self._lock:
+            self.stats[str(status)] += 1
+        headers = {"retry-after-ms": str(int(retry_after * 1000))} if retry_after is not None else {}
+        error_type = "rate_limit_error" if status == 429 else "server_error"
+        return status, {"error": {"message": message, "type": error_type, "code": code}}, headers, 0.0
+
+    def summary(self):
+        stats = self.stats
+        replay = getattr(self.responder, "stats", None)
+        text = (f"요청 {stats['requests']}개: 성공 {stats['ok']} / 429 {stats['429']} (한도 초과 {stats['limited']}) / "
+                f"5xx {stats['500'] + stats['502'] + stats['503']}, "
+                f"토큰 prompt {stats['prompt_tokens']:,} / completion {stats['completion_tokens']:,}")
+        if replay:
+            text += f", 재생 {replay['replayed']} / 합성 {replay['synthesized']}"
+        return text
+
+    # ---------- Files ----------
+    def add_file(self, content, filename="file.jsonl", purpose="batch"):
+        file_id = f"file-{uuid.uuid4().hex[:24]}"
+        record = {"id": file_id, "object": "file", "bytes": len(content), "created_at": int(time.time()),
+                  "filename": filename, "purpose": purpose, "status": "processed"}
+        with self._lock:
+            self.files[file_id] = (record, content)
+        return record
+
+    # ---------- Batches ----------
+    def create_batch(self, request):
+        batch_id = f"batch_{uuid.uuid4().hex[:24]}"
+        batch = {
+            "id": batch_id, "object": "batch", "endpoint": request.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": request["input_file_id"], "completion_window": request.get("completion_window", "24h"),
+            "status": "validating", "created_at": int(time.time()), "output_file_id": None, "error_file_id": None,
+            "request_counts": {"total": 0, "completed": 0, "failed": 0}, "metadata": request.get("metadata")
+        }
+        with self._lock:
+            self.batches[batch_id] = batch
+        threading.Thread(target=self._process_batch, args=(batch_id,), daemon=True).start()
+        return batch
+
+    def _process_batch(self, batch_id):
+        """입력 파일의 각 요청을 responder로 처리하여 출력/에러 파일 생성"""
+        batch = self.batches[batch_id]
+        _, content = self.files[batch["input_file_id"]]
+        lines = [json.loads(line) for line in content.decode("utf-8").splitlines() if line.strip()]
+        with self._lock:
+            batch.update(status="in_progress", in_progress_at=int(time.time()))
+            batch["request_counts"]["total"] = len(lines)
+        time.sleep(self.batch_delay)
+
+        outputs, errors = io.StringIO(), io.StringIO()
+        for line in lines:
+            try:
+                body = self.responder(line["body"])
+                outputs.write(json.dumps({
+                    "id": f"batch_req_{uuid.uuid4().hex[:24]}", "custom_id": line["custom_id"],
+                    "response": {"status_code": 200, "request_id": uuid.uuid4().hex, "body": body}, "error": None
+                }) + "\n")
+                key = "completed"
+            except Exception as e:
+                errors.write(json.dumps({
+                    "id": f"batch_req_{uuid.uuid4().hex[:24]}", "custom_id": line.get("custom_id"), "response": None,
+                    "error": {"code": "server_error", "message": str(e)}
+                }) + "\n")
+                key = "failed"
+            with self._lock:
+                batch["request_counts"][key] += 1
+
+        output_file = self.add_file(outputs.getvalue().encode("utf-8"), f"{batch_id}_output.jsonl", "batch_output")
+        error_file = self.add_file(errors.getvalue().encode("utf-8"), f"{batch_id}_error.jsonl", "batch_output") \
+            if errors.tell() else None
+        with self._lock:
+            batch.update(status="completed", completed_at=int(time.time()), output_file_id=output_file["id"],
+                         error_file_id=error_file["id"] if error_file else None)
+
+def _make_handler(server):
+    class Handler(BaseHTTPRequestHandler):
+        # keep-alive 지원 (모든 응답에 Content-Length 포함) - 클라이언트 연결 풀 재사용 확인 가능
+        protocol_version = "HTTP/1.1"
+        # 헤더/본문을 따로 쓰므로 Nagle 알고리즘을 끄지 않으면 keep-alive 요청마다 ~40ms 지연 (delayed ACK)
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, payload, status=200, headers=None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _inference(self, endpoint):
+            """추론 요청: 첫 토큰 지연 + 출력 토큰당 생성 시간을 적용하여 JSON 또는 SSE 스트림으로 응답"""
+            body = json.loads(self._body() or b"{}")
+            status, response, headers, first_token = server.respond(endpoint, body)
+            if status != 200 or not body.get("stream"):
+                completion_tokens = (response.get("usage") or {}).get("completion_tokens") or 0
+                time.sleep(first_token + (completion_tokens * server.token_latency if status == 200 else 0))
+                self._send_json(response, status, headers)
+                return
+
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            time.sleep(first_token)
+            try:
+                for chunk, tokens in stream_chunks(response, include_usage):
+                    time.sleep(tokens * server.token_latency)
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                # 마지막 이벤트와 종료 청크를 한 번에 전송 (클라이언트가 [DONE]에서 읽기를 멈춰도 연결 재사용 가능)
+                self._write_chunk(b"data: [DONE]\n\n", last=True)
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 스트림을 먼저 끊음 (첫 tool call 완성 후 조기 종료 등)
+                self.close_connection = True
+
+        def _write_chunk(self, data, last=False):
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n" + (b"0\r\n\r\n" if last else b""))
+            self.wfile.flush()
+
+        def _not_found(self):
+            self._send_json({"error": {"message": f"Unknown path: {self.path}", "type": "invalid_request_error"}}, 404)
+
+        def _body(self):
+            return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+        def do_POST(self):
+            path = self.path.split("?")[0].rstrip("/")
+            if path == "/v1/chat/completions":
+                self._inference("chat")
+            elif path == "/v1/completions":
+                self._inference("completion")
+            elif path == "/v1/files":
+                fields = _parse_multipart(self.headers.get("Content-Type", ""), self._body())
+                filename, content = fields.get("file", ("file.jsonl", b""))
+                self._send_json(server.add_file(content, filename, fields.get("purpose", (None, b"batch"))[1].decode()))
+            elif path == "/v1/batches":
+                request = json.loads(self._body() or b"{}")
+                if request.get("input_file_id") not in server.files:
+                    self._send_json({"error": {"message": "input file not found", "type": "invalid_request_error"}}, 400)
+                    return
+                self._send_json(server.create_batch(request))
+            else:
+                self._not_found()
+
+        def do_GET(self):
+            parts = self.path.split("?")[0].strip("/").split("/")
+            if parts == ["v1", "models"]:
+                self._send_json({"object": "list", "data": [{"id": "stand-in", "object": "model", "owned_by": "local"}]})
+            elif parts[:2] == ["v1", "batches"] and len(parts) == 3 and parts[2] in server.batches:
+                with server._lock:
+                    self._send_json(json.loads(json.dumps(server.batches[parts[2]])))
+            elif parts[:2] == ["v1", "files"] and len(parts) == 4 and parts[3] == "content" and parts[2] in server.files:
+                _, content = server.files[parts[2]]
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+            elif parts[:2] == ["v1", "files"] and len(parts) == 3 and parts[2] in server.files:
+                self._send_json(server.files[parts[2]][0])
+            else:
+                self._not_found()
+
+    return Handler
+
+def _parse_multipart(content_type, body):
+    """multipart/form-data 본문 → {필드명: (파일명, 바이트)}"""
+    message = BytesParser(policy=email_policy).parsebytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body
+    )
+    fields = {}
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        fields[name] = (part.get_filename(), part.get_payload(decode=True) or b"")
+    return fields
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="로컬 OpenAI 호환 stand-in 서버 (네트워크 없이 처리량/재시도 동작 측정)",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+예시:
+  python -m core.standin --port 8000 --latency lognormal:300:0.5 --token-latency-ms 5
+  python -m core.standin --port 8000 --replay .cache/inference_cache.sqlite --rate-limit-rate 0.02 --tpm 200000
+
+  python main.py --quick --base-url http://127.0.0.1:8000/v1 --concurrency 16
+  OPENAI_BASE_URL=http://127.0.0.1:8000/v1 OPENAI_API_KEY=local bfcl generate --model gpt-4o-2024-11-20-FC --num-threads 16
+        """
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", default="0",
+                        help="첫 토큰까지 지연 분포 (ms): 200, uniform:100:300, normal:200:50, lognormal:200:0.5")
+    parser.add_argument("--token-latency-ms", type=float, default=0.0, help="출력 토큰당 생성 시간 (ms)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="429로 응답할 요청 비율 (0~1)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="5xx로 응답할 요청 비율 (0~1)")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="주입된 429의 Retry-After (초)")
+    parser.add_argument("--rpm", type=int, help="1분당 요청 수 한도")
+    parser.add_argument("--tpm", type=int, help="1분당 토큰 수 한도 (요청 토큰 + max_tokens)")
+    parser.add_argument("--replay", help="기록된 응답을 재생할 inference 캐시 파일 (없는 요청은 합성)")
+    parser.add_argument("--seed", type=int, help="지연/에러 주입 난수 seed")
+    args = parser.parse_args()
+
+    server = StandInServer(
+        host=args.host, port=args.port, responder=ReplayResponder(args.replay) if args.replay else None,
+        latency=args.latency, token_latency_ms=args.token_latency_ms, rate_limit_rate=args.rate_limit_rate,
+        error_rate=args.error_rate, retry_after=args.retry_after, rpm=args.rpm, tpm=args.tpm, seed=args.seed
+    )
+    print(f"🧪 stand-in 서버: {server.base_url} ({'재생: ' + args.replay if args.replay else '합성 응답'}, Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"\n📊 {server.summary()}")
+
+if __name__ == "__main__":
+    main()
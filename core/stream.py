@@ -0,0 +1,129 @@
+import json
+import time
+from openai import APIError
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+# 스트리밍 요청 추가 파라미터 (마지막 청크에 usage 포함)
+STREAM_PARAMS = {"stream": True, "stream_options": {"include_usage": True}}
+
+# delta에 실려 오는 사고 과정 필드 (provider별 이름 차이)
+REASONING_FIELDS = ("reasoning", "reasoning_content", "thought", "thinking_process")
+
+def sse_chunk(line, response):
+    """
+    SSE 응답 한 줄 → ChatCompletionChunk (data 줄이 아니거나 [DONE]이면 None)
+
+    주석 줄(": OPENROUTER PROCESSING" 등)과 빈 줄은 건너뛰고, 스트림 중간의 error 이벤트는 APIError로 변환합니다.
+    """
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if not data or data.startswith("[DONE]"):
+        return None
+    payload = json.loads(data)
+    if isinstance(payload, dict) and payload.get("error"):
+        error = payload["error"]
+        message = error.get("message") if isinstance(error, dict) else None
+        raise APIError(message or "An error occurred during streaming", request=response.request, body=error)
+    return ChatCompletionChunk.model_validate(payload)
+
+class StreamAssembler:
+    """
+    스트리밍 chat.completions 청크를 하나의 ChatCompletion으로 조립
+
+    content/사고 과정 텍스트와 tool_calls delta(index별 id/name/arguments 조각)를 누적하고,
+    첫 토큰 도착 시간(TTFT)과 첫 tool call의 arguments JSON이 완성된 시간(time-to-tool-call)을 기록합니다.
+    """
+    def __init__(self, request_start):
+        self.request_start = request_start
+        self.ttft = None
+        self.ttc = None
+        # 첫 tool call 완성 직후 스트림을 끊었는지 (usage가 없는 응답)
+        self.cut = False
+        self.meta = {}
+        self.content = []
+        self.reasoning = {}
+        self.tool_calls = {}
+        self.finish_reason = None
+        self.usage = None
+
+    def add(self, chunk):
+        """청크 1개 누적"""
+        if not self.meta:
+            self.meta = {"id": chunk.id, "created": chunk.created, "model": chunk.model}
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage.model_dump()
+
+        for choice in chunk.choices or []:
+            if choice.index != 0:
+                continue
+            delta = choice.delta
+            if delta is not None:
+                self._add_delta(delta)
+            if choice.finish_reason:
+                self.finish_reason = choice.finish_reason
+
+    def _add_delta(self, delta):
+        extra = getattr(delta, "model_extra", None) or {}
+        reasoning = {field: extra[field] for field in REASONING_FIELDS if isinstance(extra.get(field), str) and extra[field]}
+
+        if self.ttft is None and (delta.content or delta.tool_calls or reasoning):
+            self.ttft = round((time.time() - self.request_start) * 1000, 2)
+
+        if delta.content:
+            self.content.append(delta.content)
+        for field, text in reasoning.items():
+            self.reasoning.setdefault(field, []).append(text)
+
+        for tc in delta.tool_calls or []:
+            call = self.tool_calls.setdefault(tc.index, {
+                "id": None, "type": "function", "function": {"name": "", "arguments": ""}
+            })
+            if tc.id:
+                call["id"] = tc.id
+            if tc.function is not None:
+                if tc.function.name:
+                    call["function"]["name"] += tc.function.name
+                if tc.function.arguments:
+                    call["function"]["arguments"] += tc.function.arguments
+
+        if self.ttc is None and self.tool_calls and self._first_call_complete():
+            self.ttc = round((time.time() - self.request_start) * 1000, 2)
+
+    @property
+    def tool_call_done(self):
+        """첫 tool call의 이름과 arguments(JSON 객체)가 모두 도착했는지"""
+        return self.ttc is not None
+
+    def _first_call_complete(self):
+        function = self.tool_calls[min(self.tool_calls)]["function"]
+        arguments = function["arguments"].strip()
+        # 닫는 중괄호가 오기 전에는 파싱 시도 생략 (청크마다 전체 문자열을 다시 파싱하지 않도록)
+        if not function["name"] or not arguments.endswith("}"):
+            return False
+        try:
+            return isinstance(json.loads(arguments), dict)
+        except json.JSONDecodeError:
+            return False
+
+    def build(self):
+        """누적된 청크로 ChatCompletion 생성 (비스트리밍 응답과 같은 형태)"""
+        message = {"role": "assistant", "content": "".join(self.content) or None}
+        for field, parts in self.reasoning.items():
+            message[field] = "".join(parts)
+        if self.tool_calls:
+            message["tool_calls"] = []
+            for index in sorted(self.tool_calls):
+                call = self.tool_calls[index]
+                call["id"] = call["id"] or f"call_{index}"
+                message["tool_calls"].append(call)
+
+        finish_reason = self.finish_reason or ("tool_calls" if self.tool_calls else "stop")
+        return ChatCompletion.construct(
+            id=self.meta.get("id") or "stream",
+            object="chat.completion",
+            created=self.meta.get("created") or int(self.request_start),
+            model=self.meta.get("model") or "",
+            choices=[{"index": 0, "message": message, "finish_reason": finish_reason}],
+            usage=self.usage
+        )
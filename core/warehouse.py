@@ -0,0 +1,204 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+# 실행 정보 컬럼 (runs 테이블)
+RUN_COLUMNS = ["run_id", "model", "mode", "started_at", "elapsed", "total", "passed",
+               "accuracy", "v4_weighted", "results_path", "report_path", "config"]
+
+# 케이스 계측 컬럼 (case_metrics 테이블, 결과 딕셔너리 키 → 컬럼)
+METRIC_COLUMNS = {
+    "Latency": "latency",
+    "Total_Latency": "total_latency",
+    "TTFT": "ttft",
+    "TTC": "ttc",
+    "Retries": "retries",
+    "Backoff": "backoff",
+    "Prompt_Tokens": "prompt_tokens",
+    "Cached_Tokens": "cached_tokens",
+    "Completion_Tokens": "completion_tokens",
+}
+
+# 스텝 계측 컬럼 (steps 테이블, Steps JSON 키와 동일)
+STEP_COLUMNS = ["turn", "step", "latency", "ttft", "ttc", "prompt_tokens", "cached_tokens",
+                "completion_tokens", "retries", "backoff", "cache_hit", "stream_cut"]
+
+_SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS runs ("
+    "run_id TEXT PRIMARY KEY, model TEXT NOT NULL, mode TEXT, started_at TEXT, elapsed REAL, "
+    "total INTEGER, passed INTEGER, accuracy REAL, v4_weighted REAL, "
+    "results_path TEXT, report_path TEXT, config TEXT)",
+    "CREATE TABLE IF NOT EXISTS case_results ("
+    "run_id TEXT NOT NULL, model TEXT NOT NULL, category TEXT NOT NULL, id TEXT NOT NULL, "
+    "passed INTEGER NOT NULL, verification TEXT, thinking TEXT, model_calls TEXT, ground_truth TEXT, "
+    "PRIMARY KEY (run_id, category, id))",
+    "CREATE TABLE IF NOT EXISTS case_metrics ("
+    "run_id TEXT NOT NULL, model TEXT NOT NULL, category TEXT NOT NULL, id TEXT NOT NULL, "
+    + ", ".join(f"{col} REAL" for col in METRIC_COLUMNS.values()) + ", "
+    "PRIMARY KEY (run_id, category, id))",
+    "CREATE TABLE IF NOT EXISTS steps ("
+    "run_id TEXT NOT NULL, category TEXT NOT NULL, id TEXT NOT NULL, "
+    + ", ".join(f"{col} REAL" for col in STEP_COLUMNS) + ", "
+    "PRIMARY KEY (run_id, category, id, turn, step))",
+    "CREATE INDEX IF NOT EXISTS idx_runs_model ON runs(model, started_at)",
+    "CREATE INDEX IF NOT EXISTS idx_case_results_key ON case_results(model, category, id, run_id)",
+    "CREATE INDEX IF NOT EXISTS idx_case_results_run ON case_results(run_id, category, passed)",
+    "CREATE INDEX IF NOT EXISTS idx_case_metrics_model_latency ON case_metrics(model, total_latency)",
+    "CREATE INDEX IF NOT EXISTS idx_case_metrics_run_latency ON case_metrics(run_id, total_latency)",
+]
+
+class ResultWarehouse:
+    """
+    실행 결과 누적 저장소 (SQLite)
+
+    실행마다 runs / case_results / case_metrics(토큰, latency) / steps 테이블에 추가되며,
+    (model, category, id, run) 인덱스로 실행 간 비교와 느린 케이스 조회를 빠르게 처리합니다.
+    같은 run_id로 다시 저장하면 해당 실행의 기존 행을 교체합니다.
+    """
+    def __init__(self, path="results/warehouse.sqlite"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 여러 모델을 병렬 실행하는 경우 스레드/프로세스 간 쓰기 경합은 SQLite 잠금 대기(timeout)로 처리
+        self._conn = sqlite3.connect(str(self.path), timeout=60, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+
+    def add_run(self, run, results):
+        """
+        실행 1회 저장
+
+        Args:
+            run: RUN_COLUMNS 키를 가진 실행 정보 딕셔너리 (config는 딕셔너리 또는 JSON 문자열)
+            results: 케이스 결과 딕셔너리 리스트 (run_benchmark 결과 / 결과 파일 행)
+        """
+        run_id, model = run["run_id"], run["model"]
+        run_row = [run.get(col) for col in RUN_COLUMNS]
+        if not isinstance(run_row[-1], (str, type(None))):
+            run_row[-1] = json.dumps(run_row[-1], ensure_ascii=False, default=str)
+
+        case_rows, metric_rows, step_rows = [], [], []
+        for result in results:
+            key = (run_id, result["Category"], str(result["ID"]))
+            case_rows.append((key[0], model, key[1], key[2], int(result.get("Result") == "PASS"),
+                              result.get("Verification"), result.get("Thinking"),
+                              result.get("Model_Calls"), result.get("Ground_Truth")))
+            metric_rows.append((key[0], model, key[1], key[2]) + tuple(result.get(name) for name in METRIC_COLUMNS))
+            for step in _parse_steps(result.get("Steps")):
+                step_rows.append(key + tuple(_step_value(step.get(col)) for col in STEP_COLUMNS))
+
+        with self._lock, self._conn:
+            for table in ("case_results", "case_metrics", "steps"):
+                self._conn.execute(f"DELETE FROM {table} WHERE run_id = ?", (run_id,))
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(RUN_COLUMNS)}) VALUES ({', '.join('?' * len(RUN_COLUMNS))})",
+                run_row
+            )
+            self._conn.executemany("INSERT OR REPLACE INTO case_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", case_rows)
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO case_metrics VALUES ({', '.join('?' * (4 + len(METRIC_COLUMNS)))})", metric_rows
+            )
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO steps VALUES ({', '.join('?' * (3 + len(STEP_COLUMNS)))})", step_rows
+            )
+        return len(case_rows)
+
+    def query(self, sql, params=()):
+        """SQL 실행 후 (컬럼 목록, 행 리스트) 반환"""
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            columns = [desc[0] for desc in cursor.description or []]
+            return columns, cursor.fetchall()
+
+    def resolve_run(self, ref):
+        """run_id 또는 모델명(해당 모델의 가장 최근 실행)을 run_id로 변환 (없으면 None)"""
+        _, rows = self.query("SELECT run_id FROM runs WHERE run_id = ?", (ref,))
+        if rows:
+            return rows[0][0]
+        _, rows = self.query("SELECT run_id FROM runs WHERE model = ? ORDER BY started_at DESC LIMIT 1", (ref,))
+        return rows[0][0] if rows else None
+
+    def runs(self, model=None, limit=20):
+        """최근 실행 목록"""
+        where, params = ("WHERE model = ?", (model,)) if model else ("", ())
+        return self.query(
+            "SELECT run_id, model, mode, started_at, total, passed, ROUND(accuracy, 1) AS accuracy, "
+            f"ROUND(v4_weighted, 1) AS v4_weighted, ROUND(elapsed, 1) AS elapsed FROM runs {where} "
+            "ORDER BY started_at DESC LIMIT ?", params + (limit,)
+        )
+
+    def slowest(self, model=None, run_id=None, category=None, limit=50):
+        """케이스 전체 latency(모든 스텝 합)가 가장 긴 케이스"""
+        conditions, params = [], []
+        for column, value in (("m.model", model), ("m.run_id", run_id), ("m.category", category)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(
+            "SELECT m.run_id, m.model, m.category, m.id, ROUND(m.total_latency) AS total_latency_ms, "
+            "ROUND(m.ttft) AS ttft_ms, m.retries, m.prompt_tokens + m.completion_tokens AS tokens, "
+            "CASE c.passed WHEN 1 THEN 'PASS' ELSE 'FAIL' END AS result "
+            f"FROM case_metrics m JOIN case_results c USING (run_id, category, id) {where} "
+            "ORDER BY m.total_latency DESC LIMIT ?", tuple(params) + (limit,)
+        )
+
+    def compare(self, run_a, run_b):
+        """
+        두 실행의 카테고리별 정확도/latency 비교 (B - A)
+
+        정확도는 두 실행에 공통으로 있는 케이스로만 계산합니다 (샘플 수가 다른 실행도 공정하게 비교).
+        """
+        return self.query(
+            "SELECT a.category, COUNT(*) AS cases, "
+            "ROUND(AVG(a.passed) * 100, 1) AS acc_a, ROUND(AVG(b.passed) * 100, 1) AS acc_b, "
+            "ROUND((AVG(b.passed) - AVG(a.passed)) * 100, 1) AS acc_delta, "
+            "SUM(a.passed = 0 AND b.passed = 1) AS fixed, SUM(a.passed = 1 AND b.passed = 0) AS broken, "
+            "ROUND(AVG(ma.total_latency)) AS latency_a, ROUND(AVG(mb.total_latency)) AS latency_b "
+            "FROM case_results a JOIN case_results b ON b.run_id = ? AND b.category = a.category AND b.id = a.id "
+            "LEFT JOIN case_metrics ma ON ma.run_id = a.run_id AND ma.category = a.category AND ma.id = a.id "
+            "LEFT JOIN case_metrics mb ON mb.run_id = b.run_id AND mb.category = b.category AND mb.id = b.id "
+            "WHERE a.run_id = ? GROUP BY a.category ORDER BY acc_delta, a.category",
+            (run_b, run_a)
+        )
+
+    def changed_cases(self, run_a, run_b, limit=50):
+        """두 실행 간 결과가 바뀐 케이스 (A → B)"""
+        return self.query(
+            "SELECT a.category, a.id, CASE a.passed WHEN 1 THEN 'PASS' ELSE 'FAIL' END AS result_a, "
+            "CASE b.passed WHEN 1 THEN 'PASS' ELSE 'FAIL' END AS result_b "
+            "FROM case_results a JOIN case_results b ON b.run_id = ? AND b.category = a.category AND b.id = a.id "
+            "WHERE a.run_id = ? AND a.passed != b.passed ORDER BY a.category, a.id LIMIT ?",
+            (run_b, run_a, limit)
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def _parse_steps(steps):
+    """Steps 컬럼(JSON 문자열 또는 리스트)을 스텝 딕셔너리 리스트로 변환"""
+    if not steps:
+        return []
+    if isinstance(steps, str):
+        try:
+            steps = json.loads(steps)
+        except json.JSONDecodeError:
+            return []
+    return [step for step in steps if isinstance(step, dict)]
+
+def _step_value(value):
+    return int(value) if isinstance(value, bool) else value
+
+def format_table(columns, rows):
+    """조회 결과를 고정폭 텍스트 표로 변환 (콘솔 출력용)"""
+    cells = [[("" if value is None else str(value)) for value in row] for row in rows]
+    widths = [max([len(col)] + [len(row[i]) for row in cells]) for i, col in enumerate(columns)]
+    lines = ["  ".join(col.ljust(widths[i]) for i, col in enumerate(columns)),
+             "  ".join("-" * width for width in widths)]
+    lines += ["  ".join(value.ljust(widths[i]) for i, value in enumerate(row)) for row in cells]
+    return "\n".join(lines)
@@ -0,0 +1,204 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from pathlib import Path
+
+# 작업 상태: pending (대기), leased (워커가 실행 중), done (완료), failed (max_attempts 초과)
+TASK_STATUSES = ["pending", "leased", "done", "failed"]
+
+def parse_shard(spec):
+    """
+    샤드 문자열 파싱: "i/N" (0 <= i < N)
+
+    예: "1/4" -> (1, 4)
+    """
+    index, sep, count = spec.partition("/")
+    try:
+        index, count = int(index), int(count)
+    except ValueError:
+        index = count = None
+    if not sep or count is None or count < 1 or not 0 <= index < count:
+        raise ValueError(f"잘못된 샤드 형식: {spec} (예: 0/4, 1/4, 2/4, 3/4)")
+    return index, count
+
+def in_shard(position, shard):
+    """케이스 순서(position)가 샤드 (index, count)에 속하는지 (라운드 로빈 분할)"""
+    index, count = shard
+    return position % count == index
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class WorkQueue:
+    """
+    SQLite 기반 공유 작업 큐 ((model, category, id) 단위 작업)
+
+    같은 머신의 여러 프로세스 또는 파일시스템을 공유하는 여러 머신의 워커가
+    작업을 임대(lease)해 실행하고 결과를 기록합니다.
+
+    - 임대는 lease_ttl초 동안 유효하며, 워커는 heartbeat 스레드로 실행 중인 작업의 임대를 갱신합니다
+    - 갱신이 끊긴 워커(프로세스 종료, 머신 장애)의 작업은 기한이 지나면 다른 워커에게 다시 임대됩니다
+    - max_attempts번 임대되고도 완료되지 않은 작업은 failed로 표시됩니다
+    - 네트워크 파일시스템에서도 동작하도록 WAL이 아닌 기본 rollback 저널을 사용합니다
+    """
+    def __init__(self, path, worker_id=None, lease_ttl=120.0, max_attempts=3):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_ttl = lease_ttl
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._heartbeat = None
+        self._stop = threading.Event()
+        self._conn = sqlite3.connect(str(self.path), timeout=60, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "model TEXT NOT NULL, category TEXT NOT NULL, id TEXT NOT NULL, seq INTEGER NOT NULL, "
+                "status TEXT NOT NULL DEFAULT 'pending', worker TEXT, lease_until REAL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, finished_at REAL, "
+                "PRIMARY KEY (model, category, id))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks(model, status, seq)")
+
+    def _transaction(self, fn):
+        """쓰기 잠금을 먼저 잡는 트랜잭션 (여러 프로세스가 같은 작업을 동시에 임대하지 않도록)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return value
+
+    def enqueue(self, model, keys):
+        """
+        작업 등록 (이미 있는 작업은 유지, 여러 워커/코디네이터가 중복 호출해도 안전)
+
+        Args:
+            keys: (category, id) 리스트 (순서 = 결과 병합 순서)
+
+        Returns:
+            새로 등록된 작업 수
+        """
+        rows = [(model, cat, str(test_id), seq) for seq, (cat, test_id) in enumerate(keys)]
+        def insert(conn):
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO tasks (model, category, id, seq) VALUES (?, ?, ?, ?)", rows)
+            return conn.total_changes - before
+        return self._transaction(insert)
+
+    def lease(self, model, limit):
+        """
+        대기 중이거나 임대 기한이 지난 작업을 최대 limit개 임대, [(category, id)] 반환 (순서 = seq)
+
+        이미 max_attempts번 임대된 작업은 다시 임대하지 않고 failed로 표시합니다
+        (워커를 죽이는 케이스가 끝없이 재임대되어 큐가 비지 않는 것을 방지).
+        """
+        def take(conn):
+            now = time.time()
+            exhausted = conn.execute(
+                "SELECT category, id, worker FROM tasks WHERE model = ? AND attempts >= ? "
+                "AND (status = 'pending' OR (status = 'leased' AND lease_until < ?))",
+                (model, self.max_attempts, now)
+            ).fetchall()
+            for cat, test_id, worker in exhausted:
+                print(f"💀 시도 횟수 초과 작업 실패 처리: {cat}/{test_id} (마지막 워커: {worker})")
+            conn.executemany(
+                "UPDATE tasks SET status = 'failed', worker = NULL, lease_until = NULL "
+                "WHERE model = ? AND category = ? AND id = ?",
+                [(model, cat, test_id) for cat, test_id, _ in exhausted]
+            )
+            rows = conn.execute(
+                "SELECT category, id, status, worker FROM tasks WHERE model = ? AND attempts < ? "
+                "AND (status = 'pending' OR (status = 'leased' AND lease_until < ?)) ORDER BY seq LIMIT ?",
+                (model, self.max_attempts, now, limit)
+            ).fetchall()
+            for cat, test_id, status, worker in rows:
+                if status == "leased":
+                    print(f"♻️  임대 만료 작업 회수: {cat}/{test_id} (이전 워커: {worker})")
+            conn.executemany(
+                "UPDATE tasks SET status = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                "WHERE model = ? AND category = ? AND id = ?",
+                [(self.worker_id, now + self.lease_ttl, model, cat, test_id) for cat, test_id, _, _ in rows]
+            )
+            return [(cat, test_id) for cat, test_id, _, _ in rows]
+        return self._transaction(take)
+
+    def complete(self, model, category, test_id, result):
+        """작업 완료 기록 (임대가 다른 워커로 넘어간 뒤 늦게 끝난 경우에도 먼저 기록된 결과를 유지)"""
+        payload = json.dumps(result, ensure_ascii=False, default=str)
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE tasks SET status = 'done', result = ?, worker = ?, finished_at = ? "
+            "WHERE model = ? AND category = ? AND id = ? AND status != 'done'",
+            (payload, self.worker_id, time.time(), model, category, str(test_id))
+        ))
+
+    def release(self, model, keys):
+        """
+        완료하지 못한 작업 반납 (실행 에러, 조기 중단)
+
+        시도 횟수가 max_attempts에 도달한 작업은 failed, 그 외에는 다시 대기 상태로 돌립니다.
+        """
+        def give_back(conn):
+            conn.executemany(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker = NULL, lease_until = NULL "
+                "WHERE model = ? AND category = ? AND id = ? AND status = 'leased' AND worker = ?",
+                [(self.max_attempts, model, cat, str(test_id), self.worker_id) for cat, test_id in keys]
+            )
+        self._transaction(give_back)
+
+    def renew(self):
+        """이 워커가 임대 중인 모든 작업의 기한 연장"""
+        self._transaction(lambda conn: conn.execute(
+            "UPDATE tasks SET lease_until = ? WHERE worker = ? AND status = 'leased'",
+            (time.time() + self.lease_ttl, self.worker_id)
+        ))
+
+    def counts(self, model):
+        """상태별 작업 수"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM tasks WHERE model = ? GROUP BY status", (model,)
+            ).fetchall()
+        counts = dict.fromkeys(TASK_STATUSES, 0)
+        counts.update(rows)
+        return counts
+
+    def results(self, model):
+        """완료된 작업의 결과 딕셔너리 리스트 (seq 순서 → 어느 워커가 실행했든 같은 순서로 병합)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT result FROM tasks WHERE model = ? AND status = 'done' ORDER BY seq, category, id", (model,)
+            ).fetchall()
+        return [json.loads(result) for (result,) in rows]
+
+    def start_heartbeat(self, interval=None):
+        """임대 갱신 스레드 시작 (기본 주기: lease_ttl의 1/3)"""
+        if self._heartbeat is not None:
+            return
+        interval = interval or self.lease_ttl / 3
+
+        def beat():
+            while not self._stop.wait(interval):
+                try:
+                    self.renew()
+                except sqlite3.Error as e:
+                    print(f"⚠️ 작업 임대 갱신 실패: {e}")
+
+        self._heartbeat = threading.Thread(target=beat, name="queue-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def close(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        with self._lock:
+            self._conn.close()
@@ -1,18 +1,27 @@
 import os
+import sys
 import json
 import time
+import asyncio
 import argparse
-import pandas as pd
 import traceback
 from datetime import datetime
 from dotenv import load_dotenv
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-from openpyxl.utils import get_column_letter
 
 from core.loader import BFCLDataLoader
-from core.handler import ModelHandler
+from core.handler import ModelHandler, DEFAULT_BASE_URL, configure_http_pool, http_pool_stats
 from core.checker import BFCLChecker
-from core.executor import BFCLMockExecutor
+from core.executor import BFCLMockExecutor, BFCLPooledExecutor, EXECUTOR_MODES
+from core.cache import InferenceCache, CACHE_MODES
+from core.journal import ResultJournal
+from core.scheduler import CaseGate, ModelAborted
+from core.report import write_results_table, read_results_table, result_columns, submit_report
+from core.warehouse import ResultWarehouse, format_table
+from core.workqueue import WorkQueue, parse_shard, in_shard
+from core.sampling import wilson_interval, required_samples, stratified_order
+from core.dedup import RequestPlan
+from core.batch import BatchRunner
+from core.standin import StandInServer
 
 def _format_model_name_for_filename(model_name):
     """
@@ -87,6 +96,15 @@ BFCL_ALL_CATEGORIES = {
     "format_sensitivity": {"count": 9, "group": "AGENTIC", "difficulty": "⭐⭐"},
 }
 
+# 정답이 함수 호출 1개인 카테고리 (첫 tool call 후 스텝 종료, 스트리밍 모드에서는 조기 종료 대상)
+SINGLE_CALL_CATEGORIES = ["simple_python", "simple_javascript", "simple_java", "live_simple"]
+
+# 스텝 간 상호작용이 없는 카테고리 (요청 1회로 채점 가능, --batch 모드 대상)
+BATCH_CATEGORIES = SINGLE_CALL_CATEGORIES + [
+    "multiple", "parallel", "parallel_multiple", "live_multiple", "live_parallel", "live_parallel_multiple",
+    "irrelevance", "live_irrelevance", "live_relevance"
+]
+
 # ==========================================
 # [기본 설정]
 # ==========================================
@@ -96,7 +114,33 @@ DEFAULT_CONFIG = {
     "samples_per_cat": 5,  # 각 카테고리당 기본 샘플 수
     "sampling_strategy": "equal",  # "equal" or "proportional"
     "max_agent_steps": 3,
-    "rate_limit_delay": 3  # API 레이트 리밋 대기 시간 (초)
+    "rate_limit_delay": 0,  # 카테고리 간 추가 대기 시간 (초, 요청 페이싱은 공유 레이트 리미터가 담당)
+    "max_rps": None,  # 초당 최대 요청 수 상한 (None = 응답 헤더 기반 자동 조절)
+    "concurrency": 1,  # 동시 실행 케이스 수 (1 = 직렬 실행)
+    "cache": "off",  # inference 캐시 모드: off, read, write, readwrite
+    "cache_path": ".cache/inference_cache.sqlite",
+    "cache_max_mb": 2048,  # 캐시 최대 크기 (초과 시 LRU 제거)
+    "resume": False,  # True면 저널에 기록된 완료 케이스를 건너뜀
+    "rate_limit_key": None,  # 레이트 리미터 버킷 키 (None = base_url 공유, 모델별 예산이 필요하면 모델별로 지정)
+    "max_consecutive_errors": None,  # 연속 에러 케이스가 이 수에 도달하면 모델 조기 중단 (None = 비활성화)
+    "results_format": "auto",  # 컬럼 기반 결과 파일 형식: auto (pyarrow 있으면 parquet), parquet, csv
+    "excel_report": True,  # False면 결과 파일만 저장 (Excel 리포트 생성 생략)
+    "prompt_cache": False,  # True면 system + tools prefix 고정 및 provider 프롬프트 캐시 힌트 사용
+    "stream": False,  # True면 스트리밍 요청으로 TTFT(첫 토큰까지 시간) 측정
+    "stream_cutoff": True,  # 스트리밍 모드에서 단일 호출 카테고리는 첫 tool call 완성 시 스트림 종료
+    "executor": "mock",  # 도구 실행기: mock (고정 응답), real (멀티턴 케이스를 func_source_code 백엔드로 실행)
+    "warehouse_path": "results/warehouse.sqlite",  # 실행 결과 누적 저장소 (None이면 저장 안 함)
+    "shard": None,  # (index, count) - 케이스 순서 기준 라운드 로빈 분할 중 이 프로세스 몫만 실행
+    "queue_path": None,  # 공유 작업 큐(SQLite) 경로 - 설정하면 큐에서 작업을 임대해 실행하는 워커 모드
+    "target_ci": None,  # 신뢰구간 모드: 카테고리 95% CI 폭(%p)이 이 값 이하가 되면 종료 (samples_per_cat은 상한)
+    "ci_min_samples": 10,  # 신뢰구간 모드에서 카테고리당 최소 샘플 수
+    "sampling_seed": 0,  # 신뢰구간 모드의 층화 무작위 순서 seed (같은 seed = 같은 순서, --resume 가능)
+    "dedup": True,  # 첫 스텝 요청이 같은 케이스(temperature 0)끼리 응답을 공유하여 API 호출 절약
+    "base_url": None,  # OpenAI 호환 엔드포인트 (None = OpenRouter, 설정 시 OPENAI_API_KEY 사용)
+    "batch": False,  # True면 단일 스텝 카테고리를 Batch API로 한 번에 요청 (나머지는 일반 실행)
+    "batch_poll_interval": 10.0,  # 배치 완료 확인 주기 (초)
+    "local_server": False,  # True면 로컬 stand-in 서버 실행 (합성 응답 - 저널/결과 파일 이름 구분, 저장소에 기록 안 함)
+    "http2": None  # True면 공유 연결 풀에서 HTTP/2 사용 (h2 패키지 필요, 없으면 HTTP/1.1, None = BFCL_HTTP2 환경 변수)
 }
 
 # 빠른 테스트용 샘플 설정
@@ -104,7 +148,7 @@ QUICK_TEST_CONFIG = {
     "samples_per_cat": 2,
     "categories": ["simple_python", "multiple", "live_simple"],  # 3개 대표 카테고리
     "sampling_strategy": "equal",
-    "rate_limit_delay": 5
+    "rate_limit_delay": 0
 }
 
 # 전체 벤치마크 설정 (모든 데이터 사용)
@@ -112,7 +156,7 @@ FULL_TEST_CONFIG = {
     "samples_per_cat": 999999,  # 각 카테고리의 모든 샘플 사용
     "categories": [k for k in BFCL_ALL_CATEGORIES.keys() if k != "format_sensitivity"],  # format_sensitivity 제외 (19개)
     "sampling_strategy": "equal",
-    "rate_limit_delay": 3
+    "rate_limit_delay": 0
 }
 
 class BFCLScorer:
@@ -128,22 +172,33 @@ class BFCLScorer:
     }
     
     @staticmethod
-    def calculate_scores(df):
-        """BFCL 공식 점수 산출 방법에 따라 통계 계산"""
+    def calculate_scores(results):
+        """
+        BFCL 공식 점수 산출 방법에 따라 통계 계산 (results: 결과 딕셔너리 리스트 또는 DataFrame)
+        
+        카테고리별 정확도에는 95% Wilson 신뢰구간(ci_low, ci_high, %)이 함께 계산됩니다.
+        """
+        if hasattr(results, "to_dict"):
+            results = results.to_dict("records")
         scores = {}
         
-        # 1. 카테고리별 정확도
-        for cat in df['Category'].unique():
-            cat_df = df[df['Category'] == cat]
-            pass_count = len(cat_df[cat_df['Result'] == 'PASS'])
-            total_count = len(cat_df)
-            accuracy = (pass_count / total_count * 100) if total_count > 0 else 0
-            scores[cat] = {
-                "accuracy": accuracy,
-                "pass": pass_count,
-                "total": total_count,
-                "group": BFCL_ALL_CATEGORIES.get(cat, {}).get("group", "UNKNOWN")
-            }
+        # 1. 카테고리별 정확도 (카테고리는 처음 등장한 순서대로)
+        for result in results:
+            cat = result['Category']
+            if cat not in scores:
+                scores[cat] = {
+                    "accuracy": 0,
+                    "pass": 0,
+                    "total": 0,
+                    "group": BFCL_ALL_CATEGORIES.get(cat, {}).get("group", "UNKNOWN")
+                }
+            scores[cat]["total"] += 1
+            if result['Result'] == 'PASS':
+                scores[cat]["pass"] += 1
+        for data in scores.values():
+            data["accuracy"] = (data["pass"] / data["total"] * 100) if data["total"] > 0 else 0
+            low, high = wilson_interval(data["pass"], data["total"])
+            data["ci_low"], data["ci_high"] = low * 100, high * 100
         
         # 2. 그룹별 평균 정확도 (Unweighted)
         groups = {}
@@ -179,147 +234,218 @@ class BFCLScorer:
             "by_category": scores,
             "by_group": group_scores
         }
+    
+    @staticmethod
+    def calculate_performance(results):
+        """
+        카테고리별 실행 성능 통계 (스텝 계측 기반)
+        
+        케이스 latency(모든 스텝 합)와 케이스당 토큰(prompt + completion)의 p50/p95/p99,
+        TTFT/time-to-tool-call 중앙값, 재시도/백오프 합계, 전체 실행 시간 대비 비중을 계산합니다.
+        마지막에 전체("ALL") 항목이 추가됩니다.
+        """
+        if hasattr(results, "to_dict"):
+            results = results.to_dict("records")
+        grouped = {}
+        for result in results:
+            grouped.setdefault(result['Category'], []).append(result)
+        grouped["ALL"] = list(results)
+        total_time = sum(BFCLScorer._case_latency(r) for r in results)
+        
+        performance = {}
+        for cat, cat_results in grouped.items():
+            latencies = [BFCLScorer._case_latency(r) for r in cat_results]
+            tokens = [(r.get('Prompt_Tokens') or 0) + (r.get('Completion_Tokens') or 0) for r in cat_results]
+            ttfts = [r['TTFT'] for r in cat_results if r.get('TTFT') is not None]
+            ttcs = [r['TTC'] for r in cat_results if r.get('TTC') is not None]
+            performance[cat] = {
+                "cases": len(cat_results),
+                "latency_p50": _percentile(latencies, 50),
+                "latency_p95": _percentile(latencies, 95),
+                "latency_p99": _percentile(latencies, 99),
+                "tokens_p50": _percentile(tokens, 50),
+                "tokens_p95": _percentile(tokens, 95),
+                "tokens_p99": _percentile(tokens, 99),
+                "ttft_p50": _percentile(ttfts, 50) if ttfts else None,
+                "ttc_p50": _percentile(ttcs, 50) if ttcs else None,
+                "retries": sum(r.get('Retries') or 0 for r in cat_results),
+                "backoff": sum(r.get('Backoff') or 0 for r in cat_results),
+                "total_time": sum(latencies),
+                "time_share": (sum(latencies) / total_time * 100) if total_time else 0
+            }
+        return performance
+    
+    @staticmethod
+    def _case_latency(result):
+        """케이스 전체 latency (스텝 계측 이전 결과는 마지막 스텝 latency)"""
+        total = result.get('Total_Latency')
+        return total if total is not None else (result.get('Latency') or 0)
+
+def _percentile(values, pct):
+    """선형 보간 백분위수 (값이 없으면 0)"""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
 
 class ExcelReporter:
-    """BFCL 표준 멀티 시트 Excel 리포트 생성기"""
+    """
+    BFCL 표준 멀티 시트 Excel 리포트 생성기
+
+    openpyxl write-only(스트리밍) 모드로 행 단위로 기록하며, 셀 스타일은 미리 등록한
+    named style 이름만 지정합니다 (셀마다 스타일 객체를 만들거나 시트를 다시 읽지 않음).
+    openpyxl은 리포트를 실제로 생성할 때만 import합니다.
+    """
+    
+    # named style 배경 변형: 기본 / 스트라이프 / 섹션 구분
+    FILLS = {"": None, "_stripe": "FAFAFA", "_section": "E7E6E6"}
     
     @staticmethod
-    def save(df, path, model_name, config):
-        """BFCL 표준 4-시트 리포트 생성"""
-        with pd.ExcelWriter(path, engine='openpyxl') as writer:
-            # 1. 상세 결과 시트
-            ExcelReporter._write_result_sheet(writer, df)
-            
-            # 2. 요약 통계 시트 (BFCL 스타일)
-            ExcelReporter._write_summary_sheet(writer, df, model_name)
-            
-            # 3. 데이터셋 정보 시트
-            ExcelReporter._write_dataset_info_sheet(writer)
-            
-            # 4. 참고 자료 시트
-            ExcelReporter._write_reference_sheet(writer)
+    def save(results, path, model_name, config):
+        """BFCL 표준 4-시트 리포트 생성 (results: 결과 딕셔너리 리스트)"""
+        from openpyxl import Workbook
+        
+        if hasattr(results, "to_dict"):
+            results = results.to_dict("records")
+        wb = Workbook(write_only=True)
+        ExcelReporter._register_styles(wb)
+        
+        # 1. 상세 결과 시트
+        ExcelReporter._write_result_sheet(wb, results)
+        
+        # 2. 요약 통계 시트 (BFCL 스타일)
+        ExcelReporter._write_summary_sheet(wb, results, model_name)
+        
+        # 3. 카테고리별 성능 시트 (latency/토큰 백분위수)
+        ExcelReporter._write_performance_sheet(wb, results)
+        
+        # 4. 데이터셋 정보 시트
+        ExcelReporter._write_dataset_info_sheet(wb)
+        
+        # 5. 참고 자료 시트
+        ExcelReporter._write_reference_sheet(wb)
+        
+        wb.save(path)
+        return path
     
     @staticmethod
-    def _write_result_sheet(writer, df):
-        """상세 결과 시트 (기존 스타일 유지)"""
-        # NaN을 빈 문자열로 변환 (Excel 오류 방지)
-        df = df.fillna("")
-        df.to_excel(writer, index=False, sheet_name='Detailed Results')
-        ws = writer.sheets['Detailed Results']
+    def save_from_table(results_path, path, model_name, config):
+        """컬럼 기반 결과 파일(core.report.write_results_table)에서 리포트 생성"""
+        return ExcelReporter.save(read_results_table(results_path), path, model_name, config)
+    
+    @staticmethod
+    def _register_styles(wb):
+        """리포트 전체에서 공유하는 named style 등록"""
+        from openpyxl.styles import NamedStyle, Font, Alignment, PatternFill, Border, Side, DEFAULT_FONT
         
-        # 스타일 정의
+        side = Side(style='thin', color='E0E0E0')
+        border = Border(left=side, right=side, top=side, bottom=side)
+        center = Alignment(horizontal='center', vertical='center')
+        wrap = Alignment(vertical='center', wrap_text=True, indent=1)
         header_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-        stripe_fill = PatternFill(start_color='FAFAFA', end_color='FAFAFA', fill_type='solid')
-        pass_font = Font(color='2E7D32', bold=True)
-        fail_font = Font(color='D32F2F', bold=True)
-        border = Border(
-            left=Side(style='thin', color='E0E0E0'), 
-            right=Side(style='thin', color='E0E0E0'), 
-            top=Side(style='thin', color='E0E0E0'), 
-            bottom=Side(style='thin', color='E0E0E0')
-        )
-
-        # 헤더 스타일링
-        for col_idx in range(1, len(df.columns) + 1):
-            cell = ws.cell(row=1, column=col_idx)
-            cell.fill = header_fill
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
-
-        # 본문 스타일링
-        for row_idx in range(2, len(df) + 2):
-            is_stripe = row_idx % 2 == 0
-            for col_idx in range(1, len(df.columns) + 1):
-                cell = ws.cell(row=row_idx, column=col_idx)
-                if is_stripe: cell.fill = stripe_fill
-                cell.border = border
-                cell.alignment = Alignment(vertical='top', wrap_text=True, indent=1)
-                
-                if col_idx == 3: # 결과 컬럼 (PASS/FAIL)
-                    cell.font = pass_font if cell.value == "PASS" else fail_font
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-
+        
+        wb.add_named_style(NamedStyle(name="bfcl_header", font=Font(bold=True), fill=header_fill, border=border, alignment=center))
+        wb.add_named_style(NamedStyle(
+            name="bfcl_header_wrap", font=Font(bold=True), fill=header_fill, border=border,
+            alignment=Alignment(horizontal='center', vertical='center', wrap_text=True)
+        ))
+        
+        # (폰트, 정렬) 조합 × 배경 변형
+        bases = {
+            "text": (DEFAULT_FONT, Alignment(vertical='top', wrap_text=True, indent=1)),  # 상세 결과 본문
+            "cell": (DEFAULT_FONT, wrap),                                                 # 일반 본문
+            "center": (DEFAULT_FONT, center),                                             # 중앙 정렬 값
+            "pass": (Font(color='2E7D32', bold=True), center),
+            "fail": (Font(color='D32F2F', bold=True), center),
+            "title": (Font(bold=True, color='333333'), wrap),                       # 섹션 제목
+            "metric": (Font(bold=True, size=11), wrap),                             # 전체 점수 지표명
+            "score": (Font(bold=True, color='2E7D32', size=12), center),            # 전체 점수 값
+        }
+        for base, (font, alignment) in bases.items():
+            for variant, color in ExcelReporter.FILLS.items():
+                style = NamedStyle(name=f"bfcl_{base}{variant}", font=font, border=border, alignment=alignment)
+                if color:
+                    style.fill = PatternFill(start_color=color, end_color=color, fill_type='solid')
+                wb.add_named_style(style)
+    
+    @staticmethod
+    def _append(ws, values, styles):
+        """한 행 기록 (styles의 각 항목은 named style 이름, None이면 스타일 없음)"""
+        from openpyxl.cell import WriteOnlyCell
+        
+        row = []
+        for value, style in zip(values, styles):
+            cell = WriteOnlyCell(ws, value=value)
+            if style:
+                cell.style = style
+            row.append(cell)
+        ws.append(row)
+    
+    @staticmethod
+    def _set_widths(ws, widths):
+        """컬럼 너비 설정 (write-only 모드에서는 행을 쓰기 전에 설정해야 함)"""
+        from openpyxl.utils import get_column_letter
+        
+        for i, width in enumerate(widths):
+            ws.column_dimensions[get_column_letter(i + 1)].width = width
+    
+    @staticmethod
+    def _write_result_sheet(wb, results):
+        """상세 결과 시트 (기존 스타일 유지)"""
+        ws = wb.create_sheet('Detailed Results')
+        columns = result_columns(results)
+        
         # 너비 설정
-        col_widths = [15, 15, 10, 40, 30, 30, 30, 30, 15]
-        for i, width in enumerate(col_widths):
-            ws.column_dimensions[get_column_letter(i+1)].width = width
+        ExcelReporter._set_widths(ws, [15, 15, 10, 40, 30, 30, 30, 30, 15])
         ws.freeze_panes = 'C2'
+        
+        ExcelReporter._append(ws, columns, ["bfcl_header"] * len(columns))
+        result_col = columns.index("Result") if "Result" in columns else None
+        
+        for row_idx, result in enumerate(results, 2):
+            variant = "_stripe" if row_idx % 2 == 0 else ""
+            styles = [f"bfcl_text{variant}"] * len(columns)
+            if result_col is not None:  # 결과 컬럼 (PASS/FAIL)
+                styles[result_col] = f"bfcl_{'pass' if result.get('Result') == 'PASS' else 'fail'}{variant}"
+            # None을 빈 문자열로 변환 (Excel 오류 방지)
+            values = ["" if result.get(col) is None else result.get(col) for col in columns]
+            ExcelReporter._append(ws, values, styles)
     
     @staticmethod
-    def _write_summary_sheet(writer, df, model_name):
+    def _write_summary_sheet(wb, results, model_name):
         """BFCL 스타일 요약 통계 시트 (한국어 포함, Excel 수식 자동 집계)"""
-        scores = BFCLScorer.calculate_scores(df)
+        scores = BFCLScorer.calculate_scores(results)
         
         # 카테고리별 행 번호 매핑 (Detailed Results 시트 참조용)
         category_rows = {}
-        for idx, cat in enumerate(df['Category'].unique()):
+        for idx, result in enumerate(results):
             # Excel은 1-based, 헤더가 1행이므로 데이터는 2행부터
-            cat_df = df[df['Category'] == cat]
-            first_row = df[df['Category'] == cat].index[0] + 2  # +2 for Excel indexing
-            last_row = first_row + len(cat_df) - 1
-            category_rows[cat] = (first_row, last_row)
-        
-        # 요약 데이터 구성
-        summary_data = []
-        
-        # 모델 정보
-        summary_data.append({
-            "지표 (Metric)": "테스트 모델 (Model)",
-            "값 (Value)": model_name,
-            "설명 (Description)": "평가에 사용된 LLM 모델"
-        })
-        summary_data.append({
-            "지표 (Metric)": " ",
-            "값 (Value)": " ",
-            "설명 (Description)": " "
-        })
-        
-        # Overall Score (수식으로 계산)
-        summary_data.append({
-            "지표 (Metric)": "━━━ 전체 점수 (Overall Scores) ━━━",
-            "값 (Value)": " ",
-            "설명 (Description)": " "
-        })
-        summary_data.append({
-            "지표 (Metric)": "전체 정확도 (Overall Accuracy)",
-            "값 (Value)": "FORMULA_OVERALL_ACC",  # 나중에 수식으로 교체
-            "설명 (Description)": "모든 카테고리의 비가중 평균 (Subset Testing용)"
-        })
-        summary_data.append({
-            "지표 (Metric)": "  └─ 📊 산출 공식",
-            "값 (Value)": "Σ(Category Acc) / N",
-            "설명 (Description)": "N = 카테고리 수, Equal Weight"
-        })
-        summary_data.append({
-            "지표 (Metric)": " ",
-            "값 (Value)": " ",
-            "설명 (Description)": " "
-        })
-        summary_data.append({
-            "지표 (Metric)": "BFCL v4 가중 점수 (Weighted Score)",
-            "값 (Value)": "FORMULA_V4_WEIGHTED",  # 나중에 수식으로 교체
-            "설명 (Description)": "BFCL v4 공식 가중치 적용 (Full Benchmark용)"
-        })
-        summary_data.append({
-            "지표 (Metric)": "  └─ 📊 산출 공식",
-            "값 (Value)": "(Agentic×40% + Multi-Turn×30% + Live×10% + Non-Live×10% + Hallucination×10%)",
-            "설명 (Description)": "BFCL v4 Official Weighting"
-        })
-        summary_data.append({
-            "지표 (Metric)": " ",
-            "값 (Value)": " ",
-            "설명 (Description)": " "
-        })
+            cat = result['Category']
+            first_row = category_rows[cat][0] if cat in category_rows else idx + 2
+            category_rows[cat] = (first_row, first_row + scores['by_category'][cat]['total'] - 1)
         
-        # 그룹별 점수 (수식으로 계산)
-        summary_data.append({
-            "지표 (Metric)": "━━━ 그룹별 점수 (Group Scores) ━━━",
-            "값 (Value)": " ",
-            "설명 (Description)": " "
-        })
+        # 요약 데이터 구성 (지표, 값, 설명)
+        blank = (" ", " ", " ")
+        summary_data = [
+            # 모델 정보
+            ("테스트 모델 (Model)", model_name, "평가에 사용된 LLM 모델"),
+            blank,
+            # Overall Score (수식으로 계산)
+            ("━━━ 전체 점수 (Overall Scores) ━━━", " ", " "),
+            ("전체 정확도 (Overall Accuracy)", "FORMULA_OVERALL_ACC", "모든 카테고리의 비가중 평균 (Subset Testing용)"),
+            ("  └─ 📊 산출 공식", "Σ(Category Acc) / N", "N = 카테고리 수, Equal Weight"),
+            blank,
+            ("BFCL v4 가중 점수 (Weighted Score)", "FORMULA_V4_WEIGHTED", "BFCL v4 공식 가중치 적용 (Full Benchmark용)"),
+            ("  └─ 📊 산출 공식", "(Agentic×40% + Multi-Turn×30% + Live×10% + Non-Live×10% + Hallucination×10%)", "BFCL v4 Official Weighting"),
+            blank,
+            # 그룹별 점수 (수식으로 계산)
+            ("━━━ 그룹별 점수 (Group Scores) ━━━", " ", " "),
+        ]
         
-        group_row_start = len(summary_data) + 2  # 현재까지의 행 수 + 헤더
+        group_row_map = {}  # 그룹별 행 번호 (현재까지의 행 수 + 헤더)
         
         for group in sorted(set(scores['by_group'].keys())):
             group_kr = {
@@ -329,322 +455,203 @@ class ExcelReporter:
                 "RELEVANCE": "관련성 탐지",
                 "AGENTIC": "에이전트 기능"
             }.get(group, group)
-            summary_data.append({
-                "지표 (Metric)": f"{group} ({group_kr})",
-                "값 (Value)": f"FORMULA_GROUP_{group}",  # 나중에 수식으로 교체
-                "설명 (Description)": f"{group} 그룹 내 카테고리들의 평균 정확도"
-            })
+            group_row_map[group] = len(summary_data) + 2
+            summary_data.append((f"{group} ({group_kr})", f"FORMULA_GROUP_{group}", f"{group} 그룹 내 카테고리들의 평균 정확도"))
         
-        summary_data.append({
-            "지표 (Metric)": " ",
-            "값 (Value)": " ",
-            "설명 (Description)": " "
-        })
+        summary_data.append(blank)
         
         # 카테고리별 상세 점수 (수식으로 계산)
         cat_row_start = len(summary_data) + 2
-        
-        summary_data.append({
-            "지표 (Metric)": "━━━ 카테고리별 점수 (Category Scores) ━━━",
-            "값 (Value)": " ",
-            "설명 (Description)": " "
-        })
+        summary_data.append(("━━━ 카테고리별 점수 (Category Scores) ━━━", " ", " "))
         
         for cat, data in scores['by_category'].items():
             cat_kr = ExcelReporter._get_category_name_korean(cat)
-            summary_data.append({
-                "지표 (Metric)": f"{cat} ({cat_kr})",
-                "값 (Value)": f"FORMULA_CAT_{cat}",  # 나중에 수식으로 교체
-                "설명 (Description)": f"그룹: {data['group']}, 수식 자동 계산"
-            })
+            summary_data.append((f"{cat} ({cat_kr})", f"FORMULA_CAT_{cat}",
+                                 f"그룹: {data['group']}, 95% CI {data['ci_low']:.1f}–{data['ci_high']:.1f}%, 수식 자동 계산"))
         
-        summary_df = pd.DataFrame(summary_data)
-        summary_df = summary_df.fillna("")
-        summary_df.to_excel(writer, index=False, sheet_name='Summary (BFCL)')
+        ws = wb.create_sheet('Summary (BFCL)')
+        ExcelReporter._set_widths(ws, [35, 22, 55])
+        ws.freeze_panes = 'A2'
+        ExcelReporter._append(ws, ["지표 (Metric)", "값 (Value)", "설명 (Description)"], ["bfcl_header"] * 3)
         
-        # 스타일링 및 수식 삽입
-        ws = writer.sheets['Summary (BFCL)']
-        ws.column_dimensions['A'].width = 35
-        ws.column_dimensions['B'].width = 22
-        ws.column_dimensions['C'].width = 55
+        cat_rows = {cat: cat_row_start + 1 + i for i, cat in enumerate(scores['by_category'].keys())}
         
-        # 스타일 정의
-        header_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-        stripe_fill = PatternFill(start_color='FAFAFA', end_color='FAFAFA', fill_type='solid')
-        section_fill = PatternFill(start_color='E7E6E6', end_color='E7E6E6', fill_type='solid')
-        border = Border(
-            left=Side(style='thin', color='E0E0E0'),
-            right=Side(style='thin', color='E0E0E0'),
-            top=Side(style='thin', color='E0E0E0'),
-            bottom=Side(style='thin', color='E0E0E0')
-        )
-        
-        # 헤더 스타일링
-        for col_idx in range(1, 4):
-            cell = ws.cell(row=1, column=col_idx)
-            cell.fill = header_fill
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+        def percent(row):
+            # 퍼센트 값 추출: VALUE(LEFT(B{row}, FIND("%", B{row})-1))
+            return f'VALUE(LEFT(B{row},FIND("%",B{row})-1))'
         
-        # 수식 삽입 및 본문 스타일링
-        for row_idx in range(2, len(summary_df) + 2):
-            cell_a = ws.cell(row=row_idx, column=1)
-            cell_b = ws.cell(row=row_idx, column=2)
-            cell_c = ws.cell(row=row_idx, column=3)
+        # 수식 치환 및 행별 스타일
+        for row_idx, (metric, value, description) in enumerate(summary_data, 2):
+            # Overall Accuracy 수식 (Equal Weight): 카테고리별 점수들의 평균 (소수점 첫째자리까지)
+            if value == "FORMULA_OVERALL_ACC":
+                value = f'=ROUND(AVERAGE({",".join(percent(r) for r in cat_rows.values())}),1)&"%"'
             
-            # Excel 수식 삽입
-            if cell_b.value and isinstance(cell_b.value, str):
-                # Overall Accuracy 수식 (Equal Weight)
-                if cell_b.value == "FORMULA_OVERALL_ACC":
-                    # 카테고리별 점수들의 평균 (퍼센트 값 추출, 소수점 첫째자리까지)
-                    cat_start_row = cat_row_start + 1  # 섹션 헤더 다음 행부터
-                    cat_end_row = cat_start_row + len(scores['by_category']) - 1
-                    # 각 카테고리의 퍼센트 값 추출하여 평균
-                    value_extracts = [f'VALUE(LEFT(B{r},FIND("%",B{r})-1))' for r in range(cat_start_row, cat_end_row + 1)]
-                    cell_b.value = f'=ROUND(AVERAGE({",".join(value_extracts)}),1)&"%"'
-                
-                # BFCL v4 Weighted Score 수식
-                elif cell_b.value == "FORMULA_V4_WEIGHTED":
-                    # 그룹별 행 찾기
-                    group_row_map = {}
-                    current_row = group_row_start
-                    for group in sorted(set(scores['by_group'].keys())):
-                        group_row_map[group] = current_row
-                        current_row += 1
-                    
-                    # v4 가중치 적용: (그룹점수 × 가중치)의 합
-                    weighted_parts = []
-                    weight_sum_parts = []
-                    
-                    for group, weight in BFCLScorer.V4_WEIGHTS.items():
-                        if group in group_row_map:
-                            row = group_row_map[group]
-                            # 퍼센트 값 추출: VALUE(LEFT(B{row}, FIND("%", B{row})-1))
-                            weighted_parts.append(f'VALUE(LEFT(B{row},FIND("%",B{row})-1))*{weight}')
-                            weight_sum_parts.append(str(weight))
-                    
-                    if weighted_parts:
-                        numerator = "+".join(weighted_parts)
-                        denominator = "+".join(weight_sum_parts)
-                        cell_b.value = f'=ROUND(({numerator})/({denominator}),1)&"%"'
-                    else:
-                        cell_b.value = "N/A"
-                
-                # 그룹별 수식
-                elif cell_b.value.startswith("FORMULA_GROUP_"):
-                    group = cell_b.value.replace("FORMULA_GROUP_", "")
-                    # 해당 그룹에 속하는 카테고리들의 행 번호 찾기
-                    group_cats = [cat for cat, data in scores['by_category'].items() if data['group'] == group]
-                    if group_cats:
-                        cat_rows = []
-                        for i, cat in enumerate(scores['by_category'].keys()):
-                            if cat in group_cats:
-                                cat_rows.append(cat_row_start + 1 + i)
-                        
-                        if len(cat_rows) == 1:
-                            # 퍼센트 값 추출: LEFT(B12, FIND("%", B12)-1)
-                            cell_b.value = f'=VALUE(LEFT(B{cat_rows[0]},FIND("%",B{cat_rows[0]})-1))&"%"'
-                        else:
-                            # 각 카테고리의 퍼센트 값 추출하여 평균 (소수점 첫째자리까지)
-                            value_extracts = [f'VALUE(LEFT(B{r},FIND("%",B{r})-1))' for r in cat_rows]
-                            cell_b.value = f'=ROUND(AVERAGE({",".join(value_extracts)}),1)&"%"'
-                
-                # 카테고리별 수식
-                elif cell_b.value.startswith("FORMULA_CAT_"):
-                    cat = cell_b.value.replace("FORMULA_CAT_", "")
-                    if cat in category_rows:
-                        first_row, last_row = category_rows[cat]
-                        # PASS 개수 / 전체 개수 * 100 (소수점 첫째자리까지)
-                        pass_formula = f'COUNTIF(\'Detailed Results\'!C{first_row}:C{last_row},"PASS")'
-                        total_formula = f'COUNTA(\'Detailed Results\'!C{first_row}:C{last_row})'
-                        cell_b.value = f'=IF({total_formula}=0,0,ROUND({pass_formula}/{total_formula}*100,1))&"%"&" ("&{pass_formula}&"/"&{total_formula}&")"'
+            # BFCL v4 Weighted Score 수식: (그룹점수 × 가중치)의 합 / 사용된 가중치 합
+            elif value == "FORMULA_V4_WEIGHTED":
+                weighted_parts = []
+                weight_sum_parts = []
+                for group, weight in BFCLScorer.V4_WEIGHTS.items():
+                    if group in group_row_map:
+                        weighted_parts.append(f'{percent(group_row_map[group])}*{weight}')
+                        weight_sum_parts.append(str(weight))
+                if weighted_parts:
+                    value = f'=ROUND(({"+".join(weighted_parts)})/({"+".join(weight_sum_parts)}),1)&"%"'
+                else:
+                    value = "N/A"
             
-            # 빈 행은 스타일 없음
-            if cell_a.value and str(cell_a.value).strip() == "":
-                continue
-            # 섹션 구분선 강조
-            elif cell_a.value and ("━━━" in str(cell_a.value) or "===" in str(cell_a.value)):
-                cell_a.fill = section_fill
-                cell_a.font = Font(bold=True, color='333333')
-                cell_b.fill = section_fill
-                cell_c.fill = section_fill
-            # 스트라이프 효과
-            elif row_idx % 2 == 0:
-                cell_a.fill = stripe_fill
-                cell_b.fill = stripe_fill
-                cell_c.fill = stripe_fill
+            # 그룹별 수식: 해당 그룹에 속하는 카테고리들의 평균
+            elif value.startswith("FORMULA_GROUP_"):
+                group = value.replace("FORMULA_GROUP_", "")
+                rows = [cat_rows[cat] for cat, data in scores['by_category'].items() if data['group'] == group]
+                if len(rows) == 1:
+                    value = f'={percent(rows[0])}&"%"'
+                else:
+                    value = f'=ROUND(AVERAGE({",".join(percent(r) for r in rows)}),1)&"%"'
             
-            # 테두리 및 정렬
-            for cell in [cell_a, cell_b, cell_c]:
-                cell.border = border
-                cell.alignment = Alignment(vertical='center', wrap_text=True, indent=1)
+            # 카테고리별 수식: PASS 개수 / 전체 개수 * 100 (소수점 첫째자리까지)
+            elif value.startswith("FORMULA_CAT_"):
+                first_row, last_row = category_rows[value.replace("FORMULA_CAT_", "")]
+                pass_formula = f'COUNTIF(\'Detailed Results\'!C{first_row}:C{last_row},"PASS")'
+                total_formula = f'COUNTA(\'Detailed Results\'!C{first_row}:C{last_row})'
+                value = f'=IF({total_formula}=0,0,ROUND({pass_formula}/{total_formula}*100,1))&"%"&" ("&{pass_formula}&"/"&{total_formula}&")"'
             
-            # Value 컬럼 중앙 정렬
-            cell_b.alignment = Alignment(horizontal='center', vertical='center')
+            # 빈 행은 스타일 없음
+            if metric.strip() == "":
+                styles = [None, None, None]
+            # 섹션 구분선 강조
+            elif "━━━" in metric or "===" in metric:
+                styles = ["bfcl_title_section", "bfcl_center_section", "bfcl_cell_section"]
+            else:
+                # 스트라이프 효과, Value 컬럼 중앙 정렬
+                variant = "_stripe" if row_idx % 2 == 0 else ""
+                styles = [f"bfcl_cell{variant}", f"bfcl_center{variant}", f"bfcl_cell{variant}"]
+                # Overall Scores 강조 (Equal Weight + V4 Weighted)
+                if "전체 정확도" in metric or "가중 점수" in metric:
+                    styles[:2] = [f"bfcl_metric{variant}", f"bfcl_score{variant}"]
             
-            # Overall Scores 강조 (Equal Weight + V4 Weighted)
-            if "전체 정확도" in str(cell_a.value) or "가중 점수" in str(cell_a.value):
-                cell_a.font = Font(bold=True, size=11)
-                cell_b.font = Font(bold=True, color='2E7D32', size=12)
-                cell_b.alignment = Alignment(horizontal='center', vertical='center')
-        
-        ws.freeze_panes = 'A2'
+            ExcelReporter._append(ws, [metric, value, description], styles)
     
     @staticmethod
-    def _write_dataset_info_sheet(writer):
-        """데이터셋 정보 시트 (한국어 포함)"""
-        dataset_info = []
+    def _write_performance_sheet(wb, results):
+        """카테고리별 성능 시트 (케이스 latency/토큰 p50/p95/p99, TTFT/TTC, 재시도, 실행 시간 비중)"""
+        performance = BFCLScorer.calculate_performance(results)
         
-        for cat, info in BFCL_ALL_CATEGORIES.items():
-            cat_kr = ExcelReporter._get_category_name_korean(cat)
-            dataset_info.append({
-                "카테고리 (Category)": f"{cat}\n({cat_kr})",
-                "전체 개수\n(Total Count)": info["count"],
-                "그룹\n(Group)": info["group"],
-                "난이도\n(Difficulty)": info["difficulty"],
-                "설명 (Description)": ExcelReporter._get_category_description(cat)
-            })
-        
-        info_df = pd.DataFrame(dataset_info)
-        # NaN을 빈 문자열로 변환 (Excel 오류 방지)
-        info_df = info_df.fillna("")
-        info_df.to_excel(writer, index=False, sheet_name='Dataset Info')
+        ws = wb.create_sheet('Performance')
+        ExcelReporter._set_widths(ws, [30, 12, 14, 14, 14, 14, 14, 14, 14, 14, 12, 14, 14, 14])
+        ws.freeze_panes = 'B2'
         
-        # 스타일링 (Detailed Results 스타일 유지)
-        ws = writer.sheets['Dataset Info']
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 14
-        ws.column_dimensions['C'].width = 20
-        ws.column_dimensions['D'].width = 14
-        ws.column_dimensions['E'].width = 60
+        headers = [
+            "카테고리 (Category)", "케이스 수\n(Cases)",
+            "Latency p50\n(ms)", "Latency p95\n(ms)", "Latency p99\n(ms)",
+            "Tokens/Case\np50", "Tokens/Case\np95", "Tokens/Case\np99",
+            "TTFT p50\n(ms)", "Tool Call p50\n(TTC, ms)", "재시도\n(Retries)", "백오프\n(Backoff, s)",
+            "총 시간\n(Total, s)", "시간 비중\n(Time Share %)"
+        ]
+        ExcelReporter._append(ws, headers, ["bfcl_header_wrap"] * len(headers))
         
-        # 스타일 정의
-        header_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-        stripe_fill = PatternFill(start_color='FAFAFA', end_color='FAFAFA', fill_type='solid')
-        border = Border(
-            left=Side(style='thin', color='E0E0E0'),
-            right=Side(style='thin', color='E0E0E0'),
-            top=Side(style='thin', color='E0E0E0'),
-            bottom=Side(style='thin', color='E0E0E0')
-        )
+        for row_idx, (cat, perf) in enumerate(performance.items(), 2):
+            if cat == "ALL":
+                label, variant = "ALL (전체)", "_section"
+            else:
+                label = f"{cat} ({ExcelReporter._get_category_name_korean(cat)})"
+                variant = "_stripe" if row_idx % 2 == 0 else ""
+            values = [
+                label, perf["cases"],
+                round(perf["latency_p50"]), round(perf["latency_p95"]), round(perf["latency_p99"]),
+                round(perf["tokens_p50"]), round(perf["tokens_p95"]), round(perf["tokens_p99"]),
+                round(perf["ttft_p50"]) if perf["ttft_p50"] is not None else "N/A",
+                round(perf["ttc_p50"]) if perf["ttc_p50"] is not None else "N/A",
+                perf["retries"], round(perf["backoff"] / 1000, 1),
+                round(perf["total_time"] / 1000, 1), round(perf["time_share"], 1)
+            ]
+            styles = [f"bfcl_{'title' if cat == 'ALL' else 'cell'}{variant}"] + [f"bfcl_center{variant}"] * (len(values) - 1)
+            ExcelReporter._append(ws, values, styles)
+    
+    @staticmethod
+    def _write_dataset_info_sheet(wb):
+        """데이터셋 정보 시트 (한국어 포함)"""
+        ws = wb.create_sheet('Dataset Info')
         
-        # 헤더 스타일링
-        for col_idx in range(1, 6):
-            cell = ws.cell(row=1, column=col_idx)
-            cell.fill = header_fill
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-            cell.border = border
+        # 스타일링 (Detailed Results 스타일 유지)
+        ExcelReporter._set_widths(ws, [30, 14, 20, 14, 60])
+        ws.freeze_panes = 'A2'
         
-        # 본문 스타일링
-        for row_idx in range(2, len(info_df) + 2):
-            is_stripe = row_idx % 2 == 0
-            for col_idx in range(1, 6):
-                cell = ws.cell(row=row_idx, column=col_idx)
-                if is_stripe:
-                    cell.fill = stripe_fill
-                cell.border = border
-                cell.alignment = Alignment(vertical='center', wrap_text=True, indent=1)
-                
-                # 중앙 정렬 (Count, Difficulty)
-                if col_idx in [2, 4]:
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
+        headers = ["카테고리 (Category)", "전체 개수\n(Total Count)", "그룹\n(Group)", "난이도\n(Difficulty)", "설명 (Description)"]
+        ExcelReporter._append(ws, headers, ["bfcl_header_wrap"] * len(headers))
         
-        ws.freeze_panes = 'A2'
+        for row_idx, (cat, info) in enumerate(BFCL_ALL_CATEGORIES.items(), 2):
+            cat_kr = ExcelReporter._get_category_name_korean(cat)
+            variant = "_stripe" if row_idx % 2 == 0 else ""
+            # 중앙 정렬 (Count, Difficulty)
+            styles = [f"bfcl_cell{variant}", f"bfcl_center{variant}", f"bfcl_cell{variant}",
+                      f"bfcl_center{variant}", f"bfcl_cell{variant}"]
+            values = [
+                f"{cat}\n({cat_kr})",
+                info["count"],
+                info["group"],
+                info["difficulty"],
+                ExcelReporter._get_category_description(cat)
+            ]
+            ExcelReporter._append(ws, values, styles)
     
     @staticmethod
-    def _write_reference_sheet(writer):
+    def _write_reference_sheet(wb):
         """참고 자료 시트 (한국어 포함)"""
         references = [
-            {"구분 (Section)": "📊 BFCL 공식 (Official)", "내용 (Content)": "Berkeley Function Calling Leaderboard (BFCL)"},
-            {"구분 (Section)": "🌐 웹사이트 (Website)", "내용 (Content)": "https://gorilla.cs.berkeley.edu/leaderboard.html"},
-            {"구분 (Section)": "💻 GitHub", "내용 (Content)": "https://github.com/ShishirPatil/gorilla/tree/main/berkeley-function-call-leaderboard"},
-            {"구분 (Section)": "📁 Dataset", "내용 (Content)": "https://huggingface.co/datasets/gorilla-llm/Berkeley-Function-Calling-Leaderboard"},
-            {"구분 (Section)": " ", "내용 (Content)": " "},
-            {"구분 (Section)": "━━━ 평가 방법 (Evaluation Methods) ━━━", "내용 (Content)": " "},
-            {"구분 (Section)": "🌳 AST 평가", "내용 (Content)": "추상 구문 트리 비교 (Abstract Syntax Tree comparison for structural correctness)"},
-            {"구분 (Section)": "⚙️ 실행 평가", "내용 (Content)": "REST API 및 Python 함수 실제 실행 (Actual execution for REST APIs and Python functions)"},
-            {"구분 (Section)": "✅ 관련성 탐지", "내용 (Content)": "관련 없는 함수 호출 회피 능력 (Ability to avoid irrelevant function calls)"},
-            {"구분 (Section)": "🔀 병렬 호출 순서", "내용 (Content)": "BFCL 표준: 병렬(parallel) 카테고리는 호출 순서 무시. 집합처럼 매칭 (Order-independent matching for parallel function calls)"},
-            {"구분 (Section)": " ", "내용 (Content)": " "},
-            {"구분 (Section)": "━━━ Multi-Turn Response-Based Evaluation ━━━", "내용 (Content)": " "},
-            {"구분 (Section)": "📜 공식 규칙", "내용 (Content)": "Ground Truth must be a strict subset of model result (출처: BFCL V3 Blog)"},
-            {"구분 (Section)": "🔍 Subset Matching", "내용 (Content)": "GT의 모든 함수 호출이 모델 출력에 포함되어야 함. 예: GT [A,B,C] → Model [A,B,C,D] ✅ PASS"},
-            {"구분 (Section)": "🔄 Order Independent", "내용 (Content)": "호출 순서는 무관. 예: GT [A,B,C] → Model [C,B,A] ✅ PASS"},
-            {"구분 (Section)": "📚 Duplicates Allowed", "내용 (Content)": "중복 호출 허용 (탐색 과정). 예: GT [A,B] → Model [A,ls,B,ls] ✅ PASS"},
-            {"구분 (Section)": "⚠️ All-or-Nothing", "내용 (Content)": "하나라도 누락되면 FAIL. 예: GT [A,B,C] → Model [A,B] ❌ FAIL (C 누락)"},
-            {"구분 (Section)": "🔗 공식 문서", "내용 (Content)": "https://gorilla.cs.berkeley.edu/blogs/13_bfcl_v3_multi_turn.html"},
-            {"구분 (Section)": "📖 Minimal Viable Paths", "내용 (Content)": "GT는 사용자 요청에 응답하기 위해 반드시 실행되어야 하는 함수 호출 목록"},
-            {"구분 (Section)": "🔄 State + Response", "내용 (Content)": "Multi-turn은 state-based와 response-based 두 체커 모두 통과 필요"},
-            {"구분 (Section)": " ", "내용 (Content)": " "},
-            {"구분 (Section)": "━━━ 점수 산출 (Scoring) ━━━", "내용 (Content)": " "},
-            {"구분 (Section)": "📈 전체 정확도 (Equal Weight)", "내용 (Content)": "Overall Accuracy = Σ(Category Accuracy) / N (모든 카테고리의 비가중 평균, Subset Testing용)"},
-            {"구분 (Section)": "📈 BFCL v4 가중 점수", "내용 (Content)": "V4 Weighted = (Agentic×40% + Multi-Turn×30% + Live×10% + Non-Live×10% + Hallucination×10%) / 사용된 그룹 가중치 합"},
-            {"구분 (Section)": "  └─ 가중치 세부", "내용 (Content)": "Agentic: web_search, memory | Multi-Turn: multi_turn_* | Live: live_* | Non-Live: simple_*, multiple, parallel_* | Hallucination: irrelevance, live_*relevance"},
-            {"구분 (Section)": "📊 카테고리 정확도", "내용 (Content)": "Category Accuracy = (PASS count / Total count) × 100%"},
-            {"구분 (Section)": "📂 그룹 정확도", "내용 (Content)": "Group Accuracy = 동일 그룹 내 카테고리들의 평균 (Average of categories within same group)"},
-            {"구분 (Section)": " ", "내용 (Content)": " "},
-            {"구분 (Section)": "━━━ 논문 (Papers) ━━━", "내용 (Content)": " "},
-            {"구분 (Section)": "📄 BFCL v1", "내용 (Content)": "AST 평가 메트릭 도입 (Introducing AST evaluation metric)"},
-            {"구분 (Section)": "📄 BFCL v2", "내용 (Content)": "기업 및 OSS 기여 함수 (Enterprise and OSS-contributed functions)"},
-            {"구분 (Section)": "📄 BFCL v3", "내용 (Content)": "멀티턴 상호작용 (Multi-turn interactions)"},
-            {"구분 (Section)": "📄 BFCL v4", "내용 (Content)": "종합적 에이전트 평가 (Holistic agentic evaluation)"},
+            ("📊 BFCL 공식 (Official)", "Berkeley Function Calling Leaderboard (BFCL)"),
+            ("🌐 웹사이트 (Website)", "https://gorilla.cs.berkeley.edu/leaderboard.html"),
+            ("💻 GitHub", "https://github.com/ShishirPatil/gorilla/tree/main/berkeley-function-call-leaderboard"),
+            ("📁 Dataset", "https://huggingface.co/datasets/gorilla-llm/Berkeley-Function-Calling-Leaderboard"),
+            (" ", " "),
+            ("━━━ 평가 방법 (Evaluation Methods) ━━━", " "),
+            ("🌳 AST 평가", "추상 구문 트리 비교 (Abstract Syntax Tree comparison for structural correctness)"),
+            ("⚙️ 실행 평가", "REST API 및 Python 함수 실제 실행 (Actual execution for REST APIs and Python functions)"),
+            ("✅ 관련성 탐지", "관련 없는 함수 호출 회피 능력 (Ability to avoid irrelevant function calls)"),
+            ("🔀 병렬 호출 순서", "BFCL 표준: 병렬(parallel) 카테고리는 호출 순서 무시. 집합처럼 매칭 (Order-independent matching for parallel function calls)"),
+            (" ", " "),
+            ("━━━ Multi-Turn Response-Based Evaluation ━━━", " "),
+            ("📜 공식 규칙", "Ground Truth must be a strict subset of model result (출처: BFCL V3 Blog)"),
+            ("🔍 Subset Matching", "GT의 모든 함수 호출이 모델 출력에 포함되어야 함. 예: GT [A,B,C] → Model [A,B,C,D] ✅ PASS"),
+            ("🔄 Order Independent", "호출 순서는 무관. 예: GT [A,B,C] → Model [C,B,A] ✅ PASS"),
+            ("📚 Duplicates Allowed", "중복 호출 허용 (탐색 과정). 예: GT [A,B] → Model [A,ls,B,ls] ✅ PASS"),
+            ("⚠️ All-or-Nothing", "하나라도 누락되면 FAIL. 예: GT [A,B,C] → Model [A,B] ❌ FAIL (C 누락)"),
+            ("🔗 공식 문서", "https://gorilla.cs.berkeley.edu/blogs/13_bfcl_v3_multi_turn.html"),
+            ("📖 Minimal Viable Paths", "GT는 사용자 요청에 응답하기 위해 반드시 실행되어야 하는 함수 호출 목록"),
+            ("🔄 State + Response", "Multi-turn은 state-based와 response-based 두 체커 모두 통과 필요"),
+            (" ", " "),
+            ("━━━ 점수 산출 (Scoring) ━━━", " "),
+            ("📈 전체 정확도 (Equal Weight)", "Overall Accuracy = Σ(Category Accuracy) / N (모든 카테고리의 비가중 평균, Subset Testing용)"),
+            ("📈 BFCL v4 가중 점수", "V4 Weighted = (Agentic×40% + Multi-Turn×30% + Live×10% + Non-Live×10% + Hallucination×10%) / 사용된 그룹 가중치 합"),
+            ("  └─ 가중치 세부", "Agentic: web_search, memory | Multi-Turn: multi_turn_* | Live: live_* | Non-Live: simple_*, multiple, parallel_* | Hallucination: irrelevance, live_*relevance"),
+            ("📊 카테고리 정확도", "Category Accuracy = (PASS count / Total count) × 100%"),
+            ("📂 그룹 정확도", "Group Accuracy = 동일 그룹 내 카테고리들의 평균 (Average of categories within same group)"),
+            (" ", " "),
+            ("━━━ 논문 (Papers) ━━━", " "),
+            ("📄 BFCL v1", "AST 평가 메트릭 도입 (Introducing AST evaluation metric)"),
+            ("📄 BFCL v2", "기업 및 OSS 기여 함수 (Enterprise and OSS-contributed functions)"),
+            ("📄 BFCL v3", "멀티턴 상호작용 (Multi-turn interactions)"),
+            ("📄 BFCL v4", "종합적 에이전트 평가 (Holistic agentic evaluation)"),
         ]
         
-        ref_df = pd.DataFrame(references)
-        # NaN을 빈 문자열로 변환 (Excel 오류 방지)
-        ref_df = ref_df.fillna("")
-        ref_df.to_excel(writer, index=False, sheet_name='Reference')
+        ws = wb.create_sheet('Reference')
         
         # 스타일링 (Detailed Results 스타일 유지)
-        ws = writer.sheets['Reference']
-        ws.column_dimensions['A'].width = 32
-        ws.column_dimensions['B'].width = 85
-        
-        # 스타일 정의
-        header_fill = PatternFill(start_color='F2F2F2', end_color='F2F2F2', fill_type='solid')
-        stripe_fill = PatternFill(start_color='FAFAFA', end_color='FAFAFA', fill_type='solid')
-        section_fill = PatternFill(start_color='E7E6E6', end_color='E7E6E6', fill_type='solid')
-        border = Border(
-            left=Side(style='thin', color='E0E0E0'),
-            right=Side(style='thin', color='E0E0E0'),
-            top=Side(style='thin', color='E0E0E0'),
-            bottom=Side(style='thin', color='E0E0E0')
-        )
-        
-        # 헤더 스타일링
-        for col_idx in range(1, 3):
-            cell = ws.cell(row=1, column=col_idx)
-            cell.fill = header_fill
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = border
+        ExcelReporter._set_widths(ws, [32, 85])
+        ws.freeze_panes = 'A2'
+        ExcelReporter._append(ws, ["구분 (Section)", "내용 (Content)"], ["bfcl_header"] * 2)
         
-        # 본문 스타일링
-        for row_idx in range(2, len(ref_df) + 2):
-            cell_a = ws.cell(row=row_idx, column=1)
-            cell_b = ws.cell(row=row_idx, column=2)
-            
+        for row_idx, (section, content) in enumerate(references, 2):
             # 빈 행은 스타일 없음
-            if cell_a.value and str(cell_a.value).strip() == "":
-                continue
+            if section.strip() == "":
+                styles = [None, None]
             # 섹션 구분선 강조
-            elif cell_a.value and "━━━" in str(cell_a.value):
-                cell_a.fill = section_fill
-                cell_a.font = Font(bold=True, color='333333')
-                cell_b.fill = section_fill
+            elif "━━━" in section:
+                styles = ["bfcl_title_section", "bfcl_cell_section"]
             # 스트라이프 효과
-            elif row_idx % 2 == 0:
-                cell_a.fill = stripe_fill
-                cell_b.fill = stripe_fill
-            
-            # 테두리 및 정렬
-            for cell in [cell_a, cell_b]:
-                cell.border = border
-                cell.alignment = Alignment(vertical='center', wrap_text=True, indent=1)
-        
-        ws.freeze_panes = 'A2'
+            else:
+                variant = "_stripe" if row_idx % 2 == 0 else ""
+                styles = [f"bfcl_cell{variant}", f"bfcl_cell{variant}"]
+            ExcelReporter._append(ws, [section, content], styles)
     
     @staticmethod
     def _get_category_name_korean(cat):
@@ -700,36 +707,8 @@ class ExcelReporter:
         }
         return descriptions.get(cat, "설명 없음 | No description available")
 
-def process_test_case(handler, executor, checker, cat, q, a, max_steps=3):
-    """단일 테스트 케이스 처리 로직"""
-    test_id = q['id']
-    tools = BFCLDataLoader().get_functions(cat, q)
-    gt = a['ground_truth']
-    
-    # Memory 카테고리인 경우 prerequisite conversation 로드
-    prereq_turns = []
-    if "memory" in cat:
-        scenario = q.get("scenario", "")
-        if scenario:
-            loader = BFCLDataLoader()
-            prereq_file = loader.data_root / "memory_prereq_conversation" / f"memory_{scenario}.json"
-            if prereq_file.exists():
-                with open(prereq_file, 'r', encoding='utf-8') as f:
-                    # JSONL 형식: 각 줄이 하나의 prerequisite conversation
-                    for line in f:
-                        if line.strip():
-                            prereq_data = json.loads(line)
-                            # test_id의 prefix를 확인하여 해당하는 prerequisite conversation 찾기
-                            # 예: memory_0-customer-0 -> memory_prereq_0-customer-0
-                            test_id_parts = test_id.split('-')
-                            if len(test_id_parts) >= 2:
-                                prereq_id = f"memory_prereq_{test_id_parts[0].replace('memory_', '')}-{test_id_parts[1]}-{test_id_parts[2] if len(test_id_parts) > 2 else '0'}"
-                                if prereq_data.get('id') == prereq_id:
-                                    prereq_turns = prereq_data.get('question', [])
-                                    break
-    
-    # 개선된 시스템 프롬프트 (Tool Calling Best Practices 적용)
-    SYSTEM_PROMPT = """You are an expert function-calling assistant. Your primary job is to call the appropriate functions with correct parameters.
+# 개선된 시스템 프롬프트 (Tool Calling Best Practices 적용)
+SYSTEM_PROMPT = """You are an expert function-calling assistant. Your primary job is to call the appropriate functions with correct parameters.
 
 CRITICAL RULES:
 1. ALWAYS use the provided functions to answer user requests - this is your main purpose
@@ -761,6 +740,148 @@ MULTI-TURN BEHAVIOR:
 
 Your goal is to successfully call the right functions with the right parameters."""
 
+def _make_executor(cat, q, mode="mock"):
+    """
+    케이스별 도구 실행기 생성
+
+    real 모드의 멀티턴 케이스는 involved_classes의 실제 백엔드 인스턴스를 공유 풀에서 빌려 사용합니다
+    (케이스 종료 후 close()로 반납). 그 외에는 BFCLMockExecutor를 사용합니다.
+    """
+    if mode == "real" and "multi_turn" in cat and q.get('involved_classes'):
+        return BFCLPooledExecutor(
+            initial_config=q.get('initial_config'), involved_classes=q['involved_classes'],
+            long_context="long_context" in cat
+        )
+    return BFCLMockExecutor(initial_config=q.get('initial_config'))
+
+def process_test_case(handler, executor, checker, cat, q, a, max_steps=3):
+    """단일 테스트 케이스 처리 로직 (동기 실행)"""
+    return _drive_steps(handler, _test_case_steps(handler, executor, checker, cat, q, a, max_steps))
+
+async def aprocess_test_case(handler, executor, checker, cat, q, a, max_steps=3):
+    """단일 테스트 케이스 처리 로직 (비동기 실행, 턴 순서는 유지)"""
+    return await _adrive_steps(handler, _test_case_steps(handler, executor, checker, cat, q, a, max_steps))
+
+def _drive_steps(handler, steps, first=None):
+    """
+    inference 요청을 yield하는 제너레이터를 동기 inference로 끝까지 진행하고 반환값을 돌려줌
+
+    first가 주어지면 이미 꺼낸 첫 요청의 결과로 전달합니다 (배치 모드).
+    """
+    try:
+        request = next(steps) if first is None else steps.send(first)
+        while True:
+            try:
+                res = handler.inference(**request)
+            except Exception as e:
+                request = steps.throw(e)
+            else:
+                request = steps.send(res)
+    except StopIteration as stop:
+        return stop.value
+
+async def _adrive_steps(handler, steps):
+    """_drive_steps()의 비동기 버전"""
+    try:
+        request = next(steps)
+        while True:
+            try:
+                res = await handler.ainference(**request)
+            except Exception as e:
+                request = steps.throw(e)
+            else:
+                request = steps.send(res)
+    except StopIteration as stop:
+        return stop.value
+
+def _memory_prereq_entry(cat, q):
+    """
+    테스트에 해당하는 memory prerequisite conversation 항목 (없으면 None)
+    
+    예: memory_0-customer-0 -> memory_prereq_0-customer-0 (memory_{scenario}.json의 id 인덱스로 조회)
+    """
+    scenario = q.get("scenario", "")
+    if "memory" not in cat or not scenario:
+        return None
+    test_id_parts = q["id"].split('-')
+    if len(test_id_parts) < 2:
+        return None
+    prereq_id = f"memory_prereq_{test_id_parts[0].replace('memory_', '')}-{test_id_parts[1]}-{test_id_parts[2] if len(test_id_parts) > 2 else '0'}"
+    return BFCLDataLoader().get_record(f"memory_prereq_conversation/memory_{scenario}.json", prereq_id)
+
+def _step_metrics(res, turn, step):
+    """inference 1회(스텝)의 계측 기록"""
+    return {
+        "turn": turn, "step": step,
+        "latency": res["latency"], "ttft": res.get("ttft"), "ttc": res.get("ttc"),
+        "stream_cut": res.get("stream_cut", False),
+        "prompt_tokens": res.get("prompt_tokens", 0), "cached_tokens": res.get("cached_tokens", 0),
+        "completion_tokens": res.get("completion_tokens", 0),
+        "retries": res.get("retries", 0), "backoff": res.get("backoff", 0), "cache_hit": res.get("cached", False),
+        "shared": res.get("shared", False)
+    }
+
+def _memory_prereq_steps(handler, executor, tools, prereq_turns, messages, all_model_calls, usage, steps):
+    """
+    memory prerequisite conversation을 순서대로 실행하는 제너레이터 (_test_case_steps에서 yield from으로 사용)
+    
+    케이스의 실행기로 메모리에 정보를 저장하고, 메시지 기록/호출 목록/토큰 사용량/스텝 계측은
+    케이스의 것에 그대로 누적합니다 (prerequisite 스텝은 turn -1).
+    """
+    for turn_idx, prereq_turn in enumerate(prereq_turns):
+        messages.extend(prereq_turn)
+        
+        # Prerequisite turn 실행 (메모리에 정보 저장)
+        try:
+            res = yield dict(
+                messages=[{"role": "system", "content": SYSTEM_PROMPT}] + messages,
+                tools=tools,
+                temperature=0,
+                force_tool=False
+            )
+            for kind in usage:
+                usage[kind] += res.get(f"{kind}_tokens", 0)
+            steps.append(_step_metrics(res, -1, turn_idx))  # turn -1 = prerequisite
+            
+            ast_out = handler.decode_ast(res)
+            if ast_out:
+                all_model_calls.extend(ast_out)
+                msg_dict = res["msg_obj"].model_dump()
+                
+                # arguments sanitization
+                if msg_dict.get("tool_calls"):
+                    for tc in msg_dict["tool_calls"]:
+                        if tc.get("function"):
+                            args = tc["function"].get("arguments", "")
+                            if not args or str(args).strip() in ["", "None", "null", "''", '""']:
+                                tc["function"]["arguments"] = "{}"
+                
+                messages.append(msg_dict)
+                
+                # 도구 실행
+                for i, call in enumerate(ast_out):
+                    feedback = executor.execute(call)
+                    call_id = res["msg_obj"].tool_calls[i].id if (res["msg_obj"].tool_calls and len(res["msg_obj"].tool_calls) > i) else f"call_prereq_{i}"
+                    messages.append({"role": "tool", "tool_call_id": call_id, "content": feedback})
+            else:
+                messages.append({"role": "assistant", "content": res["content"]})
+        except Exception as e:
+            # Prerequisite turn 실패해도 계속 진행 (일부 정보는 메모리에 저장되었을 수 있음)
+            print(f"⚠️ Prerequisite turn failed: {str(e)}")
+            pass
+
+def _test_case_steps(handler, executor, checker, cat, q, a, max_steps=3):
+    """
+    테스트 케이스 진행 제너레이터
+    
+    inference 요청 파라미터를 yield하고, 호출 측(동기/비동기 드라이버)이 send()로 결과를 돌려줍니다.
+    inference 예외는 throw()로 전달되며, 최종 결과 딕셔너리는 StopIteration.value로 반환됩니다.
+    Memory 카테고리는 테스트에 해당하는 prerequisite conversation을 먼저 실행합니다.
+    """
+    test_id = q['id']
+    tools = BFCLDataLoader().get_functions(cat, q)
+    gt = a['ground_truth']
+    
     # 멀티턴 질문 구조화 (유연한 대응)
     raw_question = q['question']
     if isinstance(raw_question[0], list):
@@ -772,47 +893,18 @@ Your goal is to successfully call the right functions with the right parameters.
     all_model_calls = []
     final_res = None
     final_content = ""
+    # 케이스 전체(모든 턴/스텝)의 토큰 사용량 (prefix 캐시 적중은 cached로 별도 집계)
+    usage = {"prompt": 0, "cached": 0, "completion": 0}
+    # 스텝별 계측 (inference 1회 = 1 스텝)
+    steps = []
     
-    # Memory 카테고리: prerequisite conversation 먼저 실행
-    if prereq_turns:
-        for prereq_turn in prereq_turns:
-            messages.extend(prereq_turn)
-            
-            # Prerequisite turn 실행 (메모리에 정보 저장)
-            try:
-                res = handler.inference(
-                    messages=[{"role": "system", "content": SYSTEM_PROMPT}] + messages,
-                    tools=tools,
-                    temperature=0,
-                    force_tool=False
-                )
-                
-                ast_out = handler.decode_ast(res)
-                if ast_out:
-                    all_model_calls.extend(ast_out)
-                    msg_dict = res["msg_obj"].model_dump()
-                    
-                    # arguments sanitization
-                    if msg_dict.get("tool_calls"):
-                        for tc in msg_dict["tool_calls"]:
-                            if tc.get("function"):
-                                args = tc["function"].get("arguments", "")
-                                if not args or str(args).strip() in ["", "None", "null", "''", '""']:
-                                    tc["function"]["arguments"] = "{}"
-                    
-                    messages.append(msg_dict)
-                    
-                    # 도구 실행
-                    for i, call in enumerate(ast_out):
-                        feedback = executor.execute(call)
-                        call_id = res["msg_obj"].tool_calls[i].id if (res["msg_obj"].tool_calls and len(res["msg_obj"].tool_calls) > i) else f"call_prereq_{i}"
-                        messages.append({"role": "tool", "tool_call_id": call_id, "content": feedback})
-                else:
-                    messages.append({"role": "assistant", "content": res["content"]})
-            except Exception as e:
-                # Prerequisite turn 실패해도 계속 진행 (일부 정보는 메모리에 저장되었을 수 있음)
-                print(f"⚠️ Prerequisite turn failed: {str(e)}")
-                pass
+    # Memory 카테고리: prerequisite conversation 먼저 실행 (토큰 사용량/스텝 계측도 이 케이스에 포함)
+    prereq = _memory_prereq_entry(cat, q)
+    if prereq:
+        yield from _memory_prereq_steps(handler, executor, tools, prereq.get("question", []),
+                                        messages, all_model_calls, usage, steps)
+    # TTFT/TTC는 prerequisite 이후 케이스 자체의 첫 스텝 기준
+    first_step = len(steps)
 
     for turn_idx, turn_msgs in enumerate(user_turns):
         messages.extend(turn_msgs)
@@ -831,15 +923,20 @@ Your goal is to successfully call the right functions with the right parameters.
             # force_tool_call: Single-turn 카테고리만 True (agentic은 False)
             force_tool_call = not is_multi_turn and not is_agentic and not is_relevance_check
             
-            res = handler.inference(
+            res = yield dict(
                 messages=[{"role": "system", "content": SYSTEM_PROMPT}] + messages,
                 tools=tools,
                 temperature=0,
-                force_tool=force_tool_call
+                force_tool=force_tool_call,
+                # 호출 1개만 채점하는 카테고리는 첫 tool call이 완성되면 생성을 더 기다리지 않음 (스트리밍 모드)
+                stop_at_tool_call=cat in SINGLE_CALL_CATEGORIES
             )
             
             final_res = res
             final_content = res["content"]
+            for kind in usage:
+                usage[kind] += res.get(f"{kind}_tokens", 0)
+            steps.append(_step_metrics(res, turn_idx, step))
             ast_out = handler.decode_ast(res)
 
             if ast_out:
@@ -868,7 +965,7 @@ Your goal is to successfully call the right functions with the right parameters.
                 
                 # 카테고리별 루프 전략
                 # Simple/Single-turn 카테고리: 첫 번째 도구 호출 후 종료
-                if cat in ["simple_python", "simple_javascript", "simple_java", "live_simple", "web_search"]:
+                if cat in SINGLE_CALL_CATEGORIES or cat == "web_search":
                     break
                 # Multiple/Parallel: 여러 도구를 한 번에 호출 후 종료 (Live 포함)
                 elif cat in ["multiple", "parallel", "parallel_multiple", 
@@ -896,132 +993,724 @@ Your goal is to successfully call the right functions with the right parameters.
         "Thinking": final_res["thinking"] if final_res else "N/A",
         "Model_Calls": json.dumps(all_model_calls, ensure_ascii=False),
         "Ground_Truth": json.dumps(gt, ensure_ascii=False),
-        "Latency": final_res["latency"] if final_res else 0
+        "Latency": final_res["latency"] if final_res else 0,
+        "Prompt_Tokens": usage["prompt"],
+        "Cached_Tokens": usage["cached"],
+        "Completion_Tokens": usage["completion"],
+        # 스텝 계측: 케이스 전체 시간(모든 스텝 합), 첫 스텝 TTFT/time-to-tool-call, 재시도/백오프 합계, 스텝별 상세(JSON)
+        "Total_Latency": round(sum(st["latency"] for st in steps), 2),
+        "TTFT": steps[first_step]["ttft"] if len(steps) > first_step else None,
+        "TTC": steps[first_step]["ttc"] if len(steps) > first_step else None,
+        "Retries": sum(st["retries"] for st in steps),
+        "Backoff": round(sum(st["backoff"] for st in steps), 2),
+        "Steps": json.dumps(steps, ensure_ascii=False)
     }
 
-def run_benchmark(config):
+async def _run_cases_async(handler, checker, cases, concurrency, max_steps, on_result=None, gate=None, label="",
+                           executor_mode="mock"):
     """
-    벤치마크 실행 함수
+    (cat, q, a) 케이스 목록을 bounded worker pool로 동시 실행
     
+    각 케이스 내부의 턴/스텝은 순서대로 실행되며, 결과는 입력 순서대로 반환됩니다.
+    실패한 케이스의 결과는 None입니다. on_result는 케이스가 끝날 때마다 호출됩니다 (저널 기록용).
+    gate(core.scheduler.CaseGate)가 주어지면 전역 동시 실행 슬롯을 공유하고,
+    조기 중단 상태가 되면 남은 케이스를 꺼내지 않습니다.
+    """
+    gate = gate or CaseGate()
+    results = [None] * len(cases)
+    queue = asyncio.Queue()
+    for idx in range(len(cases)):
+        queue.put_nowait(idx)
+    done = 0
+    
+    async def worker():
+        nonlocal done
+        while not gate.aborted:
+            try:
+                idx = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            cat, q, a = cases[idx]
+            executor = _make_executor(cat, q, executor_mode)
+            await gate.aacquire()
+            try:
+                result = await aprocess_test_case(handler, executor, checker, cat, q, a, max_steps=max_steps)
+                results[idx] = result
+                gate.record()
+                if on_result:
+                    on_result(result)
+                status = "✅" if result["Result"] == "PASS" else "❌"
+                line = f"{status} ({result['Latency']:.0f}ms)"
+            except Exception as e:
+                gate.record(error=e)
+                line = f"❌ ERROR: {str(e)[:50]}"
+                traceback.print_exc()
+            finally:
+                executor.close()
+                gate.release()
+            done += 1
+            print(f"  {label}[{done}/{len(cases)}] {cat}: {q['id'][:30]}... {line}")
+    
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(cases)))))
+    return results
+
+def run_benchmark(config, gate=None):
+    """
+    벤치마크 실행 함수
+
     Args:
         config (dict): 벤치마크 설정 딕셔너리
             - model_name: 모델 이름
             - categories: 테스트할 카테고리 리스트
             - samples_per_cat: 카테고리당 샘플 수
             - max_agent_steps: 최대 에이전트 스텝
-            - rate_limit_delay: API 호출 간 대기 시간
+            - rate_limit_delay: 카테고리 간 추가 대기 시간
+            - max_rps: 초당 최대 요청 수 상한 (공유 레이트 리미터)
+            - concurrency: 동시 실행 케이스 수 (1이면 직렬 실행)
+            - cache: inference 캐시 모드 (off, read, write, readwrite)
+            - resume: 저널(results/journal/)에 기록된 완료 케이스 건너뛰기
+            - rate_limit_key: 레이트 리미터 버킷 키 (None이면 base_url 단위로 공유)
+            - max_consecutive_errors: 연속 에러 시 조기 중단 기준 (None이면 비활성화)
+            - log_label: 동시 실행 진행 로그 앞에 붙일 표시 (여러 모델 병렬 실행 시 구분용)
+            - results_format: 결과 파일 형식 (auto, parquet, csv)
+            - excel_report: Excel 리포트 생성 여부 (백그라운드 생성)
+            - prompt_cache: provider 프롬프트(prefix) 캐시 모드
+            - stream: 스트리밍 요청 모드 (스텝별 TTFT 측정)
+            - stream_cutoff: 스트리밍 모드에서 단일 호출 카테고리의 첫 tool call 완성 시 스트림 종료
+            - executor: 도구 실행기 (mock, real - 멀티턴 케이스를 실제 백엔드 인스턴스 풀로 실행)
+            - warehouse_path: 실행 결과 누적 저장소 경로 (main.py query / compare로 조회, None이면 저장 안 함)
+            - shard: (index, count) - 전체 케이스 중 이 샤드 몫만 실행 (merge_shard_results()로 병합)
+            - queue_path: 공유 작업 큐 경로 - 큐에서 작업을 임대해 실행하는 워커 모드
+              (결과 병합/리포트는 run_queue_coordinator()가 담당)
+            - target_ci: 신뢰구간 모드 - 카테고리 95% CI 폭(%p)이 이 값 이하가 되면 해당 카테고리 종료
+            - ci_min_samples / sampling_seed: 신뢰구간 모드의 최소 샘플 수 / 층화 무작위 순서 seed
+            - dedup: 첫 스텝 요청이 같은 케이스끼리 요청을 1회만 보내고 응답 공유
+            - base_url: OpenAI 호환 엔드포인트 (None이면 OpenRouter)
+            - local_server: 로컬 stand-in 서버 실행 여부 (저널/결과 파일에 _LOCAL 태그, 저장소 기록 생략)
+            - batch / batch_poll_interval: 단일 스텝 카테고리를 Batch API로 실행 / 완료 확인 주기(초)
+        gate (CaseGate): 여러 모델이 공유하는 전역 동시 실행 슬롯 (run_multi_models.py에서 사용)
+
+    Returns:
+        리포트(또는 결과 파일) 경로, 큐 워커 모드이면 None
+
+    Raises:
+        ModelAborted: 연속 에러로 조기 중단된 경우 (완료된 케이스는 저널에 남아 --resume 가능)
     """
     # API 키 확인
     load_dotenv()
     api_key = os.getenv("OPENROUTER_API_KEY")
+    if config.get("base_url"):
+        # OpenRouter 외 OpenAI 호환 엔드포인트 (OpenAI Batch API, 로컬 stand-in 서버 등)
+        api_key = os.getenv("OPENAI_API_KEY") or api_key or "local"
     if not api_key:
         raise ValueError("OPENROUTER_API_KEY가 설정되지 않았습니다. .env 파일을 확인해주세요.")
-    
-    loader = BFCLDataLoader()
-    handler = ModelHandler(api_key=api_key, model_name=config["model_name"])
+
+    cache = None
+    if config.get("cache", "off") != "off":
+        cache = InferenceCache(
+            path=config.get("cache_path", DEFAULT_CONFIG["cache_path"]),
+            mode=config["cache"],
+            max_bytes=int(config.get("cache_max_mb", DEFAULT_CONFIG["cache_max_mb"]) * 1024 * 1024)
+        )
+    # 공유 HTTP 연결 풀 크기를 동시 실행 수에 맞춤 (핸들러 클라이언트 생성 전에 설정)
+    configure_http_pool(concurrency=config.get("concurrency", 1), http2=config.get("http2"))
+    handler = ModelHandler(
+        api_key=api_key, model_name=config["model_name"], base_url=config.get("base_url") or DEFAULT_BASE_URL,
+        max_rps=config.get("max_rps"), cache=cache,
+        rate_limit_key=config.get("rate_limit_key"), prompt_cache=config.get("prompt_cache", False),
+        stream=config.get("stream", False), stream_cutoff=config.get("stream_cutoff", True)
+    )
+    if gate is None:
+        gate = CaseGate()
+    if gate.max_consecutive_errors is None:
+        gate.max_consecutive_errors = config.get("max_consecutive_errors")
+    if config.get("dedup", True):
+        handler.request_plan = RequestPlan()
     checker = BFCLChecker()
-    
-    all_results = []
+    shard = config.get("shard")
+    queue = WorkQueue(config["queue_path"]) if config.get("queue_path") else None
+
     total_samples = len(config["categories"]) * config["samples_per_cat"]
-    
+
     print("=" * 80)
     print(f"🚀 BFCL 벤치마크 시작")
     print("=" * 80)
     print(f"📋 모델: {config['model_name']}")
     print(f"📂 카테고리: {', '.join(config['categories'])}")
     print(f"📊 카테고리당 샘플: {config['samples_per_cat']}개")
-    print(f"🎯 총 예상 테스트: {total_samples}개")
+    if not config.get("target_ci"):
+        print(f"🎯 총 예상 테스트: {total_samples}개")
+    if shard:
+        print(f"🧩 샤드: {shard[0]}/{shard[1]} (케이스 순서 기준 라운드 로빈 분할)")
+    if queue:
+        print(f"📬 작업 큐 워커: {queue.path} (worker: {queue.worker_id})")
+    if config.get("target_ci"):
+        print(f"🎯 신뢰구간 모드: 95% CI 폭 {config['target_ci']}%p 이하가 되면 카테고리 종료 "
+              f"(최소 {config.get('ci_min_samples', 10)}개, 층화 무작위 순서, seed={config.get('sampling_seed', 0)})")
+    if cache:
+        print(f"🗄️  Inference 캐시: {cache.mode} ({cache.path})")
+    if handler.prompt_cache:
+        print(f"🧩 프롬프트 캐시 모드: system + tools prefix 고정")
+    if config.get("batch"):
+        print(f"📦 배치 모드: 단일 스텝 카테고리는 Batch API로 요청 ({handler.base_url})")
+    if handler.stream:
+        cutoff = " (단일 호출 카테고리는 첫 tool call 완성 시 종료)" if handler.stream_cutoff else ""
+        print(f"📡 스트리밍 모드: 스텝별 TTFT 측정{cutoff}")
+    if config.get("executor", "mock") == "real":
+        print(f"🧰 실행기: 멀티턴 케이스를 실제 백엔드(func_source_code) 인스턴스 풀로 실행")
     print("=" * 80)
 
     start_time = time.time()
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    os.makedirs("results", exist_ok=True)
+
+    # 케이스 단위 저널 (크래시/중단 후 --resume으로 이어서 실행)
+    # 샤드/큐 워커는 각자 별도 저널에 기록 (여러 프로세스가 같은 파일에 쓰지 않도록)
+    suffix = ""
+    if shard:
+        suffix = f"_shard{shard[0]}of{shard[1]}"
+    elif queue:
+        suffix = f"_worker_{queue.worker_id}"
+    journal_path = config.get("journal_path") or _journal_path(config, suffix)
+    journal = ResultJournal(journal_path, resume=config.get("resume", False))
+    if config.get("resume"):
+        print(f"♻️  이어서 실행: {journal_path} (완료된 케이스 {journal.completed_count(config['model_name'])}개 건너뜀)")
+
+    # 전체 케이스 로드 (리포트 순서 = 카테고리 순서 × 데이터셋 순서, 신뢰구간 모드는 실행하면서 추출)
+    cases = [] if config.get("target_ci") else _load_cases(config)
+    if shard:
+        cases = [case for position, case in enumerate(cases) if in_shard(position, shard)]
+    pending = [(cat, q, a) for cat, q, a in cases if not journal.is_completed(config["model_name"], cat, q['id'])]
+
+    def on_result(result):
+        journal.append(config["model_name"], result)
+        if queue:
+            queue.complete(config["model_name"], result["Category"], result["ID"], result)
+
+    try:
+        if queue:
+            _run_queue_worker(handler, checker, queue, cases, config, gate, on_result)
+        elif config.get("target_ci"):
+            cases = _run_adaptive(handler, checker, journal, config, gate, on_result)
+        else:
+            if config.get("batch"):
+                pending = _run_batch(handler, checker, pending, config, gate, on_result)
+            _execute_cases(handler, checker, pending, config, gate, on_result)
+    finally:
+        journal.close()
+        if queue:
+            queue.close()
+        if handler.request_plan is not None and handler.request_plan.stats["planned"]:
+            print(f"\n🔁 중복 요청 공유: {handler.request_plan.summary()}")
+        if cache:
+            print(f"\n🗄️  캐시 통계: {cache.summary()}")
+            cache.close()
+
+    # 연속 에러로 조기 중단된 경우 (완료된 케이스는 저널에 남음)
+    if gate.aborted:
+        print(f"\n⛔ {config['model_name']} 조기 중단: {gate.abort_reason}")
+        gate.check()
+
+    if queue:
+        print(f"\n📬 큐 워커 종료: 결과는 작업 큐에 기록됨 (병합/리포트: python main.py --queue {config['queue_path']} --coordinator)")
+        return None
+
+    # 저널에서 결과 수집 (입력 순서대로 → 직렬/동시/재개 실행 모두 동일한 리포트)
+    all_results = []
+    for cat, q, _ in cases:
+        result = journal.get(config["model_name"], cat, q['id'])
+        if result is not None:
+            all_results.append(result)
+
+    return _report_results(config, all_results, start_time, journal_path=journal_path, suffix=suffix)
+
+def _mode_tag(config):
+    """결과/저널 파일 이름의 실행 모드 태그 (stand-in 서버 실행은 실제 실행과 섞이지 않도록 _LOCAL)"""
     mode_tag = "QUICK" if config["samples_per_cat"] <= 2 else "FULL"
+    return mode_tag + "_LOCAL" if config.get("local_server") else mode_tag
+
+def _journal_path(config, suffix=""):
+    mode_tag = _mode_tag(config)
     model_short = _format_model_name_for_filename(config["model_name"])
-    os.makedirs("results", exist_ok=True)
-    saved_files = []  # 개별 파일 경로 추적 (나중에 삭제용)
-    
+    return f"results/journal/BFCL_{mode_tag}_{model_short}{suffix}.jsonl"
+
+def _load_cases(config):
+    """설정의 카테고리/샘플 수에 해당하는 (cat, q, a) 목록 (카테고리 순서 × 데이터셋 순서)"""
+    loader = BFCLDataLoader()
+    cases = []
     for cat_idx, cat in enumerate(config["categories"], 1):
-        cat_results = []
-        print(f"\n[{cat_idx}/{len(config['categories'])}] 📂 Category: {cat}")
         questions, answers = loader.load_dataset(cat, limit=config["samples_per_cat"])
-        
         if not questions:
-            print(f"  ⚠️  데이터 없음, 스킵")
+            print(f"[{cat_idx}/{len(config['categories'])}] 📂 Category: {cat} ⚠️  데이터 없음, 스킵")
             continue
+        cases.extend((cat, q, a) for q, a in zip(questions, answers))
+    return cases
 
-        for idx, (q, a) in enumerate(zip(questions, answers), 1):
-            print(f"  [{idx}/{len(questions)}] Testing: {q['id'][:30]}...", end=" ")
-            executor = BFCLMockExecutor(initial_config=q.get('initial_config'))
-            
+def _execute_cases(handler, checker, pending, config, gate, on_result):
+    """케이스 목록 실행 (concurrency > 1이면 asyncio worker pool, 아니면 카테고리별 직렬 실행)"""
+    concurrency = config.get("concurrency", 1)
+    if handler.request_plan is not None:
+        _plan_requests(handler, pending, handler.request_plan)
+    if concurrency > 1:
+        # 동시 실행 모드: 모든 카테고리의 케이스를 하나의 worker pool에서 실행
+        print(f"\n⚡ 동시 실행 모드: {len(pending)}개 케이스, concurrency={concurrency}")
+        asyncio.run(_run_cases_async(
+            handler, checker, pending, concurrency, config["max_agent_steps"],
+            on_result=on_result, gate=gate, label=config.get("log_label", ""),
+            executor_mode=config.get("executor", "mock")
+        ))
+        return
+
+    categories = [cat for cat in config["categories"] if any(c == cat for c, _, _ in pending)]
+    for cat_idx, cat in enumerate(categories, 1):
+        cat_cases = [(q, a) for c, q, a in pending if c == cat]
+        print(f"\n[{cat_idx}/{len(categories)}] 📂 Category: {cat}")
+
+        for idx, (q, a) in enumerate(cat_cases, 1):
+            if gate.aborted:
+                break
+            print(f"  [{idx}/{len(cat_cases)}] Testing: {q['id'][:30]}...", end=" ")
+            executor = _make_executor(cat, q, config.get("executor", "mock"))
+
+            gate.acquire()
             try:
                 result = process_test_case(
-                    handler, executor, checker, cat, q, a, 
+                    handler, executor, checker, cat, q, a,
                     max_steps=config["max_agent_steps"]
                 )
-                all_results.append(result)
-                cat_results.append(result)
+                gate.record()
+                on_result(result)
                 status = "✅" if result["Result"] == "PASS" else "❌"
                 print(f"{status} ({result['Latency']:.0f}ms)")
             except Exception as e:
+                gate.record(error=e)
                 print(f"❌ ERROR: {str(e)[:50]}")
                 print(f"   Full traceback:")
                 traceback.print_exc()
                 continue
-        
-        # 카테고리별 결과 저장
-        if cat_results:
-            cat_df = pd.DataFrame(cat_results)
-            report_path = f"results/BFCL_{mode_tag}_{model_short}_{cat}_Report_{timestamp}.xlsx"
-            ExcelReporter.save(cat_df, report_path, config["model_name"], config)
-            saved_files.append(report_path)  # 나중에 삭제하기 위해 경로 저장
-            
-            cat_pass = len(cat_df[cat_df['Result'] == 'PASS'])
-            cat_total = len(cat_df)
-            cat_acc = (cat_pass / cat_total * 100) if cat_total > 0 else 0
-            print(f"  💾 저장됨: {report_path} ({cat_pass}/{cat_total}, {cat_acc:.1f}%)")
-        
-        # 레이트 리밋 방지 대기 (마지막 카테고리는 제외)
-        if cat_idx < len(config["categories"]):
+            finally:
+                executor.close()
+                gate.release()
+
+        if gate.aborted:
+            break
+
+        # 추가 대기 (마지막 카테고리는 제외, 요청 페이싱은 공유 레이트 리미터가 담당)
+        if cat_idx < len(categories) and config["rate_limit_delay"] > 0:
             print(f"  ⏳ {config['rate_limit_delay']}초 대기 중...")
             time.sleep(config["rate_limit_delay"])
 
+def _run_batch(handler, checker, pending, config, gate, on_result):
+    """
+    배치 모드: 단일 스텝 카테고리(BATCH_CATEGORIES)의 대기 케이스를 Batch API로 한 번에 요청하고 채점
+
+    각 케이스의 첫 요청을 배치 라인으로 변환하여 (같은 요청은 1줄로 합침) 제출하고, 완료 후 응답을
+    케이스 제너레이터에 전달하여 일반 실행과 같은 decode_ast / BFCLChecker 경로로 채점합니다.
+    inference 캐시에 있는 요청은 배치에 넣지 않습니다.
+
+    Returns:
+        배치 대상이 아닌 나머지 케이스 (일반 실행 경로로 실행)
+    """
+    batchable = [case for case in pending if case[0] in BATCH_CATEGORIES]
+    rest = [case for case in pending if case[0] not in BATCH_CATEGORIES]
+    if not batchable:
+        return rest
+
+    runs, lines = [], {}
+    for cat, q, a in batchable:
+        executor = _make_executor(cat, q, "mock")
+        steps = _test_case_steps(handler, executor, checker, cat, q, a, max_steps=config["max_agent_steps"])
+        request = next(steps)
+        custom_id = handler.request_fingerprint(**request) or f"{cat}:{q['id']}"
+        line, context, cached = handler.batch_request(custom_id, **request)
+        if line is not None:
+            lines.setdefault(custom_id, line)
+        runs.append((cat, q, executor, steps, custom_id, context, cached))
+    print(f"\n📦 배치 모드: {len(batchable)}개 케이스 → 배치 요청 {len(lines)}개 "
+          f"(캐시 {sum(run[-1] is not None for run in runs)}개, 중복 {len(batchable) - len(lines)}개 제외)")
+
+    outcomes = {}
+    if lines:
+        runner = BatchRunner(handler.client, poll_interval=config.get("batch_poll_interval", 10.0))
+        outcomes = runner.run(list(lines.values()))
+
+    for idx, (cat, q, executor, steps, custom_id, context, cached) in enumerate(runs, 1):
+        print(f"  [{idx}/{len(runs)}] {cat}: {q['id'][:30]}...", end=" ")
+        try:
+            res = cached
+            if res is None:
+                body, error = outcomes[custom_id]
+                if error is not None:
+                    raise Exception(f"Inference Failed: {error}")
+                res = handler.batch_result(body, context)
+            result = _drive_steps(handler, steps, first=res)
+            gate.record()
+            on_result(result)
+            print("✅" if result["Result"] == "PASS" else "❌")
+        except Exception as e:
+            steps.close()
+            gate.record(error=e)
+            print(f"❌ ERROR: {str(e)[:50]}")
+        finally:
+            executor.close()
+    return rest
+
+def _plan_requests(handler, cases, plan):
+    """
+    중복 요청 계획: 각 케이스의 첫 스텝 요청 지문을 계산하여 RequestPlan에 등록
+
+    같은 프롬프트/도구 문서를 가진 케이스(예: live_* FuncDoc 공유, web_search 변형)의 첫 요청은
+    실행 중 1회만 보내고 응답을 공유합니다. prerequisite conversation이 있는 Memory 케이스는 첫 요청이 달라 제외합니다.
+    """
+    before = plan.planned_savings
+    for cat, q, a in cases:
+        if _memory_prereq_entry(cat, q) is not None:
+            continue
+        # 첫 요청은 실행기/채점기를 사용하기 전에 yield됨
+        steps = _test_case_steps(handler, None, None, cat, q, a)
+        try:
+            plan.add(handler.request_fingerprint(**next(steps)))
+        finally:
+            steps.close()
+    if plan.planned_savings > before:
+        print(f"🔁 중복 요청 계획: {len(cases)}개 케이스 중 {plan.planned_savings - before}개는 다른 케이스의 첫 응답을 공유")
+
+def _run_adaptive(handler, checker, journal, config, gate, on_result):
+    """
+    신뢰구간 모드 (순차 샘플링)
+
+    카테고리별로 케이스를 하위 그룹 층화 무작위 순서로 정렬한 뒤 앞에서부터 배치 단위로 실행하고,
+    배치가 끝날 때마다 카테고리의 95% Wilson 신뢰구간 폭이 target_ci(%p) 이하이면 해당 카테고리를 종료합니다.
+    다음 배치 크기는 현재 정확도로 추정한 필요 표본 수만큼 (최대 현재 표본 수의 2배까지) 늘립니다.
+
+    Returns:
+        실행한 (cat, q, a) 리스트 (카테고리 순서 × 추출 순서, 리포트 순서)
+    """
+    model = config["model_name"]
+    target = config["target_ci"] / 100
+    min_samples = config.get("ci_min_samples", 10)
+    min_batch = max(config.get("concurrency", 1), 1)
+    loader = BFCLDataLoader()
+
+    orders, drawn = {}, {}
+    for cat in config["categories"]:
+        questions, answers = loader.load_dataset(cat)
+        if not questions:
+            print(f"📂 Category: {cat} ⚠️  데이터 없음, 스킵")
+            continue
+        seed = f"{config.get('sampling_seed', 0)}:{cat}"
+        orders[cat] = stratified_order(list(zip(questions, answers)), seed=seed)[:config["samples_per_cat"]]
+        drawn[cat] = 0
+
+    def tally(cat):
+        results = [journal.get(model, cat, q['id']) for q, _ in orders[cat][:drawn[cat]]]
+        results = [r for r in results if r is not None]
+        return sum(r["Result"] == "PASS" for r in results), len(results)
+
+    active = list(orders)
+    while active and not gate.aborted:
+        batch = []
+        for cat in active:
+            done = drawn[cat]
+            if done < min_samples:
+                size = min_samples - done
+            else:
+                passed, total = tally(cat)
+                needed = required_samples(passed / total if total else 0.5, target) - total
+                size = max(min_batch, min(needed, done))
+            batch.extend((cat, q, a) for q, a in orders[cat][done:done + size])
+            drawn[cat] = min(done + size, len(orders[cat]))
+
+        pending = [(cat, q, a) for cat, q, a in batch if not journal.is_completed(model, cat, q['id'])]
+        _execute_cases(handler, checker, pending, config, gate, on_result)
+
+        for cat in list(active):
+            passed, total = tally(cat)
+            low, high = wilson_interval(passed, total)
+            width = (high - low) * 100
+            if total >= min_samples and width <= config["target_ci"]:
+                reason = f"CI 폭 {width:.1f}%p ≤ {config['target_ci']}%p"
+            elif drawn[cat] >= len(orders[cat]):
+                reason = f"케이스 소진 (CI 폭 {width:.1f}%p)"
+            else:
+                continue
+            active.remove(cat)
+            print(f"  🎯 {cat}: {passed}/{total} ({low * 100:.1f}–{high * 100:.1f}%) 종료 - {reason} "
+                  f"(전체 {len(orders[cat])}개 중 {drawn[cat]}개 실행)")
+
+    return [(cat, q, a) for cat, order in orders.items() for q, a in order[:drawn[cat]]]
+
+def _run_queue_worker(handler, checker, queue, cases, config, gate, on_result, poll_interval=5.0):
+    """
+    작업 큐 워커 루프
+
+    작업을 등록(이미 있으면 유지)한 뒤 concurrency의 2배씩 임대해 실행하고, 완료하지 못한 작업은 반납합니다.
+    대기 작업이 없더라도 다른 워커가 임대 중인 작업이 남아 있으면 기한 만료 회수를 위해 기다립니다.
+    """
+    model = config["model_name"]
+    by_key = {(cat, str(q['id'])): (cat, q, a) for cat, q, a in cases}
+    added = queue.enqueue(model, list(by_key))
+    print(f"📬 작업 등록: {added}개 신규 (큐 상태: {queue.counts(model)})")
+    queue.start_heartbeat()
+    batch_size = max(config.get("concurrency", 1), 1) * 2
+
+    while not gate.aborted:
+        keys = queue.lease(model, batch_size)
+        if not keys:
+            counts = queue.counts(model)
+            if not counts["leased"]:
+                break
+            time.sleep(poll_interval)
+            continue
+        # 다른 설정의 워커가 등록한 작업은 이 워커의 케이스 목록에서 다시 찾음
+        batch = [by_key.get(key) or _find_case(config, *key) for key in keys]
+        try:
+            _execute_cases(handler, checker, [case for case in batch if case], config, gate, on_result)
+        finally:
+            # 실행 에러/조기 중단으로 완료되지 않은 작업 반납 (완료된 작업은 영향 없음)
+            queue.release(model, keys)
+    print(f"📬 큐 상태: {queue.counts(model)}")
+
+def _find_case(config, cat, test_id):
+    """(cat, id)에 해당하는 (cat, q, a) 조회 (없으면 None)"""
+    loader = BFCLDataLoader()
+    q, a = loader.get_case(cat, test_id)
+    return (cat, q, a) if q is not None else None
+
+def run_queue_coordinator(config, poll_interval=5.0):
+    """
+    작업 큐 코디네이터: 작업 등록 → 모든 작업이 끝날 때까지 진행 상황 출력 → 결과 병합 및 리포트
+
+    결과는 작업 등록 순서(seq)로 병합되므로 어떤 워커가 어떤 순서로 실행했든 같은 리포트가 만들어집니다.
+    이미 모든 작업이 끝난 큐에 다시 실행하면 병합/리포트만 수행합니다.
+    """
+    model = config["model_name"]
+    queue = WorkQueue(config["queue_path"], worker_id="coordinator")
+    start_time = time.time()
+    try:
+        cases = _load_cases(config)
+        added = queue.enqueue(model, [(cat, str(q['id'])) for cat, q, _ in cases])
+        print("=" * 80)
+        print(f"📬 작업 큐 코디네이터: {queue.path}")
+        print(f"📋 모델: {model} / 작업 {len(cases)}개 (신규 등록 {added}개)")
+        print(f"💡 워커 실행: python main.py --queue {config['queue_path']} --model \"{model}\" (같은 카테고리/샘플 설정)")
+        print("=" * 80)
+
+        last = None
+        while True:
+            counts = queue.counts(model)
+            if counts != last:
+                print(f"  ⏳ {datetime.now().strftime('%H:%M:%S')} 완료 {counts['done']} / 실행 중 {counts['leased']} "
+                      f"/ 대기 {counts['pending']} / 실패 {counts['failed']}")
+                last = counts
+            if not counts["pending"] and not counts["leased"]:
+                break
+            time.sleep(poll_interval)
+        all_results = queue.results(model)
+    finally:
+        queue.close()
+    return _report_results(config, all_results, start_time, suffix="_QUEUE")
+
+def merge_shard_results(config, shard_count):
+    """--shard i/N으로 실행한 N개 샤드 저널을 케이스 순서대로 병합하여 리포트 생성"""
+    start_time = time.time()
+    journals = {}
+    for index in range(shard_count):
+        path = _journal_path(config, f"_shard{index}of{shard_count}")
+        if not os.path.exists(path):
+            print(f"⚠️ 샤드 저널 없음: {path}")
+            continue
+        for result in ResultJournal.load_results(path, config["model_name"]):
+            journals.setdefault((result["Category"], str(result["ID"])), result)
+
+    all_results = [journals[(cat, str(q['id']))] for cat, q, _ in _load_cases(config) if (cat, str(q['id'])) in journals]
+    print(f"🧩 샤드 {shard_count}개 병합: 결과 {len(all_results)}개")
+    return _report_results(config, all_results, start_time, suffix="_MERGED")
+
+def _report_results(config, all_results, start_time, journal_path=None, suffix=""):
+    """결과 통계 출력, 결과 파일/Excel 리포트/저장소 기록 후 리포트 경로 반환"""
+    timestamp = datetime.fromtimestamp(start_time).strftime("%Y%m%d_%H%M%S")
+    mode_tag = _mode_tag(config)
+    model_short = _format_model_name_for_filename(config["model_name"]) + suffix
+
     # 전체 결과 통계
     if not all_results:
         print("\n❌ 결과가 없습니다. 벤치마크를 확인해주세요.")
         return None
-    
+
     elapsed = time.time() - start_time
-    df = pd.DataFrame(all_results)
-    pass_count = len(df[df['Result'] == 'PASS'])
-    total_count = len(df)
+    scores = BFCLScorer.calculate_scores(all_results)
+    pass_count = sum(data["pass"] for data in scores["by_category"].values())
+    total_count = len(all_results)
     accuracy = (pass_count / total_count * 100) if total_count > 0 else 0
-    
-    # 모든 카테고리가 완료되면 통합 파일 생성 및 개별 파일 삭제
-    final_report_path = f"results/BFCL_{mode_tag}_{model_short}_Report_{timestamp}.xlsx"
-    ExcelReporter.save(df, final_report_path, config["model_name"], config)
-    
-    # 개별 카테고리 파일 삭제
-    for file_path in saved_files:
+
+    performance = BFCLScorer.calculate_performance(all_results)
+
+    print()
+    for cat, data in scores["by_category"].items():
+        perf = performance[cat]
+        print(f"  📂 {cat}: {data['pass']}/{data['total']} ({data['accuracy']:.1f}%, "
+              f"95% CI {data['ci_low']:.1f}–{data['ci_high']:.1f}%) "
+              f"| latency p50 {perf['latency_p50']:.0f}ms, p95 {perf['latency_p95']:.0f}ms "
+              f"| 총 {perf['total_time'] / 1000:.1f}초 ({perf['time_share']:.1f}%)"
+              + (f" | TTFT p50 {perf['ttft_p50']:.0f}ms" if perf['ttft_p50'] is not None else "")
+              + (f", tool call p50 {perf['ttc_p50']:.0f}ms" if perf['ttc_p50'] is not None else ""))
+
+    # 컬럼 기반 결과 파일 저장 → Excel 리포트는 이 파일을 입력으로 백그라운드에서 생성
+    results_path = write_results_table(
+        all_results, f"results/BFCL_{mode_tag}_{model_short}_Results_{timestamp}",
+        fmt=config.get("results_format", "auto")
+    )
+    final_report_path = results_path
+    if config.get("excel_report", True):
+        final_report_path = f"results/BFCL_{mode_tag}_{model_short}_Report_{timestamp}.xlsx"
+        submit_report(ExcelReporter.save_from_table, results_path, final_report_path, config["model_name"], config)
+
+    run_id = None
+    # stand-in 서버의 합성 응답은 모델의 실제 실행 기록으로 남기지 않음 (compare/최근 실행 조회 대상 제외)
+    if config.get("warehouse_path") and not config.get("local_server"):
+        run_id = f"{timestamp}_{model_short}"
+        warehouse = ResultWarehouse(config["warehouse_path"])
         try:
-            os.remove(file_path)
-        except Exception as e:
-            print(f"⚠️  파일 삭제 실패: {file_path} - {str(e)}")
-    
+            warehouse.add_run({
+                "run_id": run_id, "model": config["model_name"], "mode": mode_tag,
+                "started_at": datetime.fromtimestamp(start_time).isoformat(timespec="seconds"),
+                "elapsed": elapsed, "total": total_count, "passed": pass_count,
+                "accuracy": accuracy, "v4_weighted": scores["v4_weighted"],
+                "results_path": results_path,
+                "report_path": final_report_path if final_report_path != results_path else None,
+                "config": config
+            }, all_results)
+        finally:
+            warehouse.close()
+
     print("\n" + "=" * 80)
     print("✅ 벤치마크 완료!")
     print("=" * 80)
     print(f"📊 총 테스트: {total_count}개")
     print(f"✅ PASS: {pass_count}개 ({accuracy:.1f}%)")
     print(f"❌ FAIL: {total_count - pass_count}개")
-    print(f"⏱️  소요 시간: {elapsed:.1f}초")
-    print(f"💾 최종 저장: {final_report_path}")
-    print(f"🗑️  개별 파일 {len(saved_files)}개 정리 완료")
+    print(f"⏱️  소요 시간: {elapsed:.1f}초 (처리량 {total_count / elapsed if elapsed else 0:.2f} 케이스/초, "
+          f"동시 실행 {config.get('concurrency', 1)})")
+    prompt_tokens = sum(r.get("Prompt_Tokens") or 0 for r in all_results)
+    cached_tokens = sum(r.get("Cached_Tokens") or 0 for r in all_results)
+    completion_tokens = sum(r.get("Completion_Tokens") or 0 for r in all_results)
+    cache_rate = (cached_tokens / prompt_tokens * 100) if prompt_tokens else 0
+    print(f"🔢 토큰: prompt {prompt_tokens:,} (캐시 적중 {cached_tokens:,}, {cache_rate:.1f}%) / completion {completion_tokens:,}")
+    if config.get("executor", "mock") == "real":
+        pool_stats = BFCLPooledExecutor.shared_pool().stats
+        print(f"🧰 백엔드 풀: 인스턴스 생성 {pool_stats['created']} / 재사용 {pool_stats['reused']}, "
+              f"시나리오 로드 {pool_stats['scenario_loads']} / 스냅샷 재사용 {pool_stats['snapshot_hits']}")
+    http_stats = http_pool_stats()
+    if http_stats["requests"]:
+        print(f"🔌 HTTP 연결 (프로세스 전체): 요청 {http_stats['requests']} / 새 연결 {http_stats['connections']} "
+              f"(재사용 {http_stats['reuse_rate'] * 100:.1f}%, TLS 핸드셰이크 {http_stats['tls_handshakes']}"
+              + (f", HTTP/2 {http_stats['http2_requests']}" if http_stats["http2"] else "") + ")")
+    if journal_path:
+        print(f"📝 저널: {journal_path}")
+    print(f"📄 결과 파일: {results_path}")
+    if run_id:
+        print(f"🗃️  저장소: {config['warehouse_path']} (run_id: {run_id})")
+    if final_report_path != results_path:
+        print(f"💾 최종 저장: {final_report_path} (백그라운드 생성)")
     print("=" * 80)
-    
+
     return final_report_path
 
+WAREHOUSE_COMMANDS = ["query", "compare"]
+
+def warehouse_main(argv):
+    """
+    실행 결과 저장소 조회 서브커맨드
+
+    - query runs: 최근 실행 목록
+    - query slowest: 케이스 전체 latency가 가장 긴 케이스
+    - query sql: 임의 SQL (테이블: runs, case_results, case_metrics, steps)
+    - compare A B: 두 실행(run_id 또는 모델명 = 가장 최근 실행)의 카테고리별 정확도/latency 차이
+    """
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="BFCL 실행 결과 저장소 조회",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+사용 예시:
+  # 최근 실행 목록
+  python main.py query runs
+  
+  # 특정 모델의 가장 느린 케이스 50개
+  python main.py query slowest --model "qwen/qwen3-32b" --limit 50
+  
+  # 임의 SQL
+  python main.py query sql "SELECT category, AVG(passed) FROM case_results GROUP BY category"
+  
+  # 두 실행의 카테고리별 정확도 차이 (run_id 또는 모델명 = 해당 모델의 최근 실행)
+  python main.py compare 20250101_120000_qwen3_32b "mistralai/mistral-small-3.2-24b-instruct"
+        """
+    )
+    db = argparse.ArgumentParser(add_help=False)
+    db.add_argument("--db", default=DEFAULT_CONFIG["warehouse_path"], help="저장소 경로 (기본값: results/warehouse.sqlite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    query = commands.add_parser("query", help="저장소 조회")
+    query_commands = query.add_subparsers(dest="query", required=True)
+    runs = query_commands.add_parser("runs", parents=[db], help="최근 실행 목록")
+    runs.add_argument("--model", help="모델명 필터")
+    runs.add_argument("--limit", type=int, default=20)
+    slowest = query_commands.add_parser("slowest", parents=[db], help="케이스 전체 latency가 가장 긴 케이스")
+    slowest.add_argument("--model", help="모델명 필터")
+    slowest.add_argument("--run", help="run_id 또는 모델명 (해당 모델의 최근 실행)")
+    slowest.add_argument("--category", help="카테고리 필터")
+    slowest.add_argument("--limit", type=int, default=50)
+    sql = query_commands.add_parser("sql", parents=[db], help="임의 SQL 실행")
+    sql.add_argument("statement")
+    
+    compare = commands.add_parser("compare", parents=[db], help="두 실행의 카테고리별 정확도/latency 비교 (B - A)")
+    compare.add_argument("run_a", help="기준 실행 (run_id 또는 모델명)")
+    compare.add_argument("run_b", help="비교 실행 (run_id 또는 모델명)")
+    compare.add_argument("--changed", type=int, default=20, help="결과가 바뀐 케이스 출력 수 (기본값: 20, 0이면 생략)")
+    
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.db):
+        print(f"❌ 저장소가 없습니다: {args.db} (벤치마크를 먼저 실행하세요)")
+        raise SystemExit(1)
+    
+    warehouse = ResultWarehouse(args.db)
+    try:
+        start = time.perf_counter()
+        if args.command == "query":
+            if args.query == "runs":
+                columns, rows = warehouse.runs(model=args.model, limit=args.limit)
+            elif args.query == "slowest":
+                run_id = _resolve_run(warehouse, args.run) if args.run else None
+                columns, rows = warehouse.slowest(model=args.model, run_id=run_id, category=args.category, limit=args.limit)
+            else:
+                columns, rows = warehouse.query(args.statement)
+            print(format_table(columns, rows))
+        else:
+            run_a, run_b = _resolve_run(warehouse, args.run_a), _resolve_run(warehouse, args.run_b)
+            print(f"A: {run_a}\nB: {run_b}\n")
+            columns, rows = warehouse.compare(run_a, run_b)
+            print(format_table(columns, rows))
+            if args.changed:
+                columns, changed = warehouse.changed_cases(run_a, run_b, limit=args.changed)
+                if changed:
+                    print(f"\n결과가 바뀐 케이스 (최대 {args.changed}개):")
+                    print(format_table(columns, changed))
+        print(f"\n({len(rows)}행, {(time.perf_counter() - start) * 1000:.1f}ms)")
+    finally:
+        warehouse.close()
+
+def _resolve_run(warehouse, ref):
+    run_id = warehouse.resolve_run(ref)
+    if run_id is None:
+        print(f"❌ 실행을 찾을 수 없습니다: {ref} (run_id 또는 모델명, 목록은 python main.py query runs)")
+        raise SystemExit(1)
+    return run_id
+
 def main():
     """메인 실행 함수"""
+    if len(sys.argv) > 1 and sys.argv[1] in WAREHOUSE_COMMANDS:
+        return warehouse_main(sys.argv[1:])
+    
     parser = argparse.ArgumentParser(
         description="BFCL Benchmark Runner - Function Calling 벤치마크 실행",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1041,6 +1730,38 @@ def main():
   
   # 대기 시간을 줄여서 빠르게 실행
   python main.py --quick --delay 1
+  
+  # 16개 케이스를 동시에 실행 (asyncio)
+  python main.py --full --concurrency 16
+  
+  # 이전 실행의 응답을 재사용하여 재채점 (API 호출 없음)
+  python main.py --full --cache read
+  
+  # 중단된 실행 이어서 하기 (저널에 기록된 완료 케이스 건너뜀)
+  python main.py --full --resume
+  
+  # 단일 스텝 카테고리를 Batch API로 실행 (OpenAI 등 Batch API 지원 provider)
+  python main.py --full --batch --base-url https://api.openai.com/v1 --model gpt-4o-mini
+  python main.py --quick --batch-local   # 로컬 stand-in 서버로 흐름만 확인
+  python main.py --full --local-server lognormal:300:0.5 --concurrency 32   # 네트워크 없이 처리량 측정
+  
+  # 신뢰구간 모드: 카테고리별 95% CI 폭이 5%p 이하가 되면 중단 (층화 무작위 샘플링)
+  python main.py --target-ci 5 --concurrency 16
+  
+  # 4개 머신/프로세스로 나눠 실행 후 병합 (샤드별 저널 → 케이스 순서대로 병합)
+  python main.py --full --shard 0/4   # ... --shard 3/4 까지 각각 실행
+  python main.py --full --merge-shards 4
+  
+  # 공유 작업 큐: 코디네이터 1개 + 워커 여러 개 (죽은 워커의 작업은 임대 만료 후 재분배)
+  python main.py --full --queue results/queue.sqlite --coordinator
+  python main.py --full --queue results/queue.sqlite --concurrency 8
+  
+  # 실행 결과 저장소 조회 (python main.py query -h, python main.py compare -h)
+  python main.py query runs
+  python main.py compare RUN_A RUN_B
+  
+  # 저장된 결과 파일에서 Excel 리포트만 다시 생성
+  python main.py --report-from results/BFCL_FULL_mistral_small_3_2_24b_Results_20250101_120000.csv --model "mistralai/mistral-small-3.2-24b-instruct"
         """
     )
     
@@ -1077,11 +1798,195 @@ def main():
     parser.add_argument(
         "--delay",
         type=int,
-        help="카테고리 간 대기 시간 (초, 기본값: quick=5, full=3, default=3)"
+        help="카테고리 간 추가 대기 시간 (초, 기본값: 0 - 요청 페이싱은 응답 헤더 기반 레이트 리미터가 담당)"
+    )
+    
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        help="초당 최대 요청 수 상한 (기본값: 없음 - Retry-After/x-ratelimit-* 헤더로 자동 조절)"
+    )
+    
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="동시 실행 케이스 수 (기본값: 1 = 직렬 실행, 2 이상이면 asyncio 동시 실행)"
+    )
+    
+    parser.add_argument(
+        "--cache",
+        choices=CACHE_MODES,
+        help="inference 캐시 모드 (기본값: off, readwrite = 조회 후 없으면 저장)"
+    )
+    
+    parser.add_argument(
+        "--cache-path",
+        type=str,
+        help="캐시 SQLite 파일 경로 (기본값: .cache/inference_cache.sqlite)"
+    )
+    
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        help="캐시 최대 크기 (MB, 기본값: 2048, 초과 시 LRU 제거)"
+    )
+    
+    parser.add_argument(
+        "--max-consecutive-errors",
+        type=int,
+        help="연속 에러 케이스가 이 수에 도달하면 조기 중단 (예: 모델이 모든 provider에서 404, 기본값: 비활성화)"
+    )
+    
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="중단된 실행 이어서 하기 (results/journal/의 완료 케이스 건너뜀)"
+    )
+    
+    parser.add_argument(
+        "--prompt-cache",
+        action="store_true",
+        help="provider 프롬프트 캐시 모드 (system + tools prefix 고정, Anthropic/Gemini cache_control, OpenAI prompt_cache_key)"
+    )
+    
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="스트리밍 요청 모드 (스텝별 TTFT 측정)"
+    )
+    
+    parser.add_argument(
+        "--executor",
+        choices=EXECUTOR_MODES,
+        help="도구 실행기 (기본값: mock, real = 멀티턴 케이스를 실제 백엔드 인스턴스 풀로 실행)"
+    )
+    
+    parser.add_argument(
+        "--no-stream-cutoff",
+        action="store_true",
+        help="스트리밍 모드에서 단일 호출 카테고리도 생성이 끝날 때까지 수신 (기본값: 첫 tool call 완성 시 종료)"
+    )
+    
+    parser.add_argument(
+        "--results-format",
+        choices=["auto", "parquet", "csv"],
+        help="결과 파일 형식 (기본값: auto - pyarrow가 있으면 parquet, 없으면 csv)"
+    )
+    
+    parser.add_argument(
+        "--no-excel",
+        action="store_true",
+        help="Excel 리포트를 만들지 않고 결과 파일만 저장"
+    )
+    
+    parser.add_argument(
+        "--no-warehouse",
+        action="store_true",
+        help="실행 결과 저장소(results/warehouse.sqlite)에 기록하지 않음"
+    )
+    
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        help="OpenAI 호환 API 엔드포인트 (기본값: OpenRouter, 지정 시 OPENAI_API_KEY 사용)"
+    )
+    
+    parser.add_argument(
+        "--http2",
+        action="store_true",
+        help="공유 연결 풀에서 HTTP/2 사용 (pip install httpx[http2] 필요, 없으면 HTTP/1.1로 실행)"
+    )
+    
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="단일 스텝 카테고리(AST, relevance)를 Batch API로 한 번에 요청 (--base-url의 provider가 Batch API 지원 필요)"
+    )
+    
+    parser.add_argument(
+        "--batch-local",
+        action="store_true",
+        help="--batch를 로컬 stand-in 서버(합성 응답)로 실행 - 네트워크 없이 전체 흐름 확인용"
+    )
+    
+    parser.add_argument(
+        "--local-server",
+        nargs="?",
+        const="0",
+        metavar="LATENCY",
+        help="로컬 stand-in 서버(합성 응답)를 띄워 네트워크 없이 실행 - 처리량 측정용 "
+             "(선택: 지연 분포 ms, 예: lognormal:300:0.5, 자세한 옵션은 python -m core.standin --help)"
+    )
+    
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="첫 스텝 요청이 같은 케이스끼리 응답을 공유하지 않고 모두 개별 요청"
+    )
+    
+    parser.add_argument(
+        "--target-ci",
+        type=float,
+        metavar="PP",
+        help="신뢰구간 모드: 카테고리별 95%% 신뢰구간 폭이 PP%%p 이하가 되면 해당 카테고리 종료 (--samples는 상한, 생략 시 전체)"
+    )
+    
+    parser.add_argument(
+        "--ci-min-samples",
+        type=int,
+        help="신뢰구간 모드의 카테고리당 최소 샘플 수 (기본값: 10)"
+    )
+    
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="신뢰구간 모드의 층화 무작위 순서 seed (기본값: 0)"
+    )
+    
+    parser.add_argument(
+        "--shard",
+        type=str,
+        metavar="I/N",
+        help="전체 케이스를 N개로 나눈 중 I번째(0부터)만 실행 (예: 0/4, 샤드별 저널에 기록)"
+    )
+    
+    parser.add_argument(
+        "--merge-shards",
+        type=int,
+        metavar="N",
+        help="실행 없이 --shard I/N으로 실행한 N개 샤드 저널을 병합하여 리포트 생성"
+    )
+    
+    parser.add_argument(
+        "--queue",
+        type=str,
+        metavar="QUEUE_PATH",
+        help="공유 작업 큐(SQLite) 경로 - 큐에서 작업을 임대해 실행하는 워커로 동작"
+    )
+    
+    parser.add_argument(
+        "--coordinator",
+        action="store_true",
+        help="--queue와 함께 사용: 작업 등록 후 모든 워커가 끝날 때까지 대기하고 결과 병합/리포트 생성"
+    )
+    
+    parser.add_argument(
+        "--report-from",
+        type=str,
+        metavar="RESULTS_FILE",
+        help="벤치마크 실행 없이 기존 결과 파일(.parquet/.csv)에서 Excel 리포트만 생성"
     )
     
     args = parser.parse_args()
     
+    # 결과 파일에서 리포트만 생성
+    if args.report_from:
+        report_path = os.path.splitext(args.report_from)[0].replace("_Results_", "_Report_") + ".xlsx"
+        model_name = args.model or DEFAULT_CONFIG["model_name"]
+        ExcelReporter.save_from_table(args.report_from, report_path, model_name, DEFAULT_CONFIG)
+        print(f"💾 리포트 저장: {report_path}")
+        return
+    
     # 설정 구성
     if args.quick:
         config = {**DEFAULT_CONFIG, **QUICK_TEST_CONFIG}
@@ -1101,9 +2006,94 @@ def main():
         config["model_name"] = args.model
     if args.delay is not None:
         config["rate_limit_delay"] = args.delay
+    if args.max_rps:
+        config["max_rps"] = args.max_rps
+    if args.concurrency:
+        config["concurrency"] = args.concurrency
+    if args.resume:
+        config["resume"] = True
+    if args.cache:
+        config["cache"] = args.cache
+    if args.cache_path:
+        config["cache_path"] = args.cache_path
+    if args.cache_max_mb:
+        config["cache_max_mb"] = args.cache_max_mb
+    if args.max_consecutive_errors:
+        config["max_consecutive_errors"] = args.max_consecutive_errors
+    if args.results_format:
+        config["results_format"] = args.results_format
+    if args.no_excel:
+        config["excel_report"] = False
+    if args.no_warehouse:
+        config["warehouse_path"] = None
+    if args.prompt_cache:
+        config["prompt_cache"] = True
+    if args.stream:
+        config["stream"] = True
+    if args.no_stream_cutoff:
+        config["stream_cutoff"] = False
+    if args.no_dedup:
+        config["dedup"] = False
+    if args.base_url:
+        config["base_url"] = args.base_url
+    if args.http2:
+        config["http2"] = True
+    if args.batch or args.batch_local:
+        if args.queue or args.target_ci:
+            parser.error("--batch는 --queue / --target-ci와 함께 사용할 수 없습니다.")
+        config["batch"] = True
+    if args.executor:
+        config["executor"] = args.executor
+    if args.shard:
+        try:
+            config["shard"] = parse_shard(args.shard)
+        except ValueError as e:
+            parser.error(str(e))
+    if args.queue:
+        config["queue_path"] = args.queue
+    if args.target_ci:
+        if args.shard or args.queue or args.merge_shards:
+            parser.error("--target-ci는 --shard / --queue / --merge-shards와 함께 사용할 수 없습니다.")
+        config["target_ci"] = args.target_ci
+        if not args.samples:
+            config["samples_per_cat"] = FULL_TEST_CONFIG["samples_per_cat"]
+    if args.ci_min_samples:
+        config["ci_min_samples"] = args.ci_min_samples
+    if args.seed is not None:
+        config["sampling_seed"] = args.seed
+    if args.coordinator and not args.queue:
+        parser.error("--coordinator는 --queue와 함께 사용해야 합니다.")
+    
+    # 샤드 병합 / 작업 큐 코디네이터 (벤치마크 실행 없음)
+    if args.merge_shards:
+        merge_shard_results(config, args.merge_shards)
+        return
+    if args.coordinator:
+        run_queue_coordinator(config)
+        return
+    
+    # 로컬 stand-in 서버 (네트워크 없이 전체 흐름/배치 흐름 실행)
+    standin = None
+    if args.batch_local or args.local_server:
+        try:
+            standin = StandInServer(latency=args.local_server or "0").start()
+        except ValueError as e:
+            parser.error(str(e))
+        config["base_url"] = standin.base_url
+        config["local_server"] = True
+        config["batch_poll_interval"] = 0.5
+        print(f"🧪 로컬 stand-in 서버: {standin.base_url} (합성 응답, 지연 {args.local_server or '0'}ms)\n")
     
     # 벤치마크 실행
-    run_benchmark(config)
+    try:
+        run_benchmark(config)
+    except ModelAborted:
+        print("💡 완료된 케이스는 저널에 저장되었습니다. 문제 해결 후 --resume으로 이어서 실행하세요.")
+        raise SystemExit(1)
+    finally:
+        if standin:
+            standin.stop()
+            print(f"🧪 stand-in 서버: {standin.summary()}")
 
 if __name__ == "__main__":
     main()
@@ -2,14 +2,21 @@
 """
 다중 모델 벤치마크 실행 스크립트
 
-여러 모델에 대해 BFCL 벤치마크를 순차 실행합니다.
+여러 모델에 대해 BFCL 벤치마크를 병렬 실행합니다.
+모델마다 별도의 동시 실행 수/초당 요청 수 예산(레이트 리미터 버킷)을 가지며,
+전체 동시 실행 케이스 수는 전역 상한으로 제한됩니다.
 """
 
 import os
 import time
 import argparse
 from datetime import datetime
-from main import run_benchmark, DEFAULT_CONFIG, BFCL_ALL_CATEGORIES
+from concurrent.futures import ThreadPoolExecutor
+from main import (run_benchmark, DEFAULT_CONFIG, BFCL_ALL_CATEGORIES, BFCLScorer,
+                  _format_model_name_for_filename)
+from core.journal import ResultJournal
+from core.handler import configure_http_pool
+from core.scheduler import CaseGate, ModelAborted, make_global_slots, parse_budget
 
 # 테스트할 모델 목록 (기본값)
 # BFCL 표준 tool calling 지원 모델들
@@ -21,153 +28,270 @@ DEFAULT_MODELS = [
     "meta-llama/llama-3.1-70b-instruct",        # Llama 3.1 70B: BFCL v2 검증 (0.741 점수), OpenRouter 안정
 ]
 
-def run_multi_model_benchmark(samples_per_cat=10, rate_limit_delay=0, models=None):
-    """다중 모델 벤치마크 실행"""
+def _run_single_model(model_name, config, gate):
+    """모델 1개 실행 후 요약 딕셔너리 반환 (워커 스레드에서 실행)"""
+    model_start = time.time()
+    summary = {"model": model_name, "report": None, "scores": None}
+    try:
+        summary["report"] = run_benchmark(config, gate=gate)
+        summary["status"] = "✅ 완료"
+        print(f"\n✅ {model_name} 완료 (소요 시간: {time.time() - model_start:.1f}초)")
+    except ModelAborted as e:
+        summary["status"] = f"⛔ 조기 중단: {str(e)[:100]}"
+    except Exception as e:
+        error_msg = str(e)[:100]
+        summary["status"] = f"❌ 실패: {error_msg}"
+        print(f"\n❌ {model_name} 실패: {error_msg}")
+    summary["time"] = time.time() - model_start
+
+    # 조기 중단/실패한 모델도 저널에 남은 케이스로 부분 점수 산출
+    results = ResultJournal.load_results(config["journal_path"], model_name)
+    if results:
+        summary["scores"] = BFCLScorer.calculate_scores(results)
+    return summary
+
+def run_multi_model_benchmark(samples_per_cat=10, rate_limit_delay=0, models=None,
+                              parallel_models=None, concurrency=4, max_rps=None, budgets=None,
+                              global_concurrency=None, max_consecutive_errors=5, resume=False):
+    """
+    다중 모델 벤치마크 실행
+
+    Args:
+        samples_per_cat: 카테고리당 샘플 수
+        rate_limit_delay: 카테고리 간 추가 대기 시간 (초)
+        models: 테스트할 모델 리스트 (기본값: DEFAULT_MODELS)
+        parallel_models: 동시에 실행할 모델 수 (기본값: 전체 모델 수)
+        concurrency: 모델별 기본 동시 실행 케이스 수
+        max_rps: 모델별 기본 초당 최대 요청 수 (None = 응답 헤더 기반 자동 조절)
+        budgets: 모델별 예산 오버라이드 {model: {"concurrency": int, "max_rps": float}}
+        global_concurrency: 모든 모델 합산 동시 실행 케이스 상한 (None = 상한 없음)
+        max_consecutive_errors: 모델별 연속 에러가 이 수에 도달하면 해당 모델 조기 중단
+        resume: 모델별 저널의 완료 케이스 건너뛰기
+    """
     if models is None:
         models = DEFAULT_MODELS
-    
+    budgets = budgets or {}
+    parallel_models = min(parallel_models or len(models), len(models))
+    slots = make_global_slots(global_concurrency)
+
     print("=" * 80)
     print("🚀 다중 모델 벤치마크 시작")
     print("=" * 80)
-    print(f"📋 테스트 모델 수: {len(models)}개")
+    print(f"📋 테스트 모델 수: {len(models)}개 (동시 실행 {parallel_models}개)")
     print(f"📂 카테고리 수: {len(BFCL_ALL_CATEGORIES)}개 (20개)")
     print(f"📊 카테고리당 샘플: {samples_per_cat}개")
     print(f"⏱️  Rate limit delay: {rate_limit_delay}초")
+    print(f"⚡ 전역 동시 실행 상한: {global_concurrency or '없음'}")
     print(f"🎯 총 예상 테스트: {len(models)} × {len(BFCL_ALL_CATEGORIES)} × {samples_per_cat} = {len(models) * len(BFCL_ALL_CATEGORIES) * samples_per_cat}개")
     print("=" * 80)
     print("\n테스트할 모델 목록:")
+
+    configs = {}
     for i, model in enumerate(models, 1):
-        print(f"  {i}. {model}")
-    print("\n" + "=" * 80)
-    
-    start_time = time.time()
-    results_summary = []
-    
-    for model_idx, model_name in enumerate(models, 1):
-        print(f"\n{'=' * 80}")
-        print(f"[{model_idx}/{len(models)}] 모델: {model_name}")
-        print(f"{'=' * 80}")
-        
-        model_start = time.time()
-        
-        # 벤치마크 설정
-        config = {
+        budget = {"concurrency": concurrency, "max_rps": max_rps, **budgets.get(model, {})}
+        model_short = _format_model_name_for_filename(model)
+        configs[model] = {
             **DEFAULT_CONFIG,
-            "model_name": model_name,
+            "model_name": model,
             "categories": list(BFCL_ALL_CATEGORIES.keys()),  # 전체 20개 카테고리
             "samples_per_cat": samples_per_cat,
-            "rate_limit_delay": rate_limit_delay
+            "rate_limit_delay": rate_limit_delay,
+            "concurrency": budget["concurrency"],
+            "max_rps": budget["max_rps"],
+            # 모델마다 upstream provider가 달라 한도도 독립적이므로 모델별 리미터 버킷 사용
+            "rate_limit_key": f"model:{model}",
+            "journal_path": f"results/journal/BFCL_MULTI_{model_short}.jsonl",
+            "resume": resume,
+            "log_label": f"[{model_short}] "
         }
-        
-        try:
-            # 벤치마크 실행
-            report_path = run_benchmark(config)
-            
-            model_elapsed = time.time() - model_start
-            results_summary.append({
-                "model": model_name,
-                "status": "✅ 완료",
-                "time": model_elapsed,
-                "report": report_path
-            })
-            
-            print(f"\n✅ {model_name} 완료 (소요 시간: {model_elapsed:.1f}초)")
-            
-            # 다음 모델 실행 전 대기 (마지막 모델은 제외)
-            if model_idx < len(models):
-                wait_time = 10
-                print(f"⏳ 다음 모델 실행 전 {wait_time}초 대기 중...")
-                time.sleep(wait_time)
-                
-        except Exception as e:
-            model_elapsed = time.time() - model_start
-            error_msg = str(e)[:100]
-            results_summary.append({
-                "model": model_name,
-                "status": f"❌ 실패: {error_msg}",
-                "time": model_elapsed,
-                "report": None
-            })
-            print(f"\n❌ {model_name} 실패: {error_msg}")
-            print("다음 모델로 계속 진행합니다...")
-            continue
-    
+        print(f"  {i}. {model} (concurrency={budget['concurrency']}, max_rps={budget['max_rps'] or 'auto'})")
+    print("\n" + "=" * 80)
+
+    # 동시에 실행되는 모델들이 공유 HTTP 연결 풀을 함께 쓰므로 합산 동시 실행 수로 풀 크기 설정
+    # (핸들러 생성 후에는 풀을 바꿀 수 없으므로, 모델 하나의 동시 실행 수보다 작지 않게 미리 설정)
+    busiest = sorted((config["concurrency"] for config in configs.values()), reverse=True)[:parallel_models]
+    configure_http_pool(concurrency=max(min(sum(busiest), global_concurrency or sum(busiest)), max(busiest, default=1)))
+
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=parallel_models, thread_name_prefix="model") as pool:
+        futures = [
+            pool.submit(_run_single_model, model, configs[model],
+                        CaseGate(slots=slots, max_consecutive_errors=max_consecutive_errors))
+            for model in models
+        ]
+        results_summary = [future.result() for future in futures]
+
     # 최종 결과 요약
     total_elapsed = time.time() - start_time
-    
+
     print("\n" + "=" * 80)
     print("🎉 전체 벤치마크 완료!")
     print("=" * 80)
     print(f"⏱️  총 소요 시간: {total_elapsed / 60:.1f}분 ({total_elapsed:.1f}초)")
     print("\n📊 결과 요약:")
     print("-" * 80)
-    
+
     for idx, result in enumerate(results_summary, 1):
         print(f"\n{idx}. {result['model']}")
         print(f"   상태: {result['status']}")
         print(f"   시간: {result['time']:.1f}초")
+        if result['scores']:
+            print(f"   정확도: {result['scores']['overall']:.1f}% (BFCL v4 가중: {result['scores']['v4_weighted']:.1f}%)")
         if result['report']:
             print(f"   리포트: {result['report']}")
-    
+
     print("\n" + "=" * 80)
-    
+
     # 성공/실패 통계
     success_count = sum(1 for r in results_summary if "완료" in r['status'])
     fail_count = len(results_summary) - success_count
-    
+
     print(f"✅ 성공: {success_count}/{len(models)}개")
     print(f"❌ 실패: {fail_count}/{len(models)}개")
+
+    summary_path = _save_combined_summary(results_summary)
+    if summary_path:
+        print(f"📊 통합 요약: {summary_path}")
     print(f"📁 결과 저장 위치: results/")
     print("=" * 80)
+    return results_summary
+
+def _save_combined_summary(results_summary):
+    """모델 비교 + 카테고리별 정확도 시트로 구성된 통합 요약 Excel 저장"""
+    import pandas as pd
+
+    rows, by_category = [], {}
+    for result in results_summary:
+        scores = result["scores"] or {"overall": None, "v4_weighted": None, "by_category": {}}
+        cats = scores["by_category"].values()
+        rows.append({
+            "Model": result["model"],
+            "Status": result["status"],
+            "Pass": sum(c["pass"] for c in cats),
+            "Total": sum(c["total"] for c in cats),
+            "Overall Accuracy (%)": scores["overall"],
+            "BFCL v4 Weighted (%)": scores["v4_weighted"],
+            "Time (s)": round(result["time"], 1),
+            "Report": result["report"]
+        })
+        by_category[result["model"]] = {cat: data["accuracy"] for cat, data in scores["by_category"].items()}
+
+    if not any(row["Total"] for row in rows):
+        return None
+
+    os.makedirs("results", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = f"results/BFCL_MULTI_Summary_{timestamp}.xlsx"
+    category_df = pd.DataFrame(by_category).reindex(list(BFCL_ALL_CATEGORIES.keys())).dropna(how="all")
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame(rows).to_excel(writer, sheet_name="Models", index=False)
+        category_df.round(1).to_excel(writer, sheet_name="By Category", index_label="Category")
+    return path
 
 def main():
     """명령줄 인자 파싱 및 벤치마크 실행"""
     parser = argparse.ArgumentParser(
-        description="BFCL 다중 모델 벤치마크 실행 - 여러 모델을 순차적으로 벤치마크",
+        description="BFCL 다중 모델 벤치마크 실행 - 여러 모델을 병렬로 벤치마크",
         formatter_class=argparse.RawDescriptionHelpFormatter,
         epilog="""
 사용 예시:
-  # 기본 실행 (20개 카테고리 × 10개 샘플 × 5개 모델)
+  # 기본 실행 (20개 카테고리 × 10개 샘플 × 5개 모델, 모델 동시 실행)
   python run_multi_models.py
-  
+
   # 샘플 5개씩, delay 1초로 실행
   python run_multi_models.py --samples 5 --delay 1
-  
+
   # 특정 모델만 테스트
   python run_multi_models.py --models "openai/gpt-4o-mini" "anthropic/claude-3-haiku"
-  
+
   # 빠른 테스트 (각 카테고리 3개씩)
   python run_multi_models.py --samples 3 --delay 1
+
+  # 모델 2개씩 동시 실행, 전체 동시 케이스 24개 상한, 특정 모델만 별도 예산 (동시 8개, 초당 5건)
+  python run_multi_models.py --parallel-models 2 --global-concurrency 24 --budget "qwen/qwen3-32b=8:5"
         """
     )
-    
+
     parser.add_argument(
         "--samples",
         type=int,
         default=10,
         help="카테고리당 샘플 수 (기본값: 10)"
     )
-    
+
     parser.add_argument(
         "--delay",
         type=int,
         default=0,
         help="API rate limit 대기 시간 (초, 기본값: 0)"
     )
-    
+
     parser.add_argument(
         "--models",
         nargs="+",
         help="테스트할 모델 리스트 (기본값: 5개 모델)"
     )
-    
+
+    parser.add_argument(
+        "--parallel-models",
+        type=int,
+        help="동시에 실행할 모델 수 (기본값: 전체 모델 수, 1이면 순차 실행)"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="모델별 동시 실행 케이스 수 (기본값: 4)"
+    )
+
+    parser.add_argument(
+        "--max-rps",
+        type=float,
+        help="모델별 초당 최대 요청 수 (기본값: 없음 - 응답 헤더로 자동 조절)"
+    )
+
+    parser.add_argument(
+        "--budget",
+        nargs="+",
+        default=[],
+        metavar="MODEL=CONCURRENCY[:RPS]",
+        help="모델별 예산 오버라이드 (예: qwen/qwen3-32b=8:5)"
+    )
+
+    parser.add_argument(
+        "--global-concurrency",
+        type=int,
+        help="모든 모델 합산 동시 실행 케이스 상한 (기본값: 없음)"
+    )
+
+    parser.add_argument(
+        "--max-consecutive-errors",
+        type=int,
+        default=5,
+        help="모델별 연속 에러 케이스가 이 수에 도달하면 해당 모델 조기 중단 (기본값: 5, 0이면 비활성화)"
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="중단된 실행 이어서 하기 (results/journal/BFCL_MULTI_*.jsonl의 완료 케이스 건너뜀)"
+    )
+
     args = parser.parse_args()
-    
+
     # 벤치마크 실행
     run_multi_model_benchmark(
         samples_per_cat=args.samples,
         rate_limit_delay=args.delay,
-        models=args.models
+        models=args.models,
+        parallel_models=args.parallel_models,
+        concurrency=args.concurrency,
+        max_rps=args.max_rps,
+        budgets=dict(parse_budget(spec) for spec in args.budget),
+        global_concurrency=args.global_concurrency,
+        max_consecutive_errors=args.max_consecutive_errors or None,
+        resume=args.resume
     )
 
 if __name__ == "__main__":